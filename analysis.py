@@ -0,0 +1,180 @@
+# === Linhas de Análise (coluna 'Análise' e arquivos _ai.txt) ===
+
+import numpy as np
+import pandas as pd
+
+from sinks import open_text
+
+# === Constants ===
+ANALYSIS_COLUMN = "Análise"
+# Formato de cada relatório: (rótulo que precede o valor, coluna), na ordem da linha
+POSTS_ANALYSIS_FIELDS = (
+    ("ID: ", "ID"), (" | Texto: ", "Descrição"), (" | Engajamento: ", "Manifestações"),
+    (" | Link: ", "Link ocorrência"),
+)
+NEWS_ANALYSIS_FIELDS = (
+    ("", "ID"), (" | Título: ", "Título"), (" | Texto: ", "Descrição"), (" | Link: ", "Link ocorrência"),
+)
+# Quebras de linha dentro de um valor viram espaço nos .txt (uma entrada por linha física;
+# mesmo comprimento, então o orçamento das partes medido antes continua valendo)
+LINE_BREAKS = str.maketrans("\r\n", "  ")
+# Linhas unidas por bloco na escrita dos .txt (limita a string temporária de cada write)
+WRITE_BLOCK_LINES = 50_000
+# Arquivos de IA em partes: aproximação de tokens por caracteres e sufixo de cada parte
+CHARS_PER_TOKEN = 4
+PART_SUFFIX = "_parte-{:03d}"
+ENGAGEMENT_COLUMN = "Manifestações reais"
+
+
+def analysis_lines(df, fields):
+    """
+    Monta as linhas de Análise numa única passada: cada coluna vira texto uma vez (mesmo resultado
+    do astype(str)) e cada linha sai de um só format, sem a coluna intermediária de cada "+".
+    Colunas ausentes são criadas vazias em df, como no formato original.
+    """
+    for _, col in fields:
+        if col not in df.columns:
+            df[col] = ""
+    template = "".join(label.replace("{", "{{").replace("}", "}}") + "{}" for label, _ in fields)
+    texts = [df[col].astype(str).to_numpy() for _, col in fields]
+    return pd.Series(list(map(template.format, *texts)), index=df.index, name=ANALYSIS_COLUMN, dtype=object)
+
+
+def add_analysis(df, fields):
+    df[ANALYSIS_COLUMN] = analysis_lines(df, fields)
+    return df
+
+
+def write_lines(f, lines):
+    """
+    Grava uma linha por valor, sem aspas nem escape (mesmo formato dos .txt de macrotema). Quebras
+    de linha dentro do valor (ex.: Descrição com parágrafos) viram espaço; a coluna do Excel não muda.
+    """
+    lines = lines.tolist() if hasattr(lines, "tolist") else list(lines)
+    for start in range(0, len(lines), WRITE_BLOCK_LINES):
+        f.write("\n".join(line.translate(LINE_BREAKS) for line in lines[start:start + WRITE_BLOCK_LINES]))
+        f.write("\n")
+
+
+def excel_columns(df, analysis_column=True):
+    """Colunas que vão para o Excel limpo: todas, ou todas menos 'Análise' (já presente nos .txt)."""
+    if analysis_column or ANALYSIS_COLUMN not in df.columns:
+        return None
+    return [col for col in df.columns if col != ANALYSIS_COLUMN]
+
+
+class AiExportOptions:
+    """
+    Como gravar os arquivos de IA (_ai.txt e .txt de macrotema). Sem opções, um arquivo único
+    com todas as linhas, na ordem do relatório.
+      • max_chars / max_tokens: divide cada arquivo em partes numeradas ({nome}_parte-001.txt, ...)
+        de até esse orçamento, sem cortar linhas (uma linha maior que o orçamento fica sozinha numa
+        parte). Tokens são aproximados por CHARS_PER_TOKEN caracteres; com os dois, vale o menor.
+      • top_k: ordena por 'Manifestações reais' (decrescente; empates na ordem original) e mantém só
+        as K linhas mais engajadas de cada arquivo. Sem a coluna (Notícias), mantém as K primeiras.
+    """
+
+    def __init__(self, max_chars=None, max_tokens=None, top_k=None, chars_per_token=CHARS_PER_TOKEN):
+        for name, value in (("max_chars", max_chars), ("max_tokens", max_tokens), ("top_k", top_k)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} deve ser positivo (ou None)")
+        self.max_chars = max_chars
+        self.max_tokens = max_tokens
+        self.top_k = top_k
+        self.chars_per_token = chars_per_token
+
+    @property
+    def budget(self):
+        """Orçamento de cada parte em caracteres (None = arquivo único)."""
+        limits = [limit for limit in (self.max_chars,
+                                      self.max_tokens and self.max_tokens * self.chars_per_token) if limit]
+        return min(limits) if limits else None
+
+    @property
+    def ranked(self):
+        """Com top_k, cada arquivo depende de todas as linhas: o modo streaming só grava no fim."""
+        return self.top_k is not None
+
+    def lines(self, df, rows=None):
+        """Linhas de Análise (das linhas `rows`, máscara ou posições) na ordem e quantidade do arquivo."""
+        lines = df[ANALYSIS_COLUMN].to_numpy()
+        if rows is not None:
+            lines = lines[rows]
+        if self.top_k is None:
+            return lines
+        if ENGAGEMENT_COLUMN not in df.columns:
+            return lines[:self.top_k]
+        engagement = pd.to_numeric(df[ENGAGEMENT_COLUMN], errors="coerce").to_numpy(dtype=float)
+        if rows is not None:
+            engagement = engagement[rows]
+        # Sem engajamento (NaN) vai para o fim; argsort estável mantém a ordem original nos empates
+        order = np.argsort(-np.nan_to_num(engagement, nan=-np.inf), kind="stable")
+        return lines[order[:self.top_k]]
+
+
+def part_name(name, part):
+    stem, dot, suffix = name.rpartition(".")
+    return f"{stem}{PART_SUFFIX.format(part)}.{suffix}" if dot else f"{name}{PART_SUFFIX.format(part)}"
+
+
+class AiTxtWriter:
+    """
+    Grava um arquivo de IA de forma incremental (um bloco de linhas por vez) no sink. Com orçamento
+    (AiExportOptions.budget) as linhas vão para partes numeradas: a parte atual fecha quando a
+    próxima linha (mais o "\n") estouraria o orçamento. Cada linha é medida uma vez (tempo linear)
+    e cada parte fica aberta só enquanto recebe linhas (o ZipSink aceita uma entrada por vez).
+    O arquivo (ou a primeira parte) é criado na primeira chamada de write, mesmo sem linhas.
+    """
+
+    def __init__(self, sink, name, options=None, newline=None):
+        self.sink = sink
+        self.name = name
+        self.budget = (options or AiExportOptions()).budget
+        self.newline = newline
+        self.names = []
+        self._context = None
+        self._file = None
+        self._used = 0
+
+    def _current(self):
+        if self._file is None:
+            name = self.name if self.budget is None else part_name(self.name, len(self.names) + 1)
+            self._context = open_text(self.sink, name, newline=self.newline)
+            self._file = self._context.__enter__()
+            self.names.append(name)
+            self._used = 0
+        return self._file
+
+    def _close_current(self):
+        if self._file is not None:
+            self._file = None
+            self._context.__exit__(None, None, None)
+
+    def write(self, lines):
+        lines = lines.tolist() if hasattr(lines, "tolist") else list(lines)
+        f = self._current()
+        if self.budget is None:
+            write_lines(f, lines)
+            return
+        start = 0
+        for pos, line in enumerate(lines):
+            size = len(line) + 1
+            if self._used and self._used + size > self.budget:
+                write_lines(f, lines[start:pos])
+                self._close_current()
+                f, start = self._current(), pos
+            self._used += size
+        write_lines(f, lines[start:])
+
+    @property
+    def output_files(self):
+        return [self.sink.location(name) for name in self.names]
+
+    def close(self):
+        self._close_current()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
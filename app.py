@@ -1,24 +1,19 @@
 import streamlit as st
 import os
-import tempfile
-import zipfile
 import time
-import pandas as pd
 from io import BytesIO
 from biweekly import full_pipeline
-from pathlib import Path
-import zipfile
 
 # ==== seus módulos ====
-from daily_posts import (
-    process_and_export_excel    as process_publicacoes,
-    add_analysis_column_and_export_txt as analysis_publicacoes
-)
-from news import (
-    process_and_export_excel    as process_noticias,
-    add_analysis_column_and_export_txt as analysis_noticias
-)
-from biweekly import full_pipeline     # biweekly.py
+from daily_posts import process_and_export_excel as process_publicacoes
+from news import process_and_export_excel as process_noticias
+from biweekly import READ_SCHEMAS as BIWEEKLY_SCHEMAS, full_pipeline     # biweekly.py
+from analysis import AiExportOptions
+from archive import COMPRESSION_METHODS, DEFAULT_LEVEL, LEVEL_RANGES, ArchiveOptions, build_archive
+from jobs import FAILED, JobQueue
+from pipeline import BIWEEKLY_STAGES, DUPLICATES_STAGE, NEWS_STAGES, POSTS_STAGES, with_stage
+from upload_cache import UploadCache, content_key
+from workbook import TAGS_SHEET
 
 # ==== Configuração da página ====
 st.set_page_config(
@@ -46,9 +41,92 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ==== Cache de uploads (compartilhado entre sessões) ====
+@st.cache_resource
+def get_upload_cache():
+    return UploadCache(max_entries=4)
+
+# ==== Fila de relatórios em segundo plano (compartilhada entre sessões) ====
+JOB_POLL_SECONDS = 1.0
+
+@st.cache_resource
+def get_job_queue():
+    return JobQueue()
+
+def show_job(state_key, download_label, file_name, success_message):
+    """Acompanha o job da sessão: progresso por etapa enquanto roda, download quando termina."""
+    job = get_job_queue().get(st.session_state.get(state_key))
+    if job is None:
+        return
+
+    if not job.finished:
+        @st.fragment(run_every=JOB_POLL_SECONDS)
+        def poll():
+            if job.finished:
+                st.rerun()
+            position = get_job_queue().position(job)
+            if position:
+                st.progress(0, text=f"⏳ Na fila (posição {position})…")
+            else:
+                st.progress(job.progress, text=f"⚙️ Etapa: {job.stage or 'iniciando'}")
+        poll()
+        return
+
+    if job.status == FAILED:
+        st.error("❌ Falha ao processar o relatório.")
+        with st.expander("Detalhes do erro"):
+            st.code(job.error)
+        return
+
+    # O ZIP fica num arquivo temporário e só é lido quando o botão é clicado
+    st.download_button(download_label, data=job.result.read, file_name=file_name, mime="application/zip")
+    st.success(success_message)
+    if job.metrics is not None:
+        with st.expander("⏱️ Métricas por etapa"):
+            st.dataframe(job.metrics)
+
 # ==== Título geral ====
 st.title("📊 V-Tracker: Data Cleaning & Analysis")
 
+# ==== Opções gerais ====
+incluir_analise = st.checkbox(
+    "📝 Incluir a coluna Análise no Excel",
+    value=True,
+    help="O texto de Análise sempre vai para os .txt; desmarque para gerar um Excel menor"
+)
+DEDUP_OPTIONS = {"Não remover": None, "Só cópias exatas": "exact", "Cópias e quase cópias": "near"}
+remover_duplicadas = DEDUP_OPTIONS[st.selectbox(
+    "🧹 Publicações duplicadas",
+    options=list(DEDUP_OPTIONS),
+    help="Mantém uma publicação por grupo de textos iguais (ou quase iguais, ex.: reposts) e "
+         "grava o tamanho do grupo na coluna 'Ocorrências no grupo'"
+)]
+with st.expander("🤖 Arquivos para IA (.txt)"):
+    max_tokens_ia = int(st.number_input(
+        "Tokens por parte (0 = arquivo único)", min_value=0, value=0, step=10_000,
+        help="Divide cada .txt de IA em partes numeradas de até ~N tokens (~4 caracteres por token), "
+             "sem cortar linhas"
+    ))
+    top_k_ia = int(st.number_input(
+        "Manter só as K publicações mais engajadas (0 = todas)", min_value=0, value=0, step=100,
+        help="Ordena por 'Manifestações reais', assim as mais engajadas ficam na primeira parte"
+    ))
+ai_export = AiExportOptions(max_tokens=max_tokens_ia or None, top_k=top_k_ia or None)
+ai_key = (max_tokens_ia, top_k_ia)
+with st.expander("🗜️ Compressão do ZIP"):
+    metodo_zip = st.selectbox(
+        "Método", options=[m for m in COMPRESSION_METHODS if m != "stored"],
+        help="deflate abre em qualquer descompactador; zstd (se disponível) comprime mais rápido"
+    )
+    nivel_min, nivel_max = LEVEL_RANGES[metodo_zip]
+    nivel_zip = st.slider(
+        "Nível (maior = ZIP menor e mais lento)", min_value=nivel_min, max_value=nivel_max,
+        value=min(max(DEFAULT_LEVEL, nivel_min), nivel_max),
+        help="Vale para os .txt (corpus e IA); o .xlsx já é comprimido e entra como está"
+    )
+archive_options = ArchiveOptions(metodo_zip, nivel_zip)
+zip_key = (metodo_zip, nivel_zip)
+
 # ==== Abas ====
 tab1, tab2, tab3 = st.tabs([
     "📱 Publicações", 
@@ -66,51 +144,24 @@ with tab1:
     if not uploaded_pub:
         st.info("⬆️ Por favor, envie um arquivo para iniciar.")
     else:
+        base = os.path.splitext(uploaded_pub.name)[0]
+        file_clean    = f"{base}_cleaned.xlsx"
         if st.button("📊 Processar Publicações"):
-            base = os.path.splitext(uploaded_pub.name)[0]
-            file_clean    = f"{base}_cleaned.xlsx"
-            file_ai       = f"{base}_ai.txt"
-            file_corpus   = f"{base}_corpus.txt"
-
-            # 1) Grava upload em temporário
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-                tmp.write(uploaded_pub.read())
-                tmp_path = tmp.name
-
-            # 2) Gera cleaned.xlsx
-            df = process_publicacoes(tmp_path, output_filename=file_clean)
-
-            # 3) Gera base_ai.txt
-            analysis_publicacoes(df.copy(), txt_filename=file_ai)
-
-            # 4) Renomeia o corpus default para base_corpus.txt
-            old_iram = file_clean.replace(".xlsx", "_iramuteq.txt")
-            if os.path.exists(old_iram):
-                os.rename(old_iram, file_corpus)
-
-            # 5) Limpa temporário
-            os.remove(tmp_path)
-
-            # 6) Empacota no ZIP
-            excel_buf = BytesIO()
-            df.to_excel(excel_buf, index=False)
-
-            ai_buf    = BytesIO(open(file_ai,     "rb").read())
-            corp_buf  = BytesIO(open(file_corpus, "rb").read())
-
-            zp = BytesIO()
-            with zipfile.ZipFile(zp, "w", zipfile.ZIP_STORED) as z:
-                z.writestr(file_clean,  excel_buf.getvalue())
-                z.writestr(file_ai,     ai_buf.getvalue())
-                z.writestr(file_corpus, corp_buf.getvalue())
-            zp.seek(0)
-
-            st.download_button(
-                "📥 Baixar Resultados (Publicações)",
-                data=zp.getvalue(),
-                file_name=f"{base}_publicacoes.zip"
+            # 1) Enfileira o processamento (roda fora do script; reruns não o interrompem).
+            #    Cada artefato é gerado uma única vez e gravado direto, comprimido, no ZIP
+            data = uploaded_pub.getvalue()
+            job = get_job_queue().submit(
+                "publicacoes", build_archive, process_publicacoes, BytesIO(data), output_filename=file_clean,
+                analysis_column=incluir_analise, ai_export=ai_export, dedup=remover_duplicadas,
+                options=archive_options,
+                key=("publicacoes", content_key(data), file_clean, incluir_analise, ai_key, remover_duplicadas,
+                     zip_key),
+                stages=with_stage(POSTS_STAGES, DUPLICATES_STAGE, "clean") if remover_duplicadas else POSTS_STAGES
             )
-            st.success("✅ Publicações processadas com sucesso!")
+            st.session_state.job_pub = job.id
+
+        show_job("job_pub", "📥 Baixar Resultados (Publicações)", f"{base}_publicacoes.zip",
+                 "✅ Publicações processadas com sucesso!")
 
 # === Aba 2: Notícias ===
 with tab2:
@@ -123,44 +174,22 @@ with tab2:
     if not uploaded_news:
         st.info("⬆️ Por favor, envie um arquivo para iniciar.")
     else:
+        base = os.path.splitext(uploaded_news.name)[0]
+        file_clean    = f"{base}_cleaned.xlsx"
         if st.button("📊 Processar Notícias"):
-            base = os.path.splitext(uploaded_news.name)[0]
-            file_clean    = f"{base}_cleaned.xlsx"
-            file_ai       = f"{base}_ai.txt"
-            file_corpus   = f"{base}_corpus.txt"
-
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-                tmp.write(uploaded_news.read())
-                tmp_path = tmp.name
-
-            df = process_noticias(tmp_path, output_filename=file_clean)
-            analysis_noticias(df.copy(), txt_filename=file_ai)
-
-            old_iram = file_clean.replace(".xlsx", "_iramuteq.txt")
-            if os.path.exists(old_iram):
-                os.rename(old_iram, file_corpus)
-
-            os.remove(tmp_path)
-
-            excel_buf = BytesIO()
-            df.to_excel(excel_buf, index=False)
-
-            ai_buf    = BytesIO(open(file_ai,     "rb").read())
-            corp_buf  = BytesIO(open(file_corpus, "rb").read())
-
-            zp = BytesIO()
-            with zipfile.ZipFile(zp, "w", zipfile.ZIP_STORED) as z:
-                z.writestr(file_clean,  excel_buf.getvalue())
-                z.writestr(file_ai,     ai_buf.getvalue())
-                z.writestr(file_corpus, corp_buf.getvalue())
-            zp.seek(0)
-
-            st.download_button(
-                "📥 Baixar Resultados (Notícias)",
-                data=zp.getvalue(),
-                file_name=f"{base}_noticias.zip"
+            data = uploaded_news.getvalue()
+            job = get_job_queue().submit(
+                "noticias", build_archive, process_noticias, BytesIO(data), output_filename=file_clean,
+                analysis_column=incluir_analise, ai_export=ai_export, dedup=remover_duplicadas,
+                options=archive_options,
+                key=("noticias", content_key(data), file_clean, incluir_analise, ai_key, remover_duplicadas,
+                     zip_key),
+                stages=with_stage(NEWS_STAGES, DUPLICATES_STAGE, "clean") if remover_duplicadas else NEWS_STAGES
             )
-            st.success("✅ Notícias processadas com sucesso!")
+            st.session_state.job_news = job.id
+
+        show_job("job_news", "📥 Baixar Resultados (Notícias)", f"{base}_noticias.zip",
+                 "✅ Notícias processadas com sucesso!")
 
 # === Aba 3: Relatório Quinzenal ===
 with tab3:
@@ -181,30 +210,31 @@ with tab3:
         # 1) PRESERVA o nome original sem extensão
         input_base = os.path.splitext(uploaded_bi.name)[0]
 
-        # 2) Grava upload em arquivo temporário
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-            tmp.write(uploaded_bi.read())
-            raw_path = tmp.name
-
-        # 3) Tenta ler sheet “Tags”
+        # 2) Lê as abas uma única vez por conteúdo (SHA-256); reruns reaproveitam o cache sem
+        #    copiar (só o cabeçalho das tags é lido aqui; a cópia é feita ao enviar o job)
+        raw_bytes = uploaded_bi.getvalue()
         try:
-            df_tags = pd.read_excel(raw_path, sheet_name="Tags", skiprows=4)
-            all_tags = df_tags.columns.tolist()
-        except:
-            all_tags = []
+            bi_sheets = get_upload_cache().get_sheets(raw_bytes, schemas=BIWEEKLY_SCHEMAS, copy=False)
+        except Exception:
+            bi_sheets = {}
+
+        # 3) Tags disponíveis vêm do cabeçalho da sheet “Tags”
+        all_tags = bi_sheets[TAGS_SHEET].columns.tolist() if TAGS_SHEET in bi_sheets else []
 
-        # 4) Inicializa session_state
+        # 4) Inicializa session_state (quantidade de macrotemas configurável; 4 por padrão)
+        n_macros = int(st.number_input("Quantidade de macrotemas", min_value=1, max_value=20, value=4, step=1))
         if "macros" not in st.session_state:
-            st.session_state.macros = {i: [] for i in range(1, 5)}
+            st.session_state.macros = {}
+        st.session_state.macros = {i: st.session_state.macros.get(i, []) for i in range(1, n_macros + 1)}
         if "macros_confirmed" not in st.session_state:
             st.session_state.macros_confirmed = False
 
-        # 5) Multiselects para os 4 macrotemas
+        # 5) Multiselects para os macrotemas
         cols = st.columns(2)
-        for i in range(1, 5):
+        for i in range(1, n_macros + 1):
             with cols[(i - 1) % 2]:
                 used = set().union(*[
-                    st.session_state.macros[j] for j in range(1, 5) if j != i
+                    st.session_state.macros[j] for j in range(1, n_macros + 1) if j != i
                 ]) if not multitema else set()
                 choices = [t for t in all_tags if t not in used or t in st.session_state.macros[i]]
                 st.session_state.macros[i] = st.multiselect(
@@ -226,13 +256,15 @@ with tab3:
                 f"{input_base}_cleaned.xlsx",
                 *[
                     f"{input_base}_ai_macrotema-{i}_{'_'.join(st.session_state.macros[i]) or 'sem_tags'}.txt"
-                    for i in range(1, 5)
+                    for i in range(1, n_macros + 1)
                 ],
                 f"{input_base}_corpus.txt",
                 f"{input_base}_relatorio_quinzenal.zip"
             ]
             for name in preview_files:
                 st.write(f"- {name}")
+            if max_tokens_ia:
+                st.caption("Os .txt de macrotema saem em partes: ..._parte-001.txt, ..._parte-002.txt, ...")
 
             if st.checkbox("✅ Confirmo que está tudo correto", key="confirm_files"):
                 gerar = True
@@ -241,48 +273,33 @@ with tab3:
         else:
             gerar = False
 
-        # 8) Gera relatório apenas após confirmação
+        # 8) Gera relatório apenas após confirmação, em segundo plano: a página pode ser usada
+        #    enquanto o job roda, e o mesmo arquivo com os mesmos macrotemas não é reprocessado
         if gerar:
-            progress_bar = st.progress(0)
-            with st.spinner("Processando relatório quinzenal…"):
-                # (a) Define o nome do Excel limpo
-                file_clean = f"{input_base}_cleaned.xlsx"
-
-                # (b) Executa pipeline e captura paths reais
-                cleaned_path, macro_txts, iram_txt = full_pipeline(
-                    raw_filepath=raw_path,
-                    macrotheme_definitions=st.session_state.macros,
-                    cleaned_output_filename=file_clean
-                )
-
-                # (c) Empacota tudo num ZIP
-                zp = BytesIO()
-                with zipfile.ZipFile(zp, "w", zipfile.ZIP_STORED) as z:
-                    # planilha
-                    z.writestr(Path(cleaned_path).name,
-                               open(cleaned_path, "rb").read())
-                    # macrotemas
-                    for p in macro_txts:
-                        z.writestr(Path(p).name, open(p, "rb").read())
-                    # corpus
-                    z.writestr(Path(iram_txt).name,
-                               open(iram_txt, "rb").read())
-                zp.seek(0)
-
-                progress_bar.progress(100)
-
-                # (d) Botão de download com input_base
-                st.download_button(
-                    "📥 Baixar Relatório Quinzenal",
-                    data=zp,
-                    file_name=f"{input_base}_relatorio_quinzenal.zip"
+            file_clean = f"{input_base}_cleaned.xlsx"
+            macros = {i: list(tags) for i, tags in st.session_state.macros.items()}
+            key = ("quinzenal", content_key(raw_bytes), file_clean,
+                   tuple((i, tuple(tags)) for i, tags in macros.items()), multitema, incluir_analise, ai_key,
+                   remover_duplicadas, zip_key)
+            queue = get_job_queue()
+            if st.session_state.get("job_bi_key") != key or queue.get(st.session_state.get("job_bi")) is None:
+                job = queue.submit(
+                    "quinzenal", build_archive, full_pipeline,
+                    raw_filepath=BytesIO(raw_bytes),
+                    macrotheme_definitions=macros,
+                    cleaned_output_filename=file_clean,
+                    sheets={name: df.copy() for name, df in bi_sheets.items()} or None,
+                    multilabel=multitema,
+                    analysis_column=incluir_analise,
+                    ai_export=ai_export,
+                    dedup=remover_duplicadas,
+                    options=archive_options,
+                    key=key,
+                    stages=with_stage(BIWEEKLY_STAGES, DUPLICATES_STAGE, "clean") if remover_duplicadas
+                    else BIWEEKLY_STAGES
                 )
-                st.success("🎉 Relatório Quinzenal gerado com sucesso!")
-
-# — Cleanup temporário (mantém o guard que evita NameError) —
-if 'raw_path' in locals() and raw_path and os.path.exists(raw_path):
-    try:
-        os.remove(raw_path)
-    except Exception as e:
-        st.warning(f"Não foi possível remover o arquivo temporário: {e}")
+                st.session_state.job_bi = job.id
+                st.session_state.job_bi_key = key
 
+            show_job("job_bi", "📥 Baixar Relatório Quinzenal", f"{input_base}_relatorio_quinzenal.zip",
+                     "🎉 Relatório Quinzenal gerado com sucesso!")
@@ -0,0 +1,100 @@
+# === ZIP de resultados comprimido, gravado em streaming num arquivo temporário ===
+
+import tempfile
+import threading
+import time
+import zipfile
+from pathlib import PurePosixPath
+
+from sinks import ZipSink
+
+# === Constants ===
+# zstd só existe no zipfile a partir do Python 3.14 (e exige um descompactador recente: o
+# Explorador do Windows não abre). DEFLATE é o padrão
+ZIP_ZSTANDARD = getattr(zipfile, "ZIP_ZSTANDARD", None)
+COMPRESSION_METHODS = {"deflate": zipfile.ZIP_DEFLATED, "stored": zipfile.ZIP_STORED}
+if ZIP_ZSTANDARD is not None:
+    COMPRESSION_METHODS["zstd"] = ZIP_ZSTANDARD
+LEVEL_RANGES = {"deflate": (0, 9), "zstd": (1, 22), "stored": (0, 0)}
+DEFAULT_METHOD = "deflate"
+DEFAULT_LEVEL = 6
+# Formatos que já saem comprimidos (xlsx e parquet): comprimir de novo só gasta CPU
+PRECOMPRESSED_SUFFIXES = {".xlsx", ".parquet", ".zip", ".gz", ".zst", ".png", ".jpg", ".jpeg"}
+
+
+class ArchiveOptions:
+    """
+    Compressão de cada entrada do ZIP, escolhida pelo tipo do artefato: .txt/.csv (corpus,
+    arquivos de IA) com `method` ("deflate" ou, se disponível, "zstd") no nível `level`;
+    formatos já comprimidos (.xlsx, .parquet, ...) entram sem compressão.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, level=DEFAULT_LEVEL):
+        if method not in COMPRESSION_METHODS:
+            raise ValueError(f"Compressão indisponível: {method!r} (use {', '.join(COMPRESSION_METHODS)})")
+        low, high = LEVEL_RANGES[method]
+        if method != "stored" and not low <= level <= high:
+            raise ValueError(f"Nível de compressão {method} deve ficar entre {low} e {high}: {level}")
+        self.method = method
+        self.level = level
+
+    def compression(self, name):
+        """(compress_type, nível) da entrada `name`."""
+        if self.method == "stored" or PurePosixPath(name).suffix.lower() in PRECOMPRESSED_SUFFIXES:
+            return zipfile.ZIP_STORED, None
+        return COMPRESSION_METHODS[self.method], self.level
+
+    def entry(self, name):
+        """ZipInfo da entrada (datada agora), com a compressão do tipo do artefato (ver ZipSink)."""
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type, info._compresslevel = self.compression(name)
+        return info
+
+
+class Archive:
+    """
+    ZIP de uma execução gravado num arquivo temporário anônimo (some ao fechar ou ao ser coletado):
+    o resultado de um job não fica em memória, e cada download lê o arquivo de novo.
+
+        archive = build_archive(process_and_export_excel, BytesIO(data), "x_cleaned.xlsx")
+        st.download_button(..., data=archive.read)
+    """
+
+    def __init__(self, options=None):
+        self.options = options or ArchiveOptions()
+        self.file = tempfile.TemporaryFile(prefix="vclean-zip-")
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def write(self, process, *args, **kwargs):
+        """Roda o relatório com um ZipSink que grava direto neste ZIP."""
+        with zipfile.ZipFile(self.file, "w") as zf, ZipSink(zf, entry=self.options.entry) as sink:
+            result = process(*args, sink=sink, **kwargs)
+        self.size = self.file.seek(0, 2)
+        return result
+
+    def read(self):
+        """Bytes do ZIP (uma cópia por chamada; seguro entre sessões simultâneas)."""
+        with self._lock:
+            self.file.seek(0)
+            return self.file.read()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_archive(process, *args, options=None, **kwargs):
+    """Roda o relatório gravando cada artefato comprimido num Archive e devolve o Archive."""
+    archive = Archive(options)
+    try:
+        archive.write(process, *args, **kwargs)
+    except BaseException:
+        archive.close()
+        raise
+    return archive
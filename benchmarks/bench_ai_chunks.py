@@ -0,0 +1,68 @@
+"""
+Benchmark da divisão dos arquivos de IA em partes (AiTxtWriter com orçamento): o tempo por linha
+deve ficar constante com o tamanho (divisão linear). Confere que as partes concatenadas reproduzem
+o arquivo único e que nenhuma parte com mais de uma linha passa do orçamento.
+
+    python benchmarks/bench_ai_chunks.py [--sizes 10000 100000 300000] [--max-tokens 100000] [--top-k 5000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis import AiExportOptions, AiTxtWriter  # noqa: E402
+from workspace import Workspace  # noqa: E402
+
+
+def synthetic_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.array(["saúde", "educação", "orçamento", "votação", "projeto", "município", "😀", "R$"])
+    texts = [" ".join(rng.choice(words, size=k)) for k in rng.integers(5, 80, n)]
+    engagement = rng.integers(0, 20_000, n)
+    lines = [f"ID: {i} | Texto: {text} | Engajamento: {e}" for i, (text, e) in enumerate(zip(texts, engagement), 1)]
+    return pd.DataFrame({"Análise": lines, "Manifestações reais": engagement})
+
+
+def write(sink, name, df, options):
+    with AiTxtWriter(sink, name, options, newline="") as writer:
+        writer.write(options.lines(df))
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 300_000])
+    parser.add_argument("--max-tokens", type=int, default=100_000)
+    parser.add_argument("--top-k", type=int, default=5_000)
+    args = parser.parse_args()
+
+    chunked = AiExportOptions(max_tokens=args.max_tokens)
+    ranked = AiExportOptions(max_tokens=args.max_tokens, top_k=args.top_k)
+    with Workspace(prefix="vclean-bench-") as workspace:
+        for n in args.sizes:
+            df = synthetic_frame(n)
+            start = time.perf_counter()
+            single = write(workspace.sink, f"unico_{n}.txt", df, AiExportOptions())
+            t_single = time.perf_counter() - start
+            start = time.perf_counter()
+            parts = write(workspace.sink, f"partes_{n}.txt", df, chunked)
+            t_parts = time.perf_counter() - start
+            start = time.perf_counter()
+            top = write(workspace.sink, f"top_{n}.txt", df, ranked)
+            t_top = time.perf_counter() - start
+
+            texts = [Path(path).read_text(encoding="utf-8") for path in parts.output_files]
+            assert "".join(texts) == Path(single.output_files[0]).read_text(encoding="utf-8")
+            assert all(len(text) <= chunked.budget or text.count("\n") == 1 for text in texts)
+            print(f"{n:>9} linhas | arquivo único {t_single:6.3f}s | {len(texts):>4} partes {t_parts:6.3f}s "
+                  f"({t_parts / n * 1e6:5.2f} µs/linha) | top-{args.top_k} {t_top:6.3f}s "
+                  f"({len(top.names)} partes) | equivalente")
+
+
+if __name__ == "__main__":
+    main()
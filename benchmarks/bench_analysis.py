@@ -0,0 +1,77 @@
+"""
+Benchmark das linhas de Análise (um format por linha + escrita em blocos) contra a versão original
+(quatro astype(str) somados com "+" e Series.to_csv), conferindo que o texto é o mesmo.
+
+    python benchmarks/bench_analysis.py [--sizes 10000 100000 1000000] [--legacy-limit 1000000]
+"""
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from analysis import POSTS_ANALYSIS_FIELDS, analysis_lines, write_lines  # noqa: E402
+
+
+def legacy_analysis(df):
+    """Implementação original (quatro "+" sobre colunas inteiras e to_csv), mantida como referência."""
+    analysis = (
+        "ID: " + df["ID"].astype(str) +
+        " | Texto: " + df["Descrição"].astype(str) +
+        " | Engajamento: " + df["Manifestações"].astype(str) +
+        " | Link: " + df["Link ocorrência"].astype(str)
+    )
+    f = io.StringIO()
+    analysis.to_csv(f, index=False, header=False)
+    return analysis, f.getvalue()
+
+
+def synthetic_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.array(["saúde", "educação", "orçamento", "votação", "projeto", "município", "😀", "R$", "50%"])
+    texts = [" ".join(rng.choice(words, size=k)) for k in rng.integers(5, 40, n)]
+    return pd.DataFrame({
+        "ID": np.arange(1, n + 1),
+        "Descrição": texts,
+        "Manifestações": rng.integers(0, 20_000, n),
+        "Link ocorrência": [f"https://exemplo.invalid/ocorrencia/{i}" for i in range(n)],
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-limit", type=int, default=1_000_000,
+                        help="maior tamanho em que a versão original também é executada")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        df = synthetic_frame(n)
+
+        start = time.perf_counter()
+        lines = analysis_lines(df, POSTS_ANALYSIS_FIELDS)
+        t_build = time.perf_counter() - start
+        start = time.perf_counter()
+        f = io.StringIO()
+        write_lines(f, lines)
+        t_write = time.perf_counter() - start
+        line = f"{n:>9} linhas | format {t_build:7.3f}s + escrita {t_write:7.3f}s"
+
+        if n <= args.legacy_limit:
+            start = time.perf_counter()
+            legacy, legacy_txt = legacy_analysis(df)
+            t_legacy = time.perf_counter() - start
+            assert lines.tolist() == legacy.tolist()
+            # Sem vírgula, aspas ou quebra de linha no texto, o to_csv não põe aspas: o arquivo é o mesmo
+            assert f.getvalue() == legacy_txt
+            line += f" | original {t_legacy:7.3f}s | {t_legacy / (t_build + t_write):5.1f}x | equivalente"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark do empacotamento do ZIP de resultados: o ZIP_STORED em BytesIO + getvalue() original
+contra o archive.build_archive (DEFLATE em alguns níveis e zstd, se o Python tiver) com artefatos
+sintéticos (corpus e _ai.txt grandes e um .xlsx). Mostra tamanho, tempo, pico de memória Python
+(tracemalloc) e o tempo estimado de download no link informado, e confere que o conteúdo
+extraído é o mesmo.
+
+    python benchmarks/bench_archive.py [--rows 200000] [--levels 1 6 9] [--mbps 20]
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from archive import ZIP_ZSTANDARD, ArchiveOptions, build_archive  # noqa: E402
+from sinks import ZipSink  # noqa: E402
+
+WORDS = ["saúde", "educação", "orçamento", "votação", "Câmara", "projeto", "município", "deputado", "lei", "verba"]
+
+
+def synthetic_artifacts(rows, seed=0):
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(5, 80))) for _ in range(rows)]
+    corpus = "".join(f"**** *id_{i}\n{text}\n\n" for i, text in enumerate(texts)).encode("utf-8")
+    ai = "".join(f"ID: {i} | Texto: {text} | Engajamento: {rng.randint(0, 20_000)}\n"
+                 for i, text in enumerate(texts)).encode("utf-8")
+    xlsx = BytesIO()
+    pd.DataFrame({"Descrição": texts[:min(rows, 50_000)]}).to_excel(xlsx, index=False)
+    return {"x_corpus.txt": corpus, "x_ai.txt": ai, "x_cleaned.xlsx": xlsx.getvalue()}
+
+
+def write_artifacts(artifacts, sink=None, hooks=None):
+    for name, data in artifacts.items():
+        with sink.open(name) as f:
+            f.write(data)
+
+
+def legacy_zip(artifacts):
+    """ZIP original da app: ZIP_STORED num BytesIO e getvalue()."""
+    zp = BytesIO()
+    with zipfile.ZipFile(zp, "w", zipfile.ZIP_STORED) as z, ZipSink(z) as sink:
+        write_artifacts(artifacts, sink=sink)
+    return zp.getvalue()
+
+
+def measured(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    data = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return data, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--mbps", type=float, default=20.0, help="banda do link (VPN) em Mbit/s")
+    args = parser.parse_args()
+
+    artifacts = synthetic_artifacts(args.rows)
+    total = sum(len(data) for data in artifacts.values())
+    print(f"artefatos: {total / 1e6:.1f} MB ({', '.join(f'{n} {len(d) / 1e6:.1f} MB' for n, d in artifacts.items())})")
+
+    candidates = {"stored + getvalue (original)": lambda: legacy_zip(artifacts)}
+    methods = [("deflate", level) for level in args.levels]
+    if ZIP_ZSTANDARD is not None:
+        methods += [("zstd", 3), ("zstd", 9)]
+    for method, level in methods:
+        options = ArchiveOptions(method, level)
+        candidates[f"archive {method} {level}"] = \
+            lambda options=options: build_archive(write_artifacts, artifacts, options=options)
+
+    for name, fn in candidates.items():
+        result, seconds, peak = measured(fn)
+        data = result if isinstance(result, bytes) else result.read()
+        with zipfile.ZipFile(BytesIO(data)) as z:
+            assert {n: z.read(n) for n in z.namelist()} == artifacts
+        if not isinstance(result, bytes):
+            result.close()
+        download = len(data) * 8 / (args.mbps * 1e6)
+        print(f"  {name:<30} {len(data) / 1e6:7.1f} MB | {seconds:6.2f}s | pico {peak / 1e6:7.1f} MB | "
+              f"download {download:6.1f}s a {args.mbps:g} Mbit/s")
+    print("conteúdo extraído igual aos artefatos em todos os casos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Microbenchmark do enrich_parlamentar_and_date (datas convertidas uma vez, Parlamentar vetorizado)
+contra a versão original, conferindo que a saída é a mesma.
+
+    python benchmarks/bench_enrich.py [--sizes 10000 100000 1000000] [--legacy-limit 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from stages import enrich_parlamentar_and_date  # noqa: E402
+
+
+def legacy_enrich_parlamentar_and_date(df):
+    """Implementação original (apply por linha e quatro conversões de data), mantida como referência."""
+    def get_title(casa):
+        return "Deputado(a)" if casa == "CÂMARA" else "Senador(a)" if casa == "SENADO" else ""
+
+    if {'Casa', 'Perfil/Nome da busca', 'Partido', 'Estado'}.issubset(df.columns):
+        df['Parlamentar'] = df.apply(
+            lambda row: f"{get_title(row['Casa'])} {row['Perfil/Nome da busca']} ({row['Partido']}/{row['Estado']})",
+            axis=1
+        )
+
+    if "Data publicação" in df.columns:
+        df["Data publicação - Date"] = df["Data publicação"].str[:8].str.strip()
+        df["Data publicação - Hour"] = df["Data publicação"].str[9:].str.strip()
+        df = df.drop(columns=["Data publicação"])
+
+    if "Data publicação - Date" in df.columns:
+        df["Data publicação - Date"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%y", errors='coerce')
+        df["Data publicação - Date"] = df["Data publicação - Date"].dt.strftime("%d/%m/%Y")
+        df["Dia"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.day
+        df["Mês"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.month
+        df["Ano"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.year
+
+    if "Data publicação - Hour" in df.columns:
+        df["Hora"] = df["Data publicação - Hour"].str[:2]
+
+    return df
+
+
+def synthetic_frame(n, seed=0):
+    rng = random.Random(seed)
+    dates = [
+        rng.choice(["NA", None]) if rng.random() < 0.02 else
+        f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/25 {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+        for _ in range(n)
+    ]
+    return pd.DataFrame({
+        "Perfil/Nome da busca": [f"Parlamentar {rng.randint(1, 500)}" for _ in range(n)],
+        "Casa": [rng.choice(["CÂMARA", "SENADO", None]) for _ in range(n)],
+        "Partido": [rng.choice(["PT", "PL", "MDB", None]) for _ in range(n)],
+        "Estado": [rng.choice(["SP", "RJ", "MG", None]) for _ in range(n)],
+        "Data publicação": dates,
+    })
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df.copy())
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="maior tamanho em que a versão original também é executada")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        df = synthetic_frame(n)
+        fast, t_fast = timed(enrich_parlamentar_and_date, df)
+        line = f"{n:>9} linhas | vetorizado {t_fast:8.3f}s"
+        if n <= args.legacy_limit:
+            legacy, t_legacy = timed(legacy_enrich_parlamentar_and_date, df)
+            pd.testing.assert_frame_equal(fast, legacy)
+            line += f" | original {t_legacy:8.3f}s | {t_legacy / t_fast:6.1f}x | equivalente"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compara os backends de escrita de xlsx (openpyxl x xlsxwriter constant_memory) em tempo e pico
+de memória, numa aba larga como a 'Cleaned Data' do relatório quinzenal (texto + muitas tags 0/1).
+
+    python benchmarks/bench_excel_writer.py [--rows 5000 20000] [--tags 200]
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from excel_writer import write_excel  # noqa: E402
+
+
+def synthetic_cleaned_data(rows, tags, seed=0):
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "ID": np.arange(1, rows + 1),
+        "Perfil/Nome da busca": [f"Parlamentar {rng.randint(1, 500)}" for _ in range(rows)],
+        "Nome publicador": [f"publicador_{rng.randint(1, 5000)}" for _ in range(rows)],
+        "Descrição": [" ".join(rng.choice(["reforma", "saúde", "votação", "Brasília", "#pl"])
+                               for _ in range(rng.randint(5, 60))) for _ in range(rows)],
+        "Manifestações": np_rng.integers(0, 10_000, rows),
+        "Manifestações reais": np_rng.integers(0, 10_000, rows).astype(float),
+        "Link ocorrência": [f"https://exemplo.com/p/{i}" for i in range(rows)],
+        "Serviço": [rng.choice(["Instagram", "Twitter", "Facebook"]) for _ in range(rows)],
+    })
+    tag_matrix = pd.DataFrame(
+        (np_rng.random((rows, tags)) < 0.05).astype("uint8"),
+        columns=[f"Tag {i}" for i in range(tags)],
+    )
+    return pd.concat([df, tag_matrix], axis=1)
+
+
+def measure(backend, df, path):
+    start = time.perf_counter()
+    write_excel(path, df, sheet_name="Cleaned Data", backend=backend)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+
+    tracemalloc.start()
+    write_excel(path, df, sheet_name="Cleaned Data", backend=backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[5_000, 20_000])
+    parser.add_argument("--tags", type=int, default=200)
+    args = parser.parse_args()
+
+    backends = ["openpyxl"]
+    if importlib.util.find_spec("xlsxwriter") is not None:
+        backends.append("xlsxwriter")
+    else:
+        print("xlsxwriter não instalado: medindo só openpyxl")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            df = synthetic_cleaned_data(rows, args.tags)
+            for backend in backends:
+                elapsed, peak, size = measure(backend, df, Path(tmp) / f"{backend}.xlsx")
+                print(f"{rows:>7} linhas x {df.shape[1]} colunas | {backend:<10} | "
+                      f"{elapsed:7.2f}s | pico {peak / 2**20:8.1f} MiB | arquivo {size / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
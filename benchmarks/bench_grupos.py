@@ -0,0 +1,79 @@
+"""
+Equivalência e benchmark do split_grupos colunar contra a implementação original por linha.
+
+    python benchmarks/bench_grupos.py [--sizes 10000 100000 1000000] [--legacy-limit 100000]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from grupos import GRUPOS_FIELDS, LIST_CASA, LIST_ESTADO, LIST_PARTIDO, split_grupos  # noqa: E402
+
+
+def legacy_split_grupos(grupos):
+    """Implementação original (apply por linha + apply(pd.Series)), mantida como referência."""
+    def split_row(row):
+        items = row.split(" | ") if isinstance(row, str) else []
+        casa = partido = estado = extras = None
+        items = ["CÂMARA" if i == "CAMARA" else i for i in items]
+        items = ["PODEMOS" if i == "PODE" else i for i in items]
+        for item in items:
+            if item in LIST_CASA and not casa:
+                casa = item
+            elif item in LIST_PARTIDO and not partido:
+                partido = item
+            elif item in LIST_ESTADO and not estado:
+                estado = item
+            else:
+                extras = extras + " | " + item if extras else item
+        return casa, partido, estado, extras
+
+    out = grupos.apply(split_row).apply(pd.Series)
+    out.columns = GRUPOS_FIELDS
+    return out
+
+
+def synthetic_grupos(n, seed=0):
+    rng = random.Random(seed)
+    vocab = LIST_CASA + LIST_PARTIDO + LIST_ESTADO + ["CAMARA", "PODE", "FRENTE PARLAMENTAR", "LIDERANÇA", ""]
+    values = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            values.append(None)
+            continue
+        values.append(" | ".join(rng.choice(vocab) for _ in range(rng.randint(1, 6))))
+    return pd.Series(values, dtype=object).str.upper()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="maior tamanho em que a versão original também é executada")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        grupos = synthetic_grupos(n)
+        fast, t_fast = timed(split_grupos, grupos)
+        line = f"{n:>9} linhas | colunar {t_fast:8.3f}s"
+        if n <= args.legacy_limit:
+            legacy, t_legacy = timed(legacy_split_grupos, grupos)
+            pd.testing.assert_frame_equal(fast, legacy.astype(object), check_dtype=False)
+            line += f" | original {t_legacy:8.3f}s | {t_legacy / t_fast:6.1f}x | equivalente"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Microbenchmark da atribuição de macrotemas (um produto tag → macrotema para todas as linhas)
+contra o laço original por macrotema, conferindo que o rótulo único é o mesmo.
+
+    python benchmarks/bench_macrothemes.py [--sizes 10000 100000 1000000] [--tags 300] [--macros 4 20 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from biweekly import assign_macrothemes  # noqa: E402
+
+
+def legacy_assign_macrothemes(df, macrotheme_definitions):
+    """Implementação original (uma soma por macrotema; o último que casa sobrescreve), mantida como referência."""
+    assignments = pd.DataFrame(0, index=df.index, columns=['Macrotema'])
+    for macro, tags in macrotheme_definitions.items():
+        mask = df[tags].sum(axis=1) > 0
+        assignments.loc[mask, 'Macrotema'] = macro
+    return assignments
+
+
+def synthetic_tags(n, n_tags, seed=0):
+    rng = np.random.default_rng(seed)
+    values = (rng.random((n, n_tags)) < 0.03).astype(np.uint8)
+    return pd.DataFrame(values, columns=[f"Tag {i}" for i in range(n_tags)])
+
+
+def synthetic_definitions(n_macros, n_tags, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        macro: [f"Tag {i}" for i in rng.choice(n_tags, size=rng.integers(0, 6), replace=False)]
+        for macro in range(1, n_macros + 1)
+    }
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--tags", type=int, default=300)
+    parser.add_argument("--macros", type=int, nargs="+", default=[4, 20, 50])
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        df = synthetic_tags(n, args.tags)
+        for n_macros in args.macros:
+            definitions = synthetic_definitions(n_macros, args.tags)
+            fast, t_fast = timed(assign_macrothemes, df, definitions)
+            legacy, t_legacy = timed(legacy_assign_macrothemes, df, definitions)
+            pd.testing.assert_series_equal(fast.labels, legacy['Macrotema'])
+            print(f"{n:>9} linhas | {n_macros:>3} macrotemas | matriz {t_fast:7.3f}s | "
+                  f"original {t_legacy:7.3f}s | {t_legacy / t_fast:6.1f}x | equivalente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark ponta a ponta dos três relatórios (Publicações, Notícias e Quinzenal) sobre exportações
+sintéticas (ver synthetic_export.py), com o tempo, as linhas e a memória de cada etapa do pipeline.
+O resultado é gravado em JSON, com o commit e as versões, para comparar execuções entre commits;
+--baseline imprime a razão por etapa contra um JSON anterior. Roda offline, sem dados reais.
+
+    python benchmarks/bench_pipeline.py [--sizes 1000 10000 50000] [--tags 30] [--chunksize N]
+                                        [--output resultado.json] [--baseline anterior.json]
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from biweekly import full_pipeline  # noqa: E402
+from daily_posts import process_and_export_excel as process_publicacoes  # noqa: E402
+from news import process_and_export_excel as process_noticias  # noqa: E402
+from synthetic_export import write_synthetic_export  # noqa: E402
+from workbook import TAGS_SHEET, read_sheet_columns  # noqa: E402
+from workspace import Workspace  # noqa: E402
+
+# === Constants ===
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+N_MACROTHEMES = 4
+
+
+class CollectRuns:
+    """Hook que só guarda o resumo de cada execução (sem console nem log JSON do pipeline)."""
+
+    def __init__(self):
+        self.runs = []
+
+    def run_finished(self, run):
+        self.runs.append(run.to_dict())
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def macrotheme_definitions(path, n_macros=N_MACROTHEMES):
+    """Distribui as tags da exportação em n_macros macrotemas (como a seleção feita na app)."""
+    tags = read_sheet_columns(path, TAGS_SHEET)
+    return {i + 1: tags[i::n_macros] for i in range(n_macros)}
+
+
+def run_reports(path, sink, chunksize=None):
+    hook = CollectRuns()
+    definitions = macrotheme_definitions(path)
+    reports = {
+        "publicacoes": lambda: process_publicacoes(path, "bench_cleaned.xlsx", chunksize=chunksize, sink=sink,
+                                                   hooks=[hook]),
+        "noticias": lambda: process_noticias(path, "bench_cleaned.xlsx", chunksize=chunksize, sink=sink,
+                                             hooks=[hook]),
+        "quinzenal": lambda: full_pipeline(path, definitions, "bench_cleaned.xlsx",
+                                           chunksize=chunksize, sink=sink, hooks=[hook]),
+    }
+    wall = {}
+    for name, report in reports.items():
+        start = time.perf_counter()
+        report()
+        wall[name] = time.perf_counter() - start
+    return [{**run, "wall_seconds": round(wall[run["report"]], 4)} for run in hook.runs]
+
+
+def compare(results, baseline):
+    """Razão de tempo (atual / baseline) por relatório, tamanho e etapa."""
+    previous = {
+        (run["report"], entry["rows"], stage["stage"]): stage["seconds"]
+        for entry in baseline["results"] for run in entry["runs"] for stage in run["stages"]
+    }
+    rows = []
+    for entry in results:
+        for run in entry["runs"]:
+            for stage in run["stages"]:
+                before = previous.get((run["report"], entry["rows"], stage["stage"]))
+                if before:
+                    rows.append({"relatório": run["report"], "linhas": entry["rows"], "etapa": stage["stage"],
+                                 "antes (s)": before, "agora (s)": stage["seconds"],
+                                 "razão": round(stage["seconds"] / before, 2)})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--tags", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunksize", type=int, default=None, help="roda os relatórios no modo streaming")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="JSON de saída (padrão: benchmarks/results/<data>_<commit>.json)")
+    parser.add_argument("--baseline", type=Path, default=None, help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    for n in args.sizes:
+        with Workspace() as ws:
+            path = ws.path / f"sintetico_{n}.xlsx"
+            write_synthetic_export(path, n, tags=args.tags, seed=args.seed)
+            runs = run_reports(path, ws.sink, chunksize=args.chunksize)
+            results.append({"rows": n, "input_mb": round(path.stat().st_size / 2**20, 2), "runs": runs})
+            for run in runs:
+                print(f"{n:>9} linhas | {run['report']:<11} {run['wall_seconds']:8.3f}s | " + " · ".join(
+                    f"{stage['stage']} {stage['seconds']:.3f}s" for stage in run["stages"]
+                ))
+
+    output = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "params": {"sizes": args.sizes, "tags": args.tags, "seed": args.seed, "chunksize": args.chunksize},
+        "results": results,
+    }
+    out_path = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}_{commit or 'sem-commit'}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"💾 Resultados salvos em: {out_path}")
+
+    if args.baseline:
+        ratios = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")))
+        print(ratios.to_string(index=False) if not ratios.empty else "Nenhuma etapa em comum com o baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Microbenchmark das tabelas resumo do relatório quinzenal (um único groupby compartilhado)
+contra as três funções originais, conferindo que pvt_summary, macro_freq e microtheme_freq são iguais.
+
+    python benchmarks/bench_summaries.py [--sizes 10000 100000 1000000] [--tags 300] [--legacy-limit 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from biweekly import assign_macrothemes  # noqa: E402
+from summaries import BiweeklySummaries  # noqa: E402
+
+
+def legacy_summaries(df, assignments, macrotheme_definitions):
+    """Implementação original (três passadas, checagem 0/1 por coluna), mantida como referência."""
+    df['Macrotema'] = assignments['Macrotema']
+    names = {macro: " + ".join(tags) for macro, tags in macrotheme_definitions.items()}
+    df['Macrotema Nome'] = df['Macrotema'].map(names).fillna('Sem Macrotema')
+    total_posts = df.shape[0]
+
+    summary = df.groupby(['Ano', 'Mês', 'Dia', 'Macrotema Nome']).agg(
+        Total_Publicações=('ID', 'count'),
+        Total_Engajamento=('Manifestações reais', 'sum')
+    ).reset_index().sort_values(['Mês', 'Dia'])
+
+    macro_freq = (df['Macrotema Nome'].value_counts(normalize=True) * 100).round(2).reset_index()
+    macro_freq.columns = ['Macrotema', 'Frequência Relativa (%)']
+
+    themes_cols = df.columns[df.columns.get_loc('Serviço') + 1:]
+    valid_theme_cols = [col for col in themes_cols if set(df[col].dropna().unique()).issubset({0, 1})]
+    numeric_df = df[valid_theme_cols].apply(pd.to_numeric, errors='coerce')
+    microtheme_freq = (numeric_df.sum() / total_posts).round(4).reset_index()
+    microtheme_freq.columns = ['Microtema', 'Frequência Relativa']
+    return summary, macro_freq, microtheme_freq
+
+
+def synthetic_frame(n, n_tags, seed=0):
+    rng = np.random.default_rng(seed)
+    day = pd.Series(pd.to_datetime("2025-01-01") + pd.to_timedelta(rng.integers(0, 60, n), unit="D"))
+    day[rng.random(n) < 0.02] = pd.NaT
+    df = pd.DataFrame({
+        "ID": np.arange(1, n + 1),
+        "Manifestações reais": rng.integers(0, 5_000, n).astype(float),
+        "Serviço": rng.choice(["Instagram", "Twitter"], n),
+    })
+    tags = pd.DataFrame((rng.random((n, n_tags)) < 0.05).astype(np.uint8), columns=[f"Tag {i}" for i in range(n_tags)])
+    df = pd.concat([df, tags], axis=1)
+    df["Dia"], df["Mês"], df["Ano"] = day.dt.day, day.dt.month, day.dt.year
+    return df, tags.columns.tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--tags", type=int, default=300)
+    parser.add_argument("--legacy-limit", type=int, default=100_000,
+                        help="maior tamanho em que a versão original também é executada")
+    args = parser.parse_args()
+
+    definitions = {1: ["Tag 0", "Tag 1"], 2: ["Tag 2"], 3: ["Tag 3", "Tag 4", "Tag 5"], 4: []}
+    for n in args.sizes:
+        df, tag_columns = synthetic_frame(n, args.tags)
+        assignments = assign_macrothemes(df, definitions)
+
+        start = time.perf_counter()
+        summaries = BiweeklySummaries(df, assignments, definitions, tag_columns)
+        tables = summaries.pivot_summary(), summaries.macro_freq(), summaries.microtheme_freq()
+        t_fast = time.perf_counter() - start
+        line = f"{n:>9} linhas | agregado único {t_fast:8.3f}s"
+
+        if n <= args.legacy_limit:
+            start = time.perf_counter()
+            legacy = legacy_summaries(df.copy(), pd.DataFrame({'Macrotema': assignments.labels}), definitions)
+            t_legacy = time.perf_counter() - start
+            for fast, reference in zip(tables, legacy):
+                pd.testing.assert_frame_equal(fast, reference)
+            line += f" | original {t_legacy:8.3f}s | {t_legacy / t_fast:6.1f}x | equivalente"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
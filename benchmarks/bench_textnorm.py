@@ -0,0 +1,80 @@
+"""
+Vazão (MB/s de texto UTF-8) da limpeza da Descrição para o corpus: o re.sub por linha original,
+o str.translate por linha (pandas .str.translate) e o TextNormalizer sobre a coluna inteira,
+mais o perfil de comparação usado na deduplicação. Em textos sem emojis, links ou quebras de
+linha, confere que o corpus sai igual ao do re.sub original.
+
+    python benchmarks/bench_textnorm.py [--rows 200000] [--repeat 3]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from corpus import CORPUS_REMOVE_CHARS, corpus_normalizer  # noqa: E402
+from dedup import COMPARISON_NORMALIZER  # noqa: E402
+
+PLAIN_WORDS = ["saúde", "educação", "orçamento", "votação", "Câmara", "R$", "50%", "a*b", '"aspas"', "ok?",
+               "projeto:", "<b>", "pré-candidato", "d'água", "|"]
+HOSTILE_WORDS = ["😀", "👍🏽", "❤️", "https://t.co/abc123", "www.exemplo.invalid/x", "linha\nquebra", "tab\there"]
+
+
+def legacy_clean_description(text):
+    """Limpeza original, um re.sub por linha (daily_posts/news; o quinzenal não tinha o '?')."""
+    return re.sub(r'[\|:\*"\?<>\|\$\-\'%]', '', str(text))
+
+
+def synthetic_texts(rows, hostile_share, seed=0):
+    rng = random.Random(seed)
+    words = PLAIN_WORDS + (HOSTILE_WORDS if hostile_share else [])
+    weights = [1.0] * len(PLAIN_WORDS) + [hostile_share * len(PLAIN_WORDS) / len(HOSTILE_WORDS)] * \
+        (len(HOSTILE_WORDS) if hostile_share else 0)
+    return pd.Series([" ".join(rng.choices(words, weights, k=rng.randint(5, 80))) for _ in range(rows)])
+
+
+def throughput(fn, texts, repeat):
+    megabytes = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    best = min(_timed(fn, texts) for _ in range(repeat))
+    return megabytes / best, best
+
+
+def _timed(fn, texts):
+    start = time.perf_counter()
+    fn(texts)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    table = str.maketrans("", "", CORPUS_REMOVE_CHARS)
+    normalizer = corpus_normalizer(CORPUS_REMOVE_CHARS)
+    candidates = {
+        "re.sub por linha (original)": lambda s: [legacy_clean_description(text) for text in s],
+        "str.translate por linha": lambda s: s.str.translate(table),
+        "TextNormalizer corpus": normalizer.normalize,
+        "TextNormalizer comparação": COMPARISON_NORMALIZER.normalize,
+    }
+
+    plain = synthetic_texts(args.rows, hostile_share=0)
+    assert normalizer.normalize(plain).tolist() == [legacy_clean_description(text) for text in plain]
+
+    for label, texts in (("sem emojis/links", plain), ("com emojis/links/quebras", synthetic_texts(args.rows, 0.1))):
+        print(f"{args.rows} linhas {label}:")
+        for name, fn in candidates.items():
+            rate, seconds = throughput(fn, texts, args.repeat)
+            print(f"  {name:<30} {rate:7.1f} MB/s ({seconds:.3f}s)")
+    print("corpus igual ao re.sub original nos textos sem emojis/links/quebras")
+
+
+if __name__ == "__main__":
+    main()
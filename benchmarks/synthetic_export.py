@@ -0,0 +1,113 @@
+"""
+Gerador de exportações sintéticas no formato da ferramenta de monitoramento, para os benchmarks:
+4 linhas de cabeçalho antes dos nomes das colunas, aba "Ocorrências" com Grupos no formato
+"CASA | PARTIDO | UF | extras", datas "dd/mm/yy hh:mm" e contadores de engajamento, e aba "Tags"
+com "Sim"/"Não". Tudo sai de um gerador com semente fixa: mesmos parâmetros, mesmo arquivo.
+Nenhum dado real é usado.
+
+    python benchmarks/synthetic_export.py saida.xlsx [--rows 5000] [--tags 30] [--seed 0]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from grupos import LIST_CASA, LIST_ESTADO, LIST_PARTIDO  # noqa: E402
+from stages import ENGAGEMENT_COLS  # noqa: E402
+from workbook import HEADER_ROWS, MAIN_SHEET, TAGS_SHEET  # noqa: E402
+
+# === Constants ===
+# Colunas de texto/metadados da aba principal (as descartadas na leitura também aparecem, como na exportação real)
+TEXT_COLUMNS = [
+    "Data publicação", "Descrição monitoramento", "Perfil/Nome da busca", "Nome publicador", "Título",
+    "Descrição", "Link ocorrência", "Manifestações", "Grupos", "Thumbnail", "Id ocorrência no serviço",
+    "Cidade/Estado", "Data coleta", "Linguagem", "Serviço",
+]
+COLUMNS = TEXT_COLUMNS[:8] + ENGAGEMENT_COLS + TEXT_COLUMNS[8:]
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Fábio", "Gabriela", "Hélio", "Íris", "João",
+               "Luíza", "Marcos", "Natália", "Otávio", "Paula", "Renato", "Sônia", "Tiago"]
+LAST_NAMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Carvalho", "Ribeiro", "Araújo"]
+SERVICES = ["Instagram - post", "Twitter, X", "Facebook - página", "YouTube", "TikTok", "Notícias - portal"]
+EXTRAS = ["Frente Parlamentar", "Bancada Ruralista", "Liderança", "Comissão de Saúde", "Suplente"]
+WORDS = ["saúde", "educação", "economia", "segurança", "orçamento", "reforma", "votação", "projeto",
+         "audiência", "emenda", "município", "investimento", "hospital", "escola", "estrada", "#pauta",
+         "@gabinete", "😀", "👏", "R$", "50%", "\"urgente\"", "-", "|", "*"]
+TAG_VALUES = ["Sim", "Não", "Não", "Não", " sim ", None]
+
+
+def _grupos(rng):
+    if rng.random() < 0.08:
+        return None
+    tokens = [rng.choice(LIST_CASA + ["CAMARA", "câmara"]), rng.choice(LIST_PARTIDO + ["PODE"]),
+              rng.choice(LIST_ESTADO)]
+    tokens += rng.sample(EXTRAS, rng.randint(0, 2))
+    rng.shuffle(tokens)
+    return " | ".join(tokens)
+
+
+def _text(rng, n_words):
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def _main_row(rng, i, profiles):
+    date = "-" if rng.random() < 0.02 else (
+        f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.choice([24, 25])} "
+        f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"
+    )
+    engagement = [rng.randint(0, 5000) if rng.random() < 0.7 else "-" for _ in ENGAGEMENT_COLS]
+    description = _text(rng, rng.randint(5, 60))
+    if rng.random() < 0.1:
+        description += "\n" + _text(rng, rng.randint(3, 20))
+    return [
+        date, "Monitoramento parlamentar", rng.choice(profiles), f"publicador_{rng.randint(1, 500)}",
+        _text(rng, rng.randint(3, 12)), description, f"https://exemplo.invalid/ocorrencia/{i}",
+        rng.randint(0, 20000), *engagement, _grupos(rng), "https://exemplo.invalid/thumb.jpg", i,
+        rng.choice(["São Paulo/SP", "Rio de Janeiro/RJ", "-"]), "01/01/25 00:00", "pt",
+        rng.choice(SERVICES),
+    ]
+
+
+def write_synthetic_export(path, rows, tags=30, seed=0):
+    """Grava em `path` uma exportação sintética com `rows` linhas e `tags` colunas na aba Tags."""
+    rng = random.Random(seed)
+    profiles = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} - {rng.choice(LIST_ESTADO)}"
+                for _ in range(max(10, rows // 50))]
+
+    wb = Workbook(write_only=True)
+    main = wb.create_sheet(MAIN_SHEET)
+    for _ in range(HEADER_ROWS):
+        main.append(["Relatório exportado"])
+    # Alguns cabeçalhos vêm entre aspas, como na exportação real (ver clean_column_name)
+    main.append([f'"{col}"' if pos % 5 == 0 else col for pos, col in enumerate(COLUMNS)])
+    for i in range(rows):
+        main.append(_main_row(rng, i, profiles))
+
+    tag_sheet = wb.create_sheet(TAGS_SHEET)
+    for _ in range(HEADER_ROWS):
+        tag_sheet.append(["Tags"])
+    tag_sheet.append([f"{rng.choice(WORDS[:15]).title()} {t}" for t in range(tags)])
+    for _ in range(rows):
+        tag_sheet.append([rng.choice(TAG_VALUES) for _ in range(tags)])
+
+    wb.save(path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--tags", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_synthetic_export(args.path, args.rows, tags=args.tags, seed=args.seed)
+    print(f"✅ Exportação sintética salva em: {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,327 +1,314 @@
 # === Full clean.py with Fix for 'Análise' Column and Macrotheme Processing ===
 
 import pandas as pd
-import re
-from pathlib import Path
 import traceback
-
-# === Constants ===
-UNNECESSARY_COLUMNS = [
-    "Descrição monitoramento", "Link serviço", "Descrição Pai", "Link ocorrência Pai", "Thumbnail",
-    "Thumbnail pai", "Data coleta", "Linguagem", "Foto publicador", "PageRank", "Estrelas",
-    "Qualificação", "Qualificada por", "Data da qualificação", "Qualificação automática", "Para",
-    "Latitude", "Longitude", "Id ocorrência no serviço", "Id ocorrência pai no serviço",
-    "Link id ocorrência pai", "Arquivada", "Desarquivada", "Data Resposta",
-    "Manifestações Detalhadas", "Termos", "Links", "Perfis", "Hashtags",
-    "comments", "shares", "likes", "dislikes", "love", "wow", "haha", "sad", "angry",
-    "thankful", "pride", "retweets", "favorites", "rating", "vendas", "resenhas", "votes", "views", "quotes",
-    "videoViews", "URL da busca", "Id publicador", "Qualificação aprovada por", "Analisada por",
-    "Data analisada", "Avaliação", "Tipo/Conteúdo", "Observação", "Unnamed: 73"
-]
-
-ENGAGEMENT_COLS = [
-    "comments", "shares", "likes", "dislikes", "love", "wow", "haha", "sad", "angry",
-    "thankful", "pride", "retweets", "favorites", "rating", "vendas",
-    "resenhas", "votes", "views", "quotes"
-]
-
-LIST_CASA = ["CÂMARA", "SENADO"]
-LIST_PARTIDO = ["MDB", "PT", "PRD", "PP", "PSDB", "PDT", "UNIÃO", "PL", "PODEMOS", "PSB", "REPUBLICANOS",
-                "PV", "AVANTE", "PSC", "PSOL", "PCDOB", "PSD", "SOLIDARIEDADE", "NOVO", "REDE", "PMB",
-                "UP", "DC", "PCO", "PSTU", "PCB", "PRTB", "MOBILIZA", "AGIR", "CIDADANIA", "PROS", "PATRIOTA"]
-LIST_ESTADO = ["AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA", "PB",
-                "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"]
-
-SPECIFIC_OVERRIDES = {
-    "Nilto Tatto": {"Partido": "PT", "Estado": "SP"},
-    "Socorro Neri": {"Partido": "PP", "Estado": "AC"},
-    "AJ Albuquerque": {"Partido": "PP", "Estado": "CE"},
-    "Duarte Junior": {"Partido": "PSB", "Estado": "MA"},
-    "Julio Cesar": {"Partido": "PSD", "Estado": "PI"},
-    "Júlio César": {"Partido": "PSD", "Estado": "PI"},
-    "Vicentinho Júnior": {"Partido": "PP", "Estado": "TO"},
-    "Yury do Paredão": {"Partido": "MDB", "Estado": "CE"}
-}
+from contextlib import ExitStack
+
+from analysis import AiExportOptions, AiTxtWriter, excel_columns
+from corpus import BIWEEKLY_REMOVE_CHARS, build_corpus_text, export_corpus, write_corpus
+from dedup import drop_duplicate_posts
+from excel_writer import ExcelSheetsWriter
+import macrothemes
+from parallel import EXPORT_MAX_WORKERS, run_parallel
+from partitions import KEY_COLUMN, PartitionStore, row_keys
+from pipeline import BIWEEKLY_INCREMENTAL_STAGES, BIWEEKLY_STAGES, DUPLICATES_STAGE, PipelineRun, with_stage
+from sinks import as_sink, default_sink, open_text
+from stages import (READ_SCHEMAS, add_analysis_column, clean_columns_and_values, enrich_parlamentar_and_date,
+                    output_base_name, process_grupos_column)
+from streaming import STREAM_CHUNK_ROWS, EmptyColumnTracker
+from summaries import BiweeklySummaries
+from tags import merge_tags
+from workbook import MAIN_SHEET, TAGS_SHEET, insert_id_column, iter_workbook_chunks, load_sheets
 
 # === Helper Functions ===
 
-def clean_description(text):
-    return re.sub(r'[\|:\*"<>\$\-\'%]', '', str(text))
-
 def export_iramuteq(df, output_path):
-    lines = []
-    for _, row in df.iterrows():
-        id_val = row.get("ID", "")
-        nome = row.get("Nome publicador", "")
-        descricao = clean_description(row.get("Descrição", ""))
-        lines.append(f"**** *id_{id_val} *u_{nome}\n{descricao}\n")
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
-
-def load_and_clean_sheet(filepath, sheet_name, is_main=True):
-    df = pd.read_excel(filepath, sheet_name=sheet_name, skiprows=4)
-    df.columns = df.columns.str.replace('"', '').str.strip()
-    if is_main:
-        df.insert(0, 'ID', range(1, len(df) + 1))
-    return df
-
-def clean_columns_and_values(df):
-    engagement_present = [col for col in ENGAGEMENT_COLS if col in df.columns]
-    if engagement_present:
-        df["Manifestações reais"] = df[engagement_present].apply(pd.to_numeric, errors='coerce').sum(axis=1)
-        if "Manifestações" in df.columns:
-            idx = df.columns.get_loc("Manifestações") + 1
-            cols = df.columns.tolist()
-            cols.insert(idx, cols.pop(cols.index("Manifestações reais")))
-            df = df[cols]
-
-    df = df.drop(columns=set(UNNECESSARY_COLUMNS).intersection(df.columns), errors="ignore")
-    df = df.replace("-", "NA").dropna(axis=1, how="all")
-
-    for col in ['Perfil/Nome da busca', 'Serviço']:
-        if col in df.columns:
-            df[col] = df[col].str.split(r"[-,]").str[0].str.strip()
-
-    return df
-
-def process_grupos_column(df):
-    if "Grupos" in df.columns:
-        df['Grupos'] = df['Grupos'].str.upper()
-
-        def split_grupos(row):
-            items = row.split(" | ") if isinstance(row, str) else []
-            casa = partido = estado = extras = None
-            items = ["CÂMARA" if i == "CAMARA" else i for i in items]
-            items = ["PODEMOS" if i == "PODE" else i for i in items]
-            for item in items:
-                if item in LIST_CASA and not casa:
-                    casa = item
-                elif item in LIST_PARTIDO and not partido:
-                    partido = item
-                elif item in LIST_ESTADO and not estado:
-                    estado = item
-                else:
-                    extras = extras + " | " + item if extras else item
-            return casa, partido, estado, extras
-
-        df[['Casa', 'Partido', 'Estado', 'Extras']] = df['Grupos'].apply(split_grupos).apply(pd.Series)
-        df = df.drop(columns=['Grupos'])
-
-    if 'Perfil/Nome da busca' in df.columns:
-        for name, overrides in SPECIFIC_OVERRIDES.items():
-            mask = df['Perfil/Nome da busca'].str.contains(name, na=False, case=False)
-            for key, value in overrides.items():
-                df.loc[mask, key] = value
-
-    for col in ['Casa', 'Partido', 'Estado']:
-        if col in df.columns and df[col].isnull().all():
-            df = df.drop(columns=[col])
-
-    return df
-
-def enrich_parlamentar_and_date(df):
-    def get_title(casa):
-        return "Deputado(a)" if casa == "CÂMARA" else "Senador(a)" if casa == "SENADO" else ""
-
-    if {'Casa', 'Perfil/Nome da busca', 'Partido', 'Estado'}.issubset(df.columns):
-        df['Parlamentar'] = df.apply(
-            lambda row: f"{get_title(row['Casa'])} {row['Perfil/Nome da busca']} ({row['Partido']}/{row['Estado']})",
-            axis=1
-        )
-
-    if "Data publicação" in df.columns:
-        df["Data publicação - Date"] = df["Data publicação"].str[:8].str.strip()
-        df["Data publicação - Hour"] = df["Data publicação"].str[9:].str.strip()
-        df = df.drop(columns=["Data publicação"])
-
-    if "Data publicação - Date" in df.columns:
-        df["Data publicação - Date"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%y", errors='coerce')
-        df["Data publicação - Date"] = df["Data publicação - Date"].dt.strftime("%d/%m/%Y")
-        df["Dia"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.day
-        df["Mês"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.month
-        df["Ano"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.year
+    export_corpus(df, output_path, label_column="Nome publicador", remove_chars=BIWEEKLY_REMOVE_CHARS)
 
-    if "Data publicação - Hour" in df.columns:
-        df["Hora"] = df["Data publicação - Hour"].str[:2]
+# === Full Pipeline to Process, Export, and Save ===
 
-    return df
+def assign_macrothemes(df, macrotheme_definitions, multilabel=False):
+    """
+    Atribui macrotemas a todas as linhas de uma vez (matriz tag → macrotema).
+    O retorno traz o rótulo único (.labels, coluna 'Macrotema') e a pertinência a cada
+    macrotema (.membership), usada quando multilabel=True (análise multitemática).
+    """
+    return macrothemes.assign(df, macrotheme_definitions, multilabel=multilabel)
 
-def add_analysis_column(df):
-    for col in ['ID', 'Descrição', 'Manifestações', 'Link ocorrência']:
-        if col not in df.columns:
-            df[col] = ""
-    df["Análise"] = (
-        "ID: " + df["ID"].astype(str) +
-        " | Texto: " + df["Descrição"].astype(str) +
-        " | Engajamento: " + df["Manifestações"].astype(str) +
-        " | Link: " + df["Link ocorrência"].astype(str)
-    )
-    return df
+def macrotheme_txt_name(macro, tags, base_name):
+    # Sufixo de tags (underscore, minúsculas) ou 'sem_tags'
+    name_part = "_".join(
+        tag.lower().replace(" ", "_") for tag in tags
+    ) or "sem_tags"
+    return f"{base_name}_macrotema-{macro}_{name_part}.txt"
 
-# === Full Pipeline to Process, Export, and Save ===
+class MacrothemeTxtWriter:
+    """
+    Grava os .txt de macrotema de forma incremental (um bloco de linhas por vez).
+    Cada arquivo só é criado quando o macrotema recebe a primeira linha.
+    output_dir pode ser um diretório ou um sink (ex.: ZipSink).
+    ai_export (analysis.AiExportOptions) divide cada arquivo em partes e/ou mantém as K linhas
+    mais engajadas de cada macrotema (com top_k, write deve receber todas as linhas de uma vez).
+    """
 
-def get_macrotheme_names(macrotheme_definitions):
-    macrotheme_names = {}
-    for macro, tags in macrotheme_definitions.items():
-        name = " + ".join(tags)
-        macrotheme_names[macro] = name
-    return macrotheme_names
-
-def assign_macrothemes(df, macrotheme_definitions):
-    tag_columns = [col for col in df.columns if col not in df.columns[:df.columns.get_loc('Serviço')+1]]
-    assignments = pd.DataFrame(0, index=df.index, columns=['Macrotema'])
-    for macro, tags in macrotheme_definitions.items():
-        mask = df[tags].sum(axis=1) > 0
-        assignments.loc[mask, 'Macrotema'] = macro
-    return assignments
-
-def export_macrotheme_txts(df, assignments, macrotheme_definitions, base_name, output_dir):
+    def __init__(self, macrotheme_definitions, base_name, output_dir, ai_export=None):
+        self.macrotheme_definitions = macrotheme_definitions
+        self.base_name = base_name
+        self.sink = as_sink(output_dir)
+        self.ai_export = ai_export or AiExportOptions()
+        self._writers = {}
+        self._stack = ExitStack()
+
+    def write(self, df, assignments):
+        # assignments: MacrothemeAssignments do mesmo bloco de linhas
+        for macro, tags in self.macrotheme_definitions.items():
+            subset = self.ai_export.lines(df, assignments.rows(macro))
+            if not len(subset):
+                continue
+            if macro not in self._writers:
+                name = macrotheme_txt_name(macro, tags, self.base_name)
+                self._writers[macro] = self._stack.enter_context(AiTxtWriter(self.sink, name, self.ai_export))
+            self._writers[macro].write(subset)
+
+    @property
+    def output_files(self):
+        return [path for macro in self.macrotheme_definitions if macro in self._writers
+                for path in self._writers[macro].output_files]
+
+    def close(self):
+        self._stack.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def export_macrotheme_txts(df, assignments, macrotheme_definitions, base_name, output_dir, ai_export=None):
     """
     Gera arquivos .txt de macrotemas:
       • Usa as linhas de 'Análise' de cada macrotema.
       • Nomeia como: {base_name}_macrotema-{n}_{tags ou sem_tags}.txt
+        (com orçamento em ai_export: {...}_parte-001.txt, {...}_parte-002.txt, ...)
     """
-    output_files = []
-    # assignments: DataFrame com coluna 'Macrotema' (número do tema)
-    for macro, tags in macrotheme_definitions.items():
-        # 1) Filtra as linhas atribuídas a este macrotema
-        subset = df[assignments['Macrotema'] == macro]
-        if subset.empty:
-            continue
-
-        # 2) Prepara sufixo de tags (underscore, minúsculas) ou 'sem_tags'
-        name_part = "_".join(
-            tag.lower().replace(" ", "_") for tag in tags
-        ) or "sem_tags"
-
-        # 3) Monta o caminho final
-        file_path = output_dir / f"{base_name}_macrotema-{macro}_{name_part}.txt"
-
-        # 4) Escreve cada linha de Análise no arquivo
-        with open(file_path, "w", encoding="utf-8") as f:
-            for line in subset["Análise"]:
-                f.write(line + "\n")
-
-        output_files.append(file_path)
-
-    return output_files
-
-
-def create_pivot_summary(df, assignments, macrotheme_definitions):
-    df['Macrotema'] = assignments['Macrotema']
-
-    # Total number of posts in the database
-    total_posts = df.shape[0]
-
-    # Get names for macrothemes
-    macrotheme_names = get_macrotheme_names(macrotheme_definitions)
-
-    # Map numbers to names
-    df['Macrotema Nome'] = df['Macrotema'].map(macrotheme_names)
-    df['Macrotema Nome'] = df['Macrotema Nome'].fillna('Sem Macrotema')
-
-    # Create pivot
-    summary = df.groupby(['Ano', 'Mês', 'Dia', 'Macrotema Nome']).agg(
-        Total_Publicações=('ID', 'count'),
-        Total_Engajamento=('Manifestações reais', 'sum')
-    ).reset_index()
-
-    # Sort
-    summary = summary.sort_values(['Mês', 'Dia'])
-
-    return summary, total_posts
-
-def create_microtheme_percentage(df, assignments):
-    df['Macrotema'] = assignments['Macrotema']
-    themes_cols = [col for col in df.columns if col not in df.columns[:df.columns.get_loc('Serviço')+1]]
-
-    numeric_df = df[themes_cols].apply(pd.to_numeric, errors='coerce')
-
-    percentages = numeric_df.groupby(df['Macrotema']).mean() * 100
-    percentages = percentages.round(2)
-    return percentages
-
-def create_relative_frequency_summary(df, assignments, macrotheme_definitions, total_posts):
-    df['Macrotema'] = assignments['Macrotema']
-
-    macrotheme_names = get_macrotheme_names(macrotheme_definitions)
-
-    df['Macrotema Nome'] = df['Macrotema'].map(macrotheme_names)
-    df['Macrotema Nome'] = df['Macrotema Nome'].fillna('Sem Macrotema')
-
-    # Macrotheme Relative Frequency
-    macro_counts = df['Macrotema Nome'].value_counts(normalize=True) * 100
-    macro_freq = macro_counts.round(2).reset_index()
-    macro_freq.columns = ['Macrotema', 'Frequência Relativa (%)']
-
-    # Microtheme Relative Frequency
-    themes_cols = df.columns[df.columns.get_loc('Serviço') + 1:]
-    valid_theme_cols = [col for col in themes_cols if set(df[col].dropna().unique()).issubset({0, 1})]
-    numeric_df = df[valid_theme_cols].apply(pd.to_numeric, errors='coerce')
-    microtheme_freq = numeric_df.sum() / total_posts
-    microtheme_freq = microtheme_freq.round(4).reset_index()
-    microtheme_freq.columns = ['Microtema', 'Frequência Relativa']
-
-    return macro_freq, microtheme_freq
-
-def full_pipeline(raw_filepath, macrotheme_definitions, cleaned_output_filename):
-    raw_path = Path(raw_filepath)
-    cleaned_path = raw_path.parent / cleaned_output_filename
-
-    df_main = load_and_clean_sheet(raw_path, sheet_name="Ocorrências", is_main=True)
-
+    with MacrothemeTxtWriter(macrotheme_definitions, base_name, output_dir, ai_export) as writer:
+        writer.write(df, assignments)
+    return writer.output_files
+
+
+def export_biweekly_excel(df, assignments, macrotheme_definitions, sink, cleaned_name, tag_columns=(),
+                          analysis_column=True):
+    # Export final Excel with pivots (todas as tabelas saem de um único agregado)
+    summaries = BiweeklySummaries(df, assignments, macrotheme_definitions, tag_columns)
+    with sink.open(cleaned_name) as f, ExcelSheetsWriter(f) as writer:
+        writer.write_sheet('Cleaned Data', df, columns=excel_columns(df, analysis_column))
+        writer.write_sheet('pvt_summary', summaries.pivot_summary())
+        writer.write_sheet('macro_freq', summaries.macro_freq())
+        writer.write_sheet('microtheme_freq', summaries.microtheme_freq())
+
+def full_pipeline(raw_filepath, macrotheme_definitions, cleaned_output_filename, sheets=None, chunksize=None,
+                  sink=None, max_workers=EXPORT_MAX_WORKERS, multilabel=False, hooks=None, partitions=None,
+                  analysis_column=True, ai_export=None, dedup=None):
+    """
+    Relatório quinzenal: Excel com pivots, .txt por macrotema e corpus IRAMUTEQ.
+    Os artefatos vão para o sink (por padrão, a pasta do arquivo de entrada); cada um é gerado uma vez.
+    As três exportações são independentes e rodam em paralelo (até max_workers threads).
+    multilabel=True (análise multitemática): cada publicação entra nos .txt e nas frequências de
+    todos os macrotemas cujas tags tem, em vez de só no último macrotema que casou.
+    Etapas load → tags → clean → grupos → enrich → analysis → macrotemas → export, medidas pelos
+    hooks (ver pipeline.PipelineRun); cada escrita paralela também aparece como export_<artefato>.
+    partitions (PartitionStore ou pasta): modo incremental, ver full_pipeline_incremental.
+    analysis_column=False deixa a coluna 'Análise' fora da aba Cleaned Data (o texto continua nos .txt).
+    ai_export (analysis.AiExportOptions): .txt de macrotema em partes e/ou só as linhas mais engajadas.
+    dedup ("exact" ou "near"): etapa "duplicates" após a limpeza, ver dedup.drop_duplicate_posts.
+    """
+    if partitions is not None:
+        if chunksize:
+            raise ValueError("O modo incremental lê o upload inteiro: não use partitions com chunksize.")
+        return full_pipeline_incremental(raw_filepath, macrotheme_definitions, cleaned_output_filename,
+                                         partitions, sheets=sheets, sink=sink, max_workers=max_workers,
+                                         multilabel=multilabel, hooks=hooks, analysis_column=analysis_column,
+                                         ai_export=ai_export, dedup=dedup)
+    if chunksize:
+        if dedup:
+            raise ValueError("A remoção de duplicadas precisa de todas as linhas: não use com chunksize.")
+        return full_pipeline_streaming(raw_filepath, macrotheme_definitions, cleaned_output_filename,
+                                       chunksize=chunksize, sink=sink, multilabel=multilabel, hooks=hooks,
+                                       analysis_column=analysis_column, ai_export=ai_export)
+
+    sink = default_sink(raw_filepath, sink)
+    stages = with_stage(BIWEEKLY_STAGES, DUPLICATES_STAGE, "clean") if dedup else BIWEEKLY_STAGES
+    run = PipelineRun("quinzenal", hooks=hooks, stages=stages)
+
+    # Uma única leitura do workbook para as duas abas (ou reaproveita as já lidas, ex.: UploadCache)
+    if sheets is None:
+        sheets = run.stage("load", load_sheets, raw_filepath, sheet_names=(MAIN_SHEET, TAGS_SHEET),
+                           schemas=READ_SCHEMAS)
+    df_main = insert_id_column(sheets[MAIN_SHEET])
+
+    # As colunas de tag ficam registradas aqui, na leitura, para as tabelas resumo
+    tag_columns = []
     try:
-        df_tags = load_and_clean_sheet(raw_path, sheet_name="Tags", is_main=False)
-        tag_fallback = pd.DataFrame(0, index=range(len(df_main)), columns=df_tags.columns)
-        df_tags = df_tags.applymap(lambda x: 1 if str(x).strip().upper() == "SIM" else 0)
-        rows_to_fill = min(len(df_tags), len(tag_fallback))
-        tag_fallback.iloc[:rows_to_fill] = df_tags.iloc[:rows_to_fill]
-        df_combined = pd.concat([df_main, tag_fallback], axis=1)
+        df_combined = run.stage("tags", merge_tags, df_main, sheets[TAGS_SHEET])
+        tag_columns = sheets[TAGS_SHEET].columns.tolist()
     except Exception:
         traceback.print_exc()
         df_combined = df_main.copy()
 
-    df = clean_columns_and_values(df_combined)
-    df = process_grupos_column(df)
-    df = enrich_parlamentar_and_date(df)
-    df = add_analysis_column(df)
-
-    assignments = assign_macrothemes(df, macrotheme_definitions)
-
-    # Export final Excel with pivots
-    with pd.ExcelWriter(cleaned_path, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name='Cleaned Data')
-        pivot_summary, total_posts = create_pivot_summary(df, assignments, macrotheme_definitions)
-        pivot_summary.to_excel(writer, index=False, sheet_name='pvt_summary')
-        macro_freq, microtheme_freq = create_relative_frequency_summary(
-            df, assignments, macrotheme_definitions, total_posts
-        )
-        macro_freq.to_excel(writer, index=False, sheet_name='macro_freq')
-        microtheme_freq.to_excel(writer, index=False, sheet_name='microtheme_freq')
-
-    # --- Novo código para definir o prefixo base sem "_cleaned" ---
-    stem = cleaned_path.stem
-    if stem.endswith("_cleaned"):
-        clean_base = stem[:-len("_cleaned")]
-    else:
-        clean_base = stem
-
-    # Prefixo para arquivos de macrotema com sufixo "_ai"
-    ai_macro_base = f"{clean_base}_ai"
-    # --- Fim do novo código ---
-
-    # Export macrotheme .txt usando o novo base_name (inclui "_ai")
-    output_txts = export_macrotheme_txts(
-        df,
-        assignments,
-        macrotheme_definitions,
-        base_name=ai_macro_base,           # <— aqui usamos {base}_ai
-        output_dir=cleaned_path.parent
-    )
-
-    # Export Iramuteq .txt com sufixo "_corpus.txt"
-    iramuteq_txt_path = cleaned_path.parent / f"{clean_base}_corpus.txt"
-    export_iramuteq(df, iramuteq_txt_path)
-
-    return cleaned_path, output_txts, iramuteq_txt_path
\ No newline at end of file
+    df = run.stage("clean", clean_columns_and_values, df_combined)
+    if dedup:
+        df = _drop_duplicates(run, df, dedup)
+    df = run.stage("grupos", process_grupos_column, df)
+    df = run.stage("enrich", enrich_parlamentar_and_date, df)
+    df = run.stage("analysis", add_analysis_column, df)
+
+    return _export_report(run, df, tag_columns, macrotheme_definitions, sink, cleaned_output_filename,
+                          max_workers=max_workers, multilabel=multilabel, analysis_column=analysis_column,
+                          ai_export=ai_export)
+
+def _drop_duplicates(run, df, mode):
+    rows = len(df)
+    df = run.stage(DUPLICATES_STAGE, drop_duplicate_posts, df, mode=mode)
+    run.log(f"🧹 {rows - len(df)} publicações duplicadas removidas ({len(df)} mantidas).")
+    return df
+
+def _export_report(run, df, tag_columns, macrotheme_definitions, sink, cleaned_output_filename,
+                   max_workers=EXPORT_MAX_WORKERS, multilabel=False, analysis_column=True, ai_export=None):
+    """Etapas macrotemas → export (Excel, .txt por macrotema e corpus em paralelo) e fim da execução."""
+    assignments = run.stage("macrotemas", assign_macrothemes, df, macrotheme_definitions, multilabel=multilabel)
+    clean_base = output_base_name(cleaned_output_filename)
+    corpus_name = f"{clean_base}_corpus.txt"
+
+    def write_iramuteq(df):
+        # Export Iramuteq .txt com sufixo "_corpus.txt"
+        with open_text(sink, corpus_name) as f:
+            write_corpus(df, f, label_column="Nome publicador", remove_chars=BIWEEKLY_REMOVE_CHARS)
+
+    results = run.stage("export", run_parallel, {
+        "excel": lambda: run.stage(
+            "export_excel", export_biweekly_excel,
+            df, assignments, macrotheme_definitions, sink, cleaned_output_filename, tag_columns, analysis_column
+        ),
+        # Export macrotheme .txt usando o base_name {base}_ai
+        "macrotemas": lambda: run.stage(
+            "export_macrotemas", export_macrotheme_txts,
+            df, assignments, macrotheme_definitions, base_name=f"{clean_base}_ai", output_dir=sink,
+            ai_export=ai_export
+        ),
+        "corpus": lambda: run.stage("export_corpus", write_iramuteq, df),
+    }, max_workers=max_workers)
+
+    run.finish(rows=len(df), columns=df.shape[1], macrotemas=len(macrotheme_definitions), multilabel=multilabel)
+    return sink.location(cleaned_output_filename), results["macrotemas"], sink.location(corpus_name)
+
+def full_pipeline_incremental(raw_filepath, macrotheme_definitions, cleaned_output_filename, partitions,
+                              sheets=None, sink=None, max_workers=EXPORT_MAX_WORKERS, multilabel=False,
+                              hooks=None, analysis_column=True, ai_export=None, dedup=None):
+    """
+    Modo incremental do relatório quinzenal sobre um PartitionStore (ou a pasta dele): só as linhas
+    do upload com chave nova (link da ocorrência) passam por limpeza, Grupos e datas e são gravadas
+    nas partições diárias; o relatório é montado das partições dos dias que o upload cobre,
+    inclusive linhas de uploads anteriores desses dias. ID e Análise são refeitos na montagem.
+    A chave (link) só evita regravar a mesma ocorrência; dedup ("exact"/"near") remove cópias de
+    texto no relatório montado, sem alterar as partições.
+    """
+    sink = default_sink(raw_filepath, sink)
+    store = partitions if isinstance(partitions, PartitionStore) else PartitionStore(partitions)
+    stages = with_stage(BIWEEKLY_INCREMENTAL_STAGES, DUPLICATES_STAGE, "assemble") if dedup else \
+        BIWEEKLY_INCREMENTAL_STAGES
+    run = PipelineRun("quinzenal", hooks=hooks, stages=stages)
+
+    if sheets is None:
+        sheets = run.stage("load", load_sheets, raw_filepath, sheet_names=(MAIN_SHEET, TAGS_SHEET),
+                           schemas=READ_SCHEMAS)
+    df_main = sheets[MAIN_SHEET].reset_index(drop=True)
+
+    tag_columns = []
+    try:
+        df = run.stage("tags", merge_tags, df_main, sheets[TAGS_SHEET])
+        tag_columns = sheets[TAGS_SHEET].columns.tolist()
+    except Exception:
+        traceback.print_exc()
+        df = df_main.copy()
+    df[KEY_COLUMN] = row_keys(df_main)
+
+    # Colunas vazias só são descartadas na montagem (ver partitions.finalize_columns)
+    df_new = run.stage("unseen", store.unseen, df)
+    if not df_new.empty:
+        df_new = run.stage("clean", clean_columns_and_values, df_new, drop_empty=False)
+        df_new = run.stage("grupos", process_grupos_column, df_new, drop_empty=False)
+        df_new = run.stage("enrich", enrich_parlamentar_and_date, df_new)
+    run.stage("store", store.append, df_new, tag_columns)
+
+    df = run.stage("assemble", store.assemble, df[KEY_COLUMN])
+    if dedup:
+        df = _drop_duplicates(run, df, dedup)
+    df = insert_id_column(df.drop(columns=[KEY_COLUMN]))
+    df = run.stage("analysis", add_analysis_column, df)
+    run.extra.update(new_rows=len(df_new), upload_rows=len(df_main))
+    return _export_report(run, df, tag_columns or store.tag_columns(), macrotheme_definitions, sink,
+                          cleaned_output_filename, max_workers=max_workers, multilabel=multilabel,
+                          analysis_column=analysis_column, ai_export=ai_export)
+
+def full_pipeline_streaming(raw_filepath, macrotheme_definitions, cleaned_output_filename,
+                            chunksize=STREAM_CHUNK_ROWS, sink=None, multilabel=False, hooks=None,
+                            analysis_column=True, ai_export=None):
+    """
+    Modo streaming do relatório quinzenal: lê as abas em blocos e grava os .txt de macrotema
+    e o corpus incrementalmente. As linhas só são reunidas para o Excel e as tabelas resumo
+    (e para os .txt de macrotema quando ai_export tem top_k).
+    As métricas de cada etapa somam todos os blocos.
+    """
+    sink = default_sink(raw_filepath, sink)
+    run = PipelineRun("quinzenal", hooks=hooks, stages=BIWEEKLY_STAGES)
+    clean_base = output_base_name(cleaned_output_filename)
+    corpus_name = f"{clean_base}_corpus.txt"
+
+    ai_export = ai_export or AiExportOptions()
+
+    def write_chunk(df, assignments):
+        if not ai_export.ranked:
+            txt_writer.write(df, assignments)
+        corpus_file.write(build_corpus_text(
+            df, label_column="Nome publicador", remove_chars=BIWEEKLY_REMOVE_CHARS
+        ))
+        return df
+
+    chunks = []
+    tag_columns = []
+    tracker = EmptyColumnTracker()
+    next_id = 1
+    with MacrothemeTxtWriter(macrotheme_definitions, f"{clean_base}_ai", sink, ai_export) as txt_writer, \
+            open_text(sink, corpus_name) as corpus_file:
+        blocks = iter_workbook_chunks(raw_filepath, chunksize, sheet_names=(MAIN_SHEET, TAGS_SHEET),
+                                      schemas=READ_SCHEMAS)
+        for sheets in run.iterate("load", blocks):
+            df = insert_id_column(sheets[MAIN_SHEET], start=next_id)
+            next_id += len(df)
+            if TAGS_SHEET in sheets:
+                df = run.stage("tags", merge_tags, df, sheets[TAGS_SHEET])
+                tag_columns = sheets[TAGS_SHEET].columns.tolist()
+
+            df = run.stage("clean", clean_columns_and_values, df, drop_empty=False)
+            tracker.update(df)
+            df = run.stage("grupos", process_grupos_column, df, drop_empty=False)
+            df = run.stage("enrich", enrich_parlamentar_and_date, df)
+            df = run.stage("analysis", add_analysis_column, df)
+
+            assignments = run.stage("macrotemas", assign_macrothemes, df, macrotheme_definitions,
+                                    multilabel=multilabel)
+            chunks.append(run.stage("export", write_chunk, df, assignments))
+
+    df = tracker.finalize(pd.concat(chunks, ignore_index=True)) if chunks else pd.DataFrame()
+    assignments = run.stage("macrotemas", assign_macrothemes, df, macrotheme_definitions, multilabel=multilabel)
+    run.stage("export", export_biweekly_excel,
+              df, assignments, macrotheme_definitions, sink, cleaned_output_filename, tag_columns, analysis_column)
+    macrotheme_files = txt_writer.output_files
+    if ai_export.ranked and len(df):
+        # Top-K de cada macrotema: só com todas as linhas reunidas
+        macrotheme_files = run.stage("export", export_macrotheme_txts, df, assignments, macrotheme_definitions,
+                                     base_name=f"{clean_base}_ai", output_dir=sink, ai_export=ai_export)
+
+    run.finish(rows=len(df), columns=df.shape[1], macrotemas=len(macrotheme_definitions), multilabel=multilabel,
+               chunksize=chunksize)
+    return sink.location(cleaned_output_filename), macrotheme_files, sink.location(corpus_name)
@@ -0,0 +1,219 @@
+"""
+Processamento em lote, sem a interface: roda um tipo de relatório sobre todos os arquivos
+indicados (arquivos, pastas ou padrões glob), em paralelo num pool de processos, e imprime
+um resumo com tempos e falhas.
+
+    python cli.py publicacoes exports/ --output-dir saida/
+    python cli.py noticias "exports/2025-*.xlsx" --workers 4
+    python cli.py quinzenal exports/ --macros macrotemas.yaml [--multilabel] [--summary resumo.json]
+    python cli.py quinzenal exports/ --macros macrotemas.json --store particoes/   # incremental
+    python cli.py publicacoes exports/ --ai-max-tokens 100000 --ai-top-k 500       # .txt de IA em partes
+    python cli.py publicacoes exports/ --dedup near                                # sem reposts/cópias
+
+Cada arquivo ganha a própria pasta de saída (<output-dir>/<nome do arquivo>/); sem --output-dir,
+os artefatos ficam ao lado do arquivo de entrada. O código de saída é 1 se algum arquivo falhar.
+Com --store (quinzenal), as linhas são acumuladas em partições diárias (ver partitions.py) e os
+arquivos são processados em série, na ordem dada, para que cada um deduplique contra os anteriores.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from analysis import AiExportOptions
+from dedup import DEDUP_MODES
+from macrothemes import load_macrotheme_definitions
+from pipeline import JsonRunLog, run_log_path
+
+# === Constants ===
+REPORTS = ("publicacoes", "noticias", "quinzenal")
+INPUT_SUFFIX = ".xlsx"
+# Não reprocessar as próprias saídas nem os arquivos temporários do Excel
+SKIP_SUFFIX = "_cleaned.xlsx"
+SKIP_PREFIX = "~$"
+
+
+def collect_inputs(patterns):
+    """Expande arquivos, pastas (os .xlsx de dentro, sem recursão) e padrões glob, sem repetir."""
+    found = []
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            candidates = sorted(path.glob(f"*{INPUT_SUFFIX}"))
+        elif path.is_file():
+            candidates = [path]
+        else:
+            candidates = sorted(Path(match) for match in glob.glob(pattern, recursive=True))
+        found += [
+            candidate for candidate in candidates
+            if candidate.suffix.lower() == INPUT_SUFFIX
+            and not candidate.name.startswith(SKIP_PREFIX) and not candidate.name.endswith(SKIP_SUFFIX)
+        ]
+    return list(dict.fromkeys(path.resolve() for path in found))
+
+
+def output_dirs(inputs, output_dir):
+    """Pasta de saída de cada arquivo; nomes repetidos em pastas diferentes ganham sufixo."""
+    if output_dir is None:
+        return {path: path.parent for path in inputs}
+    dirs, used = {}, set()
+    for path in inputs:
+        name, n = path.stem, 1
+        while name in used:
+            n += 1
+            name = f"{path.stem}_{n}"
+        used.add(name)
+        dirs[path] = Path(output_dir) / name
+    return dirs
+
+
+class _CollectStages:
+    def __init__(self):
+        self.stages = []
+
+    def run_finished(self, run):
+        self.stages = run.to_dict()["stages"]
+
+
+def process_file(report, path, out_dir, macrotheme_definitions=None, multilabel=False, chunksize=None,
+                 store=None, analysis_column=True, ai_export=None, dedup=None):
+    """Roda um relatório sobre um arquivo (no processo do worker) e devolve o resumo da execução."""
+    # Import tardio: cada processo do pool carrega o pandas só uma vez, ao receber o primeiro arquivo
+    from biweekly import full_pipeline
+    from daily_posts import process_and_export_excel as process_publicacoes
+    from news import process_and_export_excel as process_noticias
+
+    collector = _CollectStages()
+    log_path = run_log_path()
+    hooks = [collector] + ([JsonRunLog(log_path)] if log_path else [])
+    output_filename = f"{Path(path).stem}_cleaned.xlsx"
+    start = time.perf_counter()
+    try:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        if report == "publicacoes":
+            process_publicacoes(path, output_filename, chunksize=chunksize, sink=out_dir, hooks=hooks,
+                                analysis_column=analysis_column, ai_export=ai_export, dedup=dedup)
+        elif report == "noticias":
+            process_noticias(path, output_filename, chunksize=chunksize, sink=out_dir, hooks=hooks,
+                             analysis_column=analysis_column, ai_export=ai_export, dedup=dedup)
+        else:
+            full_pipeline(path, macrotheme_definitions, output_filename, chunksize=chunksize, sink=out_dir,
+                          multilabel=multilabel, hooks=hooks, partitions=store, analysis_column=analysis_column,
+                          ai_export=ai_export, dedup=dedup)
+        status, error = "ok", None
+    except Exception:
+        status, error = "falhou", traceback.format_exc()
+    return {
+        "file": str(path), "output_dir": str(out_dir), "status": status,
+        "seconds": round(time.perf_counter() - start, 3), "stages": collector.stages, "error": error,
+    }
+
+
+def run_batch(report, inputs, output_dir=None, macrotheme_definitions=None, multilabel=False, chunksize=None,
+              workers=None, store=None, analysis_column=True, ai_export=None, dedup=None):
+    """
+    Processa os arquivos num pool de processos (ou em série com workers=1 ou com store) e devolve
+    os resumos.
+    """
+    dirs = output_dirs(inputs, output_dir)
+    args = [(report, path, dirs[path], macrotheme_definitions, multilabel, chunksize, store, analysis_column,
+             ai_export, dedup) for path in inputs]
+    workers = 1 if store is not None else min(workers or os.cpu_count() or 1, len(args)) if args else 1
+
+    if workers <= 1:
+        results = []
+        for item in args:
+            results.append(process_file(*item))
+            _print_result(results[-1])
+        return results
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(process_file, *item) for item in args]
+        for future in as_completed(futures):
+            results.append(future.result())
+            _print_result(results[-1])
+    order = {str(path): pos for pos, path in enumerate(inputs)}
+    return sorted(results, key=lambda result: order[result["file"]])
+
+
+def _print_result(result):
+    mark = "✅" if result["status"] == "ok" else "❌"
+    print(f"{mark} {Path(result['file']).name}: {result['seconds']:.2f}s → {result['output_dir']}", flush=True)
+
+
+def print_summary(results, wall_seconds):
+    failed = [result for result in results if result["status"] != "ok"]
+    print(f"\n📊 {len(results)} arquivo(s) em {wall_seconds:.2f}s | {len(results) - len(failed)} ok | "
+          f"{len(failed)} com falha")
+    for result in failed:
+        print(f"\n❌ {result['file']}\n{result['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("report", choices=REPORTS)
+    parser.add_argument("inputs", nargs="+", help="arquivos .xlsx, pastas ou padrões glob")
+    parser.add_argument("--output-dir", type=Path, default=None)
+    parser.add_argument("--macros", type=Path, default=None,
+                        help="definições de macrotemas em JSON ou YAML (obrigatório para o quinzenal)")
+    parser.add_argument("--multilabel", action="store_true", help="análise multitemática (quinzenal)")
+    parser.add_argument("--chunksize", type=int, default=None, help="modo streaming, em blocos de N linhas")
+    parser.add_argument("--workers", type=int, default=None, help="processos em paralelo (padrão: núcleos)")
+    parser.add_argument("--summary", type=Path, default=None, help="grava o resumo em JSON")
+    parser.add_argument("--no-analysis-column", dest="analysis_column", action="store_false",
+                        help="Excel sem a coluna Análise (o texto continua nos .txt)")
+    parser.add_argument("--ai-max-chars", type=int, default=None,
+                        help="divide os .txt de IA em partes de até N caracteres, sem cortar linhas")
+    parser.add_argument("--ai-max-tokens", type=int, default=None,
+                        help="divide os .txt de IA em partes de até ~N tokens (~4 caracteres por token)")
+    parser.add_argument("--ai-top-k", type=int, default=None,
+                        help="só as N linhas com mais 'Manifestações reais' em cada .txt de IA")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default=None,
+                        help="remove publicações duplicadas (exact) ou também quase duplicadas (near)")
+    parser.add_argument("--store", type=Path, default=None,
+                        help="pasta das partições diárias do modo incremental (quinzenal; requer pyarrow)")
+    args = parser.parse_args(argv)
+
+    if args.report == "quinzenal" and args.macros is None:
+        parser.error("o relatório quinzenal requer --macros")
+    if args.store is not None and args.report != "quinzenal":
+        parser.error("--store só se aplica ao relatório quinzenal")
+    if args.store is not None and args.chunksize:
+        parser.error("--store lê cada arquivo inteiro e não combina com --chunksize")
+    if args.dedup and args.chunksize:
+        parser.error("--dedup precisa de todas as linhas e não combina com --chunksize")
+    definitions = load_macrotheme_definitions(args.macros) if args.macros else None
+    try:
+        ai_export = AiExportOptions(max_chars=args.ai_max_chars, max_tokens=args.ai_max_tokens,
+                                    top_k=args.ai_top_k)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        parser.error("nenhum arquivo .xlsx encontrado")
+
+    start = time.perf_counter()
+    results = run_batch(args.report, inputs, output_dir=args.output_dir, macrotheme_definitions=definitions,
+                        multilabel=args.multilabel, chunksize=args.chunksize, workers=args.workers,
+                        store=args.store, analysis_column=args.analysis_column, ai_export=ai_export,
+                        dedup=args.dedup)
+    wall_seconds = time.perf_counter() - start
+    print_summary(results, wall_seconds)
+
+    if args.summary:
+        args.summary.parent.mkdir(parents=True, exist_ok=True)
+        args.summary.write_text(json.dumps({
+            "report": args.report, "seconds": round(wall_seconds, 3), "files": results,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+    return 1 if any(result["status"] != "ok" for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
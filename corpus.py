@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+import pandas as pd
+
+from textnorm import TextNormalizer
+
+# === Constants ===
+# Caracteres que o IRAMUTEQ interpreta como marcação; removidos da Descrição
+CORPUS_REMOVE_CHARS = '|:*"?<>$-\'%'
+# O relatório quinzenal mantém o "?" no texto
+BIWEEKLY_REMOVE_CHARS = CORPUS_REMOVE_CHARS.replace("?", "")
+
+CORPUS_CHUNK_ROWS = 50_000
+
+
+def _as_text(df, column):
+    if column in df.columns:
+        return df[column].astype(str)
+    return pd.Series("", index=df.index)
+
+
+@lru_cache(maxsize=None)
+def corpus_normalizer(remove_chars=CORPUS_REMOVE_CHARS):
+    """
+    Limpeza da Descrição para o IRAMUTEQ (compilada uma vez por conjunto de caracteres): apaga
+    remove_chars e emojis, troca links e quebras de linha por espaço (uma quebra faria o resto
+    do texto sair da linha do '**** *id_...').
+    """
+    return TextNormalizer(remove_chars=remove_chars, urls=True, emojis=True, line_breaks=True)
+
+
+def build_corpus_text(df, label_column="Nome publicador", remove_chars=CORPUS_REMOVE_CHARS):
+    """Monta, coluna a coluna, o trecho do corpus: '**** *id_{ID} *u_{rótulo}' + Descrição limpa."""
+    descricao = corpus_normalizer(remove_chars).normalize(_as_text(df, "Descrição"))
+    blocks = "**** *id_" + _as_text(df, "ID") + " *u_" + _as_text(df, label_column) + "\n" + descricao + "\n"
+    return "".join(blocks)
+
+
+def write_corpus(df, f, label_column="Nome publicador", remove_chars=CORPUS_REMOVE_CHARS,
+                 chunksize=CORPUS_CHUNK_ROWS):
+    """
+    Grava o corpus para IRAMUTEQ num stream de texto, em blocos de linhas, para a memória não
+    crescer com o arquivo. label_column define a variável *u_: 'Nome publicador'
+    (publicações/quinzenal) ou 'Título' (notícias).
+    """
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        f.write(build_corpus_text(chunk, label_column=label_column, remove_chars=remove_chars))
+
+
+def export_corpus(df, output_path, label_column="Nome publicador", remove_chars=CORPUS_REMOVE_CHARS,
+                  chunksize=CORPUS_CHUNK_ROWS):
+    with open(output_path, "w", encoding="utf-8") as f:
+        write_corpus(df, f, label_column=label_column, remove_chars=remove_chars, chunksize=chunksize)
+    return output_path
@@ -1,212 +1,176 @@
 import pandas as pd
 from datetime import datetime
 import traceback
-import re
-from pathlib import Path
-
-# === Constants ===
-UNNECESSARY_COLUMNS = [
-    "Descrição monitoramento", "Link serviço", "Descrição Pai", "Link ocorrência Pai", "Thumbnail",
-    "Thumbnail pai", "Data coleta", "Linguagem", "Foto publicador", "PageRank", "Estrelas",
-    "Qualificação", "Qualificada por", "Data da qualificação", "Qualificação automática", "Para",
-    "Latitude", "Longitude", "Id ocorrência no serviço", "Id ocorrência pai no serviço",
-    "Link id ocorrência pai", "Arquivada", "Desarquivada", "Data Resposta",
-    "Manifestações Detalhadas", "Termos", "Links", "Perfis", "Hashtags",
-    "comments", "shares", "likes", "dislikes", "love", "wow", "haha", "sad", "angry",
-    "thankful", "pride", "retweets", "favorites", "rating", "vendas", "resenhas", "votes", "views", "quotes",
-    "videoViews", "URL da busca", "Id publicador", "Qualificação aprovada por", "Analisada por",
-    "Data analisada", "Avaliação", "Tipo/Conteúdo", "Observação", "Unnamed: 73"
-]
-
-ENGAGEMENT_COLS = [
-    "comments", "shares", "likes", "dislikes", "love", "wow", "haha", "sad", "angry",
-    "thankful", "pride", "retweets", "favorites", "rating", "vendas",
-    "resenhas", "votes", "views", "quotes"
-]
-
-LIST_CASA = ["CÂMARA", "SENADO"]
-LIST_PARTIDO = ["MDB", "PT", "PRD", "PP", "PSDB", "PDT", "UNIÃO", "PL", "PODEMOS", "PSB", "REPUBLICANOS",
-                 "PV", "AVANTE", "PSC", "PSOL", "PCDOB", "PSD", "SOLIDARIEDADE", "NOVO", "REDE", "PMB",
-                 "UP", "DC", "PCO", "PSTU", "PCB", "PRTB", "MOBILIZA", "AGIR", "CIDADANIA", "PROS", "PATRIOTA"]
-LIST_ESTADO = ["AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA", "PB",
-                "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"]
-
-SPECIFIC_OVERRIDES = {
-    "Nilto Tatto": {"Partido": "PT", "Estado": "SP"},
-    "Socorro Neri": {"Partido": "PP", "Estado": "AC"},
-    "AJ Albuquerque": {"Partido": "PP", "Estado": "CE"},
-    "Duarte Junior": {"Partido": "PSB", "Estado": "MA"},
-    "Julio Cesar": {"Partido": "PSD", "Estado": "PI"},
-    "Júlio César": {"Partido": "PSD", "Estado": "PI"},
-    "Vicentinho Júnior": {"Partido": "PP", "Estado": "TO"},
-    "Yury do Paredão": {"Partido": "MDB", "Estado": "CE"}
-}
+
+from analysis import AiExportOptions, AiTxtWriter, excel_columns, write_lines
+from corpus import build_corpus_text, export_corpus, write_corpus
+from dedup import drop_duplicate_posts
+from excel_writer import write_excel
+from pipeline import DUPLICATES_STAGE, POSTS_STAGES, PipelineRun, with_stage
+from sinks import default_sink, open_text
+from stages import (READ_SCHEMAS, add_analysis_column, clean_columns_and_values, enrich_parlamentar_and_date,
+                    output_base_name, process_grupos_column)
+from streaming import STREAM_CHUNK_ROWS, EmptyColumnTracker
+from tags import merge_tags
+from workbook import MAIN_SHEET, TAGS_SHEET, insert_id_column, iter_workbook_chunks, load_sheets
 
 # === Utility Function for IRAMUTEQ ===
 def export_for_iramuteq(df, txt_filename):
-    def clean_description(text):
-        return re.sub(r'[\|:\*"\?<>\|\$\-\'%]', '', str(text))
-
-    lines = []
-    for _, row in df.iterrows():
-        id_val = row.get("ID", "")
-        nome = row.get("Nome publicador", "")
-        descricao = clean_description(row.get("Descrição", ""))
-        lines.append(f"**** *id_{id_val} *u_{nome}\n{descricao}\n")
-
-    with open(txt_filename, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    export_corpus(df, txt_filename, label_column="Nome publicador")
 
     print(f"🧾 Arquivo IRAMUTEQ salvo como: {txt_filename}")
 
 # === Core functions ===
-def load_and_clean_sheet(filepath, sheet_name, is_main=True):
-    df = pd.read_excel(filepath, sheet_name=sheet_name, skiprows=4)
-    df.columns = df.columns.str.replace('"', '').str.strip()
-    if is_main:
-        df.insert(0, 'ID', range(1, len(df) + 1))
-    return df
-
-def clean_columns_and_values(df):
-    # Sum "Manifestações reais" before dropping engagement columns
-    engagement_present = [col for col in ENGAGEMENT_COLS if col in df.columns]
-    if engagement_present:
-        df["Manifestações reais"] = df[engagement_present].apply(pd.to_numeric, errors='coerce').sum(axis=1)
-        if "Manifestações" in df.columns:
-            idx = df.columns.get_loc("Manifestações") + 1
-            cols = df.columns.tolist()
-            cols.insert(idx, cols.pop(cols.index("Manifestações reais")))
-            df = df[cols]
-
-    df = df.drop(columns=set(UNNECESSARY_COLUMNS).intersection(df.columns), errors="ignore")
-    df = df.replace("-", "NA").dropna(axis=1, how="all")
-
-    for col in ['Perfil/Nome da busca', 'Serviço']:
-        if col in df.columns:
-            df[col] = df[col].str.split(r"[-,]").str[0].str.strip()
-
-    return df
-
-def process_grupos_column(df):
-    if "Grupos" in df.columns:
-        df['Grupos'] = df['Grupos'].str.upper()
-
-        def split_grupos(row):
-            items = row.split(" | ") if isinstance(row, str) else []
-            casa = partido = estado = extras = None
-            items = ["CÂMARA" if i == "CAMARA" else i for i in items]
-            items = ["PODEMOS" if i == "PODE" else i for i in items]
-            for item in items:
-                if item in LIST_CASA and not casa:
-                    casa = item
-                elif item in LIST_PARTIDO and not partido:
-                    partido = item
-                elif item in LIST_ESTADO and not estado:
-                    estado = item
-                else:
-                    extras = extras + " | " + item if extras else item
-            return casa, partido, estado, extras
-
-        df[['Casa', 'Partido', 'Estado', 'Extras']] = df['Grupos'].apply(split_grupos).apply(pd.Series)
-        df = df.drop(columns=['Grupos'])
-
-    if 'Perfil/Nome da busca' in df.columns:
-        for name, overrides in SPECIFIC_OVERRIDES.items():
-            mask = df['Perfil/Nome da busca'].str.contains(name, na=False, case=False)
-            for key, value in overrides.items():
-                df.loc[mask, key] = value
-
-    # Drop columns if all values are null
-    for col in ['Casa', 'Partido', 'Estado']:
-        if col in df.columns and df[col].isnull().all():
-            df = df.drop(columns=[col])
+def _log_ai_files(run, ai_writer):
+    files = ", ".join(str(path) for path in ai_writer.output_files)
+    if len(ai_writer.names) > 1:
+        run.log(f"📝 Arquivo .txt salvo em {len(ai_writer.names)} partes: {files}")
+    else:
+        run.log(f"📝 Arquivo .txt salvo como: {files}")
 
+def add_analysis_column_and_export_txt(df, txt_filename):
+    df = add_analysis_column(df)
+    with open(txt_filename, "w", encoding="utf-8", newline="") as f:
+        write_lines(f, df["Análise"])
+    print(f"📝 Arquivo .txt salvo como: {txt_filename}")
     return df
 
-def enrich_parlamentar_and_date(df):
-    def get_title(casa):
-        return "Deputado(a)" if casa == "CÂMARA" else "Senador(a)" if casa == "SENADO" else ""
-
-    if {'Casa', 'Perfil/Nome da busca', 'Partido', 'Estado'}.issubset(df.columns):
-        df['Parlamentar'] = df.apply(
-            lambda row: f"{get_title(row['Casa'])} {row['Perfil/Nome da busca']} ({row['Partido']}/{row['Estado']})",
-            axis=1
-        )
-
-    if "Data publicação" in df.columns:
-        df["Data publicação - Date"] = df["Data publicação"].str[:8].str.strip()
-        df["Data publicação - Hour"] = df["Data publicação"].str[9:].str.strip()
-        df = df.drop(columns=["Data publicação"])
-
-    if "Data publicação - Date" in df.columns:
-        df["Data publicação - Date"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%y", errors='coerce')
-        df["Data publicação - Date"] = df["Data publicação - Date"].dt.strftime("%d/%m/%Y")
-        df["Dia"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.day
-        df["Mês"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.month
-        df["Ano"] = pd.to_datetime(df["Data publicação - Date"], format="%d/%m/%Y", errors='coerce').dt.year
+def export_outputs(df, sink, output_filename, run, analysis_column=True, ai_export=None):
+    """
+    Etapa "export": {base}_ai.txt, {base}_corpus.txt e o Excel limpo, cada um gravado uma vez.
+    Com analysis_column=False o Excel sai sem a coluna 'Análise' (o texto já está no _ai.txt).
+    ai_export (analysis.AiExportOptions) divide o _ai.txt em partes e/ou mantém as mais engajadas.
+    """
+    base = output_base_name(output_filename)
+    ai_export = ai_export or AiExportOptions()
 
-    if "Data publicação - Hour" in df.columns:
-        df["Hora"] = df["Data publicação - Hour"].str[:2]
+    # 1) Gera arquivo de análise: nome_ai.txt --- (2025-6-27)
+    with AiTxtWriter(sink, f"{base}_ai.txt", ai_export, newline="") as ai_writer:
+        ai_writer.write(ai_export.lines(df))
+    _log_ai_files(run, ai_writer)
 
-    return df
+    # 2) Gera arquivo de corpus para IRAMUTEQ: nome_corpus.txt --- (2025-6-27)
+    corpus_txt = f"{base}_corpus.txt"
+    with open_text(sink, corpus_txt) as f:
+        write_corpus(df, f, label_column="Nome publicador")
+    run.log(f"🧾 Arquivo IRAMUTEQ salvo como: {sink.location(corpus_txt)}")
 
-def add_analysis_column_and_export_txt(df, txt_filename):
-    for col in ['ID', 'Descrição', 'Manifestações', 'Link ocorrência']:
-        if col not in df.columns:
-            df[col] = ""
-
-    df["Análise"] = (
-        "ID: " + df["ID"].astype(str) +
-        " | Texto: " + df["Descrição"].astype(str) +
-        " | Engajamento: " + df["Manifestações"].astype(str) +
-        " | Link: " + df["Link ocorrência"].astype(str)
-    )
-
-    df["Análise"].to_csv(txt_filename, index=False, header=False)
-    print(f"📝 Arquivo .txt salvo como: {txt_filename}")
+    # 3) Salva o Excel limpo --- (2025-6-27)
+    with sink.open(output_filename) as f:
+        write_excel(f, df, columns=excel_columns(df, analysis_column))
+    run.log(f"✅ Banco de dados limpo salvo como: {sink.location(output_filename)}")
     return df
 
-def process_and_export_excel(filepath, output_filename):
-    print(f"📂 Processando arquivo: {filepath}")
-
-    df_main = load_and_clean_sheet(filepath, sheet_name="Ocorrências", is_main=True)
+def process_and_export_excel(filepath, output_filename, chunksize=None, sink=None, hooks=None,
+                             analysis_column=True, ai_export=None, dedup=None):
+    """
+    Gera {base}_cleaned.xlsx, {base}_ai.txt e {base}_corpus.txt, cada um uma única vez, no sink
+    indicado (por padrão, a pasta do arquivo de entrada; ZipSink grava direto num ZIP em memória).
+    Etapas: load → tags → clean → grupos → enrich → analysis → export, medidas pelos hooks
+    (ver pipeline.PipelineRun; por padrão, console + log JSON).
+    analysis_column=False deixa a coluna 'Análise' fora do Excel (o texto continua no _ai.txt);
+    ai_export (analysis.AiExportOptions) grava o _ai.txt em partes e/ou só as linhas mais engajadas.
+    dedup ("exact" ou "near"): etapa "duplicates" após a limpeza, ver dedup.drop_duplicate_posts.
+    """
+    if chunksize:
+        if dedup:
+            raise ValueError("A remoção de duplicadas precisa de todas as linhas: não use com chunksize.")
+        return process_and_export_excel_streaming(filepath, output_filename, chunksize=chunksize, sink=sink,
+                                                  hooks=hooks, analysis_column=analysis_column,
+                                                  ai_export=ai_export)
+
+    sink = default_sink(filepath, sink)
+    stages = with_stage(POSTS_STAGES, DUPLICATES_STAGE, "clean") if dedup else POSTS_STAGES
+    run = PipelineRun("publicacoes", hooks=hooks, stages=stages)
+
+    run.log(f"📂 Processando arquivo: {filepath}")
+
+    # Uma única leitura do workbook para as duas abas
+    sheets = run.stage("load", load_sheets, filepath, sheet_names=(MAIN_SHEET, TAGS_SHEET), schemas=READ_SCHEMAS)
+    df_main = insert_id_column(sheets[MAIN_SHEET])
     df_main = df_main.reset_index(drop=True)
     df_combined = df_main.copy()
 
     try:
-        df_tags = load_and_clean_sheet(filepath, sheet_name="Tags", is_main=False)
-        df_tags = df_tags.reset_index(drop=True)
-        tag_fallback = pd.DataFrame(0, index=range(len(df_main)), columns=df_tags.columns)
-        df_tags = df_tags.applymap(lambda x: 1 if str(x).strip().upper() == "SIM" else 0)
-        rows_to_fill = min(len(df_tags), len(tag_fallback))
-        tag_fallback.iloc[:rows_to_fill] = df_tags.iloc[:rows_to_fill]
-        df_combined = pd.concat([df_main, tag_fallback], axis=1)
-        print("✅ Tags processadas linha a linha com fallback zero.")
+        df_combined = run.stage("tags", merge_tags, df_main, sheets[TAGS_SHEET])
+        run.log("✅ Tags processadas linha a linha com fallback zero.")
     except Exception as e:
-        print("⚠️ Aba 'Tags' não encontrada ou erro ao carregar:", str(e))
+        run.log(f"⚠️ Aba 'Tags' não encontrada ou erro ao carregar: {e}")
         traceback.print_exc()
 
-    df = clean_columns_and_values(df_combined)
-    df = process_grupos_column(df)
-    df = enrich_parlamentar_and_date(df)
-    # --- Novo código para definir o nome base sem "_cleaned" --- (2025-6-27)
-    stem = Path(output_filename).stem
-    if stem.endswith("_cleaned"):
-        base = stem[:-len("_cleaned")]
-    else:
-        base = stem
-    # --- Fim do novo código --- (2025-6-27)
-
-    # 1) Gera arquivo de análise: nome_ai.txt --- (2025-6-27)
-    analysis_txt = f"{base}_ai.txt"
-    df = add_analysis_column_and_export_txt(df, txt_filename=analysis_txt)
+    df = run.stage("clean", clean_columns_and_values, df_combined)
+    if dedup:
+        rows = len(df)
+        df = run.stage(DUPLICATES_STAGE, drop_duplicate_posts, df, mode=dedup)
+        run.log(f"🧹 {rows - len(df)} publicações duplicadas removidas ({len(df)} mantidas).")
+    df = run.stage("grupos", process_grupos_column, df)
+    df = run.stage("enrich", enrich_parlamentar_and_date, df)
+    df = run.stage("analysis", add_analysis_column, df)
+    df = run.stage("export", export_outputs, df, sink, output_filename, run, analysis_column=analysis_column,
+                   ai_export=ai_export)
+    run.finish(rows=len(df), columns=df.shape[1])
+    return df
 
-    # 2) Gera arquivo de corpus para IRAMUTEQ: nome_corpus.txt --- (2025-6-27)
+def process_and_export_excel_streaming(filepath, output_filename, chunksize=STREAM_CHUNK_ROWS, sink=None,
+                                       hooks=None, analysis_column=True, ai_export=None):
+    """
+    Modo streaming para exportações muito grandes: lê 'Ocorrências' e 'Tags' em blocos de linhas,
+    aplica limpeza, Grupos, datas e Análise bloco a bloco e grava _ai.txt e _corpus.txt
+    incrementalmente. Só o Excel limpo (e o _ai.txt com top_k) precisa de todas as linhas juntas.
+    As métricas de cada etapa somam todos os blocos.
+    """
+    run = PipelineRun("publicacoes", hooks=hooks, stages=POSTS_STAGES)
+    run.log(f"📂 Processando arquivo em blocos de {chunksize} linhas: {filepath}")
+    sink = default_sink(filepath, sink)
+
+    base = output_base_name(output_filename)
     corpus_txt = f"{base}_corpus.txt"
-    export_for_iramuteq(df, txt_filename=corpus_txt)
-
-    # 3) Salva o Excel limpo --- (2025-6-27)
-    db = df.copy()
-    db.to_excel(output_filename, index=False)
-    print(f"✅ Banco de dados limpo salvo como: {output_filename}")
-    return db
\ No newline at end of file
+    ai_export = ai_export or AiExportOptions()
+
+    def write_chunk(df):
+        if not ai_export.ranked:
+            ai_writer.write(ai_export.lines(df))
+        corpus_file.write(build_corpus_text(df, label_column="Nome publicador"))
+        return df
+
+    def write_ranked(db):
+        # Com top_k o _ai.txt só é gravado com todas as linhas reunidas
+        ai_writer.write(ai_export.lines(db) if len(db) else [])
+        return db
+
+    chunks = []
+    tracker = EmptyColumnTracker()
+    next_id = 1
+    with AiTxtWriter(sink, f"{base}_ai.txt", ai_export, newline="") as ai_writer, \
+            open_text(sink, corpus_txt) as corpus_file:
+        blocks = iter_workbook_chunks(filepath, chunksize, sheet_names=(MAIN_SHEET, TAGS_SHEET),
+                                      schemas=READ_SCHEMAS)
+        for sheets in run.iterate("load", blocks):
+            df = insert_id_column(sheets[MAIN_SHEET], start=next_id)
+            next_id += len(df)
+            if TAGS_SHEET in sheets:
+                df = run.stage("tags", merge_tags, df, sheets[TAGS_SHEET])
+
+            df = run.stage("clean", clean_columns_and_values, df, drop_empty=False)
+            tracker.update(df)
+            df = run.stage("grupos", process_grupos_column, df, drop_empty=False)
+            df = run.stage("enrich", enrich_parlamentar_and_date, df)
+            df = run.stage("analysis", add_analysis_column, df)
+            chunks.append(run.stage("export", write_chunk, df))
+
+        db = tracker.finalize(pd.concat(chunks, ignore_index=True)) if chunks else pd.DataFrame()
+        if ai_export.ranked:
+            run.stage("export", write_ranked, db)
+
+    _log_ai_files(run, ai_writer)
+    run.log(f"🧾 Arquivo IRAMUTEQ salvo como: {sink.location(corpus_txt)}")
+
+    def write_cleaned(db):
+        with sink.open(output_filename) as f:
+            write_excel(f, db, columns=excel_columns(db, analysis_column))
+        return db
+
+    run.stage("export", write_cleaned, db)
+    run.log(f"✅ Banco de dados limpo salvo como: {sink.location(output_filename)}")
+    run.finish(rows=len(db), columns=db.shape[1], chunksize=chunksize)
+    return db
@@ -0,0 +1,168 @@
+# === Publicações duplicadas e quase duplicadas (etapa opcional "duplicates") ===
+
+import numpy as np
+import pandas as pd
+
+from textnorm import TextNormalizer
+
+# === Constants ===
+TEXT_COLUMN = "Descrição"
+# Quantas linhas do upload o grupo da linha mantida representa (1 = sem cópias)
+CLUSTER_SIZE_COLUMN = "Ocorrências no grupo"
+DEDUP_MODES = ("exact", "near")
+
+# MinHash/LSH: 64 funções de hash em 16 faixas de 4. Pares que coincidem em alguma faixa são
+# candidatos e só se unem com similaridade estimada (fração da assinatura igual) >= threshold
+NUM_PERM = 64
+BANDS = 16
+NEAR_THRESHOLD = 0.7
+SHINGLE_WORDS = 3
+# Textos processados por vez no cálculo das assinaturas (limita a memória dos shingles)
+SIGNATURE_BATCH = 50_000
+
+# Texto para comparação: minúsculas, sem acentos, links, emojis e pontuação, espaços simples
+COMPARISON_NORMALIZER = TextNormalizer(urls=True, emojis=True, line_breaks=True, lower=True, strip_accents=True,
+                                       punctuation=True, collapse_spaces=True)
+
+
+def normalize_text(texts):
+    """Texto de cada publicação para comparação (COMPARISON_NORMALIZER); vazio para nulos e "NA"."""
+    s = COMPARISON_NORMALIZER.normalize(pd.Series(texts, dtype=object))
+    return s.mask(s == "na", "")
+
+
+def _mix(values, seed):
+    """Hash de 64 bits com semente (xor, multiplicação ímpar e xorshift: uma permutação de uint64)."""
+    with np.errstate(over="ignore"):
+        h = (values ^ np.uint64(seed)) * np.uint64(0x9E3779B97F4A7C15)
+        h ^= h >> np.uint64(29)
+        h = h * np.uint64(0xBF58476D1CE4E5B9)
+        return h ^ (h >> np.uint64(32))
+
+
+def _shingle_hashes(texts):
+    """
+    Hashes dos shingles de SHINGLE_WORDS palavras de cada texto e a posição do texto de cada um.
+    Textos mais curtos viram um único shingle com todas as palavras.
+    """
+    words = [text.split() for text in texts]
+    counts = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))
+    flat = np.fromiter((word for w in words for word in w), dtype=object, count=int(counts.sum()))
+    word_hash = pd.util.hash_array(flat, categorize=True)
+    doc = np.repeat(np.arange(len(texts)), counts)
+
+    k = SHINGLE_WORDS
+    with np.errstate(over="ignore"):
+        gram = word_hash[:len(word_hash) - k + 1].copy() if len(word_hash) >= k else np.empty(0, np.uint64)
+        for offset in range(1, k):
+            gram = _mix(gram, offset) ^ word_hash[offset:len(word_hash) - k + 1 + offset]
+    # Só os k-gramas que começam e terminam no mesmo texto
+    valid = doc[:len(gram)] == doc[k - 1:] if len(gram) else np.zeros(0, dtype=bool)
+    gram, gram_doc = gram[valid], doc[:len(valid)][valid]
+
+    short = np.flatnonzero((counts > 0) & (counts < k))
+    if len(short):
+        whole = pd.util.hash_array(np.asarray([texts[i] for i in short], dtype=object))
+        gram = np.concatenate([gram, whole])
+        gram_doc = np.concatenate([gram_doc, short])
+    return gram, gram_doc
+
+
+def minhash_signatures(texts, num_perm=NUM_PERM):
+    """Assinaturas MinHash (uint32, textos x num_perm); textos sem palavras ficam com o máximo."""
+    signatures = np.full((len(texts), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    for start in range(0, len(texts), SIGNATURE_BATCH):
+        batch = texts[start:start + SIGNATURE_BATCH]
+        gram, gram_doc = _shingle_hashes(batch)
+        if not len(gram):
+            continue
+        order = np.argsort(gram_doc, kind="stable")
+        gram, gram_doc = gram[order], gram_doc[order]
+        docs, starts = np.unique(gram_doc, return_index=True)
+        for perm in range(num_perm):
+            values = (_mix(gram, perm + 1) >> np.uint64(32)).astype(np.uint32)
+            signatures[start + docs, perm] = np.minimum.reduceat(values, starts)
+    return signatures
+
+
+def _components(n, left, right):
+    """Componentes conexos (rótulo = menor nó do componente) por propagação de rótulos vetorizada."""
+    labels = np.arange(n)
+    if not len(left):
+        return labels
+    while True:
+        previous = labels.copy()
+        smallest = np.minimum(labels[left], labels[right])
+        np.minimum.at(labels, left, smallest)
+        np.minimum.at(labels, right, smallest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def _near_duplicate_edges(signatures, bands=BANDS, threshold=NEAR_THRESHOLD):
+    """Pares (texto, representante da faixa) com assinatura parecida o bastante (LSH por faixas)."""
+    rows = signatures.shape[1] // bands
+    left, right = [], []
+    for band in range(bands):
+        block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+        key = block[:, 0]
+        for col in range(1, rows):
+            key = _mix(key, col) ^ block[:, col]
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        new_bucket = np.r_[True, sorted_key[1:] != sorted_key[:-1]]
+        # Representante de cada balde: o primeiro texto (menor posição) com a mesma chave
+        representative = order[np.flatnonzero(new_bucket)[np.cumsum(new_bucket) - 1]]
+        pairs = order != representative
+        left.append(order[pairs])
+        right.append(representative[pairs])
+    left, right = np.concatenate(left), np.concatenate(right)
+    if not len(left):
+        return left, right
+    pairs = np.unique(np.stack([left, right], axis=1), axis=0)
+    left, right = pairs[:, 0], pairs[:, 1]
+    similarity = (signatures[left] == signatures[right]).mean(axis=1)
+    keep = similarity >= threshold
+    return left[keep], right[keep]
+
+
+def duplicate_clusters(texts, near=True, threshold=NEAR_THRESHOLD):
+    """
+    Grupo de cada texto: textos iguais depois de normalize_text (hash exato) e, com near=True,
+    quase iguais (MinHash/LSH, similaridade de Jaccard estimada >= threshold). O rótulo é a
+    posição da primeira linha do grupo; textos vazios ficam sozinhos.
+    """
+    normalized = normalize_text(texts)
+    # Cada texto distinto entra uma vez nas assinaturas (códigos na ordem da primeira aparição)
+    codes, uniques = pd.factorize(normalized, sort=False)
+    labels = np.arange(len(uniques))
+    if near and len(uniques):
+        signatures = minhash_signatures(list(uniques))
+        labels = _components(len(uniques), *_near_duplicate_edges(signatures, threshold=threshold))
+
+    # O rótulo do componente é o texto distinto que aparece primeiro: a primeira linha dele é a
+    # primeira linha do grupo
+    _, first_row = np.unique(codes, return_index=True)
+    clusters = first_row[labels][codes]
+    empty = (normalized == "").to_numpy()
+    clusters[empty] = np.flatnonzero(empty)
+    return clusters
+
+
+def drop_duplicate_posts(df, mode="near", text_column=TEXT_COLUMN, threshold=NEAR_THRESHOLD):
+    """
+    Etapa "duplicates": mantém a primeira linha de cada grupo de publicações duplicadas ("exact")
+    ou também quase duplicadas ("near") em `text_column` e grava em CLUSTER_SIZE_COLUMN (logo após
+    o texto) quantas linhas o grupo tinha.
+    """
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"Modo de deduplicação inválido: {mode!r} (use {', '.join(DEDUP_MODES)})")
+    if text_column not in df.columns:
+        return df
+    clusters = duplicate_clusters(df[text_column].to_numpy(), near=mode == "near", threshold=threshold)
+    sizes = np.bincount(clusters, minlength=len(df))
+    keep = clusters == np.arange(len(df))
+    df = df.loc[keep].reset_index(drop=True)
+    df.insert(df.columns.get_loc(text_column) + 1, CLUSTER_SIZE_COLUMN, sizes[keep])
+    return df
@@ -0,0 +1,134 @@
+import importlib.util
+import math
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+# === Constants ===
+# "xlsxwriter", "openpyxl" ou vazio (automático: xlsxwriter quando instalado)
+BACKEND_ENV_VAR = "VCLEAN_EXCEL_WRITER"
+DEFAULT_SHEET_NAME = "Sheet1"
+
+# Mesmo estilo de cabeçalho que o pandas aplica no to_excel
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+DATETIME_FORMAT = "yyyy-mm-dd hh:mm:ss"
+DATE_FORMAT = "yyyy-mm-dd"
+
+
+def excel_writer_backend():
+    """xlsxwriter em modo constant_memory quando disponível; caso contrário, openpyxl."""
+    backend = os.environ.get(BACKEND_ENV_VAR, "").strip().lower()
+    if backend:
+        return backend
+    if importlib.util.find_spec("xlsxwriter") is not None:
+        return "xlsxwriter"
+    return "openpyxl"
+
+
+class ExcelSheetsWriter:
+    """
+    Grava DataFrames (sem índice) como abas de um xlsx, na ordem em que write_sheet é chamado.
+    `target` pode ser um caminho ou um arquivo binário aberto (inclusive não posicionável,
+    como uma entrada de ZIP). Uso igual ao pd.ExcelWriter:
+
+        with ExcelSheetsWriter(path) as writer:
+            writer.write_sheet("Cleaned Data", df)
+    """
+
+    def __init__(self, target, backend=None):
+        self.backend = backend or excel_writer_backend()
+        if self.backend == "xlsxwriter":
+            import xlsxwriter
+
+            # constant_memory despeja cada linha em disco assim que a seguinte começa: as linhas
+            # precisam sair em ordem, por isso a escrita é feita aqui, linha a linha, e não pelo
+            # to_excel do pandas (que escreve coluna a coluna).
+            self._workbook = xlsxwriter.Workbook(target, {
+                "constant_memory": True,
+                "strings_to_numbers": False,
+                "strings_to_formulas": False,
+                "strings_to_urls": False,
+            })
+            self._formats = {
+                "header": self._workbook.add_format(HEADER_FORMAT),
+                "datetime": self._workbook.add_format({"num_format": DATETIME_FORMAT}),
+                "date": self._workbook.add_format({"num_format": DATE_FORMAT}),
+            }
+        elif self.backend == "openpyxl":
+            self._writer = pd.ExcelWriter(target, engine="openpyxl")
+        else:
+            raise ValueError(f"Backend de Excel desconhecido: {self.backend!r}")
+
+    def write_sheet(self, sheet_name, df, columns=None):
+        """columns: subconjunto (e ordem) das colunas gravadas, sem copiar o DataFrame; None = todas."""
+        if self.backend == "openpyxl":
+            df.to_excel(self._writer, index=False, sheet_name=sheet_name, columns=columns)
+            return
+
+        positions = list(range(df.shape[1])) if columns is None else [df.columns.get_loc(c) for c in columns]
+        worksheet = self._workbook.add_worksheet(sheet_name)
+        for col, pos in enumerate(positions):
+            worksheet.write_string(0, col, str(df.columns[pos]), self._formats["header"])
+
+        dtypes = df.dtypes.tolist()
+        writers = [_cell_writer(worksheet, dtypes[pos], self._formats) for pos in positions]
+        for row, values in enumerate(df.itertuples(index=False, name=None), start=1):
+            for col, pos in enumerate(positions):
+                writers[col](row, col, values[pos])
+
+    def close(self):
+        if self.backend == "openpyxl":
+            self._writer.close()
+        else:
+            self._workbook.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_excel(target, df, sheet_name=DEFAULT_SHEET_NAME, backend=None, columns=None):
+    """Equivalente a df.to_excel(target, index=False, columns=columns) usando o backend configurado."""
+    with ExcelSheetsWriter(target, backend=backend) as writer:
+        writer.write_sheet(sheet_name, df, columns=columns)
+
+
+def _cell_writer(worksheet, dtype, formats):
+    """Escolhe, pelo dtype da coluna, a função que grava cada célula (NaN/None ficam em branco)."""
+    if pd.api.types.is_bool_dtype(dtype):
+        return worksheet.write_boolean
+    if pd.api.types.is_integer_dtype(dtype):
+        return lambda row, col, value: worksheet.write_number(row, col, int(value))
+    if pd.api.types.is_float_dtype(dtype):
+        def write_float(row, col, value):
+            if math.isnan(value):
+                return
+            if math.isinf(value):
+                worksheet.write_string(row, col, "inf" if value > 0 else "-inf")
+                return
+            worksheet.write_number(row, col, value)
+        return write_float
+
+    def write_any(row, col, value):
+        if value is None or value is pd.NaT:
+            return
+        if isinstance(value, (bool, np.bool_)):
+            worksheet.write_boolean(row, col, bool(value))
+        elif isinstance(value, (int, float, np.integer, np.floating)):
+            if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+                if not math.isnan(value):
+                    worksheet.write_string(row, col, "inf" if value > 0 else "-inf")
+                return
+            worksheet.write_number(row, col, value)
+        elif isinstance(value, datetime):
+            worksheet.write_datetime(row, col, pd.Timestamp(value).to_pydatetime().replace(tzinfo=None),
+                                     formats["datetime"])
+        elif isinstance(value, date):
+            worksheet.write_datetime(row, col, datetime(value.year, value.month, value.day), formats["date"])
+        else:
+            worksheet.write_string(row, col, str(value))
+    return write_any
@@ -0,0 +1,161 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# === Constants ===
+LIST_CASA = ["CÂMARA", "SENADO"]
+LIST_PARTIDO = ["MDB", "PT", "PRD", "PP", "PSDB", "PDT", "UNIÃO", "PL", "PODEMOS", "PSB", "REPUBLICANOS",
+                "PV", "AVANTE", "PSC", "PSOL", "PCDOB", "PSD", "SOLIDARIEDADE", "NOVO", "REDE", "PMB",
+                "UP", "DC", "PCO", "PSTU", "PCB", "PRTB", "MOBILIZA", "AGIR", "CIDADANIA", "PROS", "PATRIOTA"]
+LIST_ESTADO = ["AC", "AL", "AP", "AM", "BA", "CE", "DF", "ES", "GO", "MA", "MT", "MS", "MG", "PA", "PB",
+               "PR", "PE", "PI", "RJ", "RN", "RS", "RO", "RR", "SC", "SP", "SE", "TO"]
+
+# Tabela de correções manuais (Partido/Estado) por parlamentar; editável sem mexer no código
+OVERRIDES_PATH = Path(__file__).resolve().parent / "parlamentares_overrides.csv"
+OVERRIDES_NAME_COLUMN = "Nome"
+
+GRUPOS_FIELDS = ['Casa', 'Partido', 'Estado', 'Extras']
+GRUPOS_SEPARATOR = " | "
+
+# Grafias alternativas usadas na ferramenta de monitoramento
+TOKEN_ALIASES = {"CAMARA": "CÂMARA", "PODE": "PODEMOS"}
+
+_EXTRA = len(GRUPOS_FIELDS) - 1
+TOKEN_FIELD = {
+    **{item: 0 for item in LIST_CASA},
+    **{item: 1 for item in LIST_PARTIDO},
+    **{item: 2 for item in LIST_ESTADO},
+}
+
+
+def split_grupos(grupos):
+    """
+    Separa a coluna Grupos (saída de .str.upper()) em Casa/Partido/Estado/Extras sem apply por linha:
+      • fatoriza os valores (a mesma combinação de grupos se repete muito);
+      • explode os tokens " | " uma única vez e classifica cada um por lookup em dicionário;
+      • o primeiro token de cada campo vence; os demais vão para Extras, na ordem original.
+    Valores ausentes resultam em linha toda vazia (None).
+    """
+    codes, uniques = pd.factorize(grupos)
+    fields = _split_unique(pd.Series(uniques, dtype=object))
+
+    out = np.full((len(grupos), len(GRUPOS_FIELDS)), None, dtype=object)
+    valid = codes >= 0
+    out[valid] = fields[codes[valid]]
+    return pd.DataFrame(out, index=grupos.index, columns=GRUPOS_FIELDS)
+
+
+def _split_unique(values):
+    fields = np.full((len(values), len(GRUPOS_FIELDS)), None, dtype=object)
+    if values.empty:
+        return fields
+
+    tokens = values.str.split(GRUPOS_SEPARATOR, regex=False).explode()
+    tokens = tokens.replace(TOKEN_ALIASES)
+    row = tokens.index.to_numpy()
+    field = tokens.map(TOKEN_FIELD).fillna(_EXTRA).astype(int).to_numpy()
+
+    # Só a primeira ocorrência de Casa/Partido/Estado em cada linha ocupa o campo
+    first = ~pd.DataFrame({"row": row, "field": field}).duplicated().to_numpy()
+    is_extra = (field == _EXTRA) | ~first
+
+    for pos in range(_EXTRA):
+        take = (field == pos) & first
+        fields[row[take], pos] = tokens.to_numpy()[take]
+
+    extras = tokens[is_extra]
+    if not extras.empty:
+        # Extras vazios no início são descartados (o original só acumula após o primeiro não vazio)
+        started = (extras != "").groupby(level=0).cummax()
+        kept = extras[started]
+        fields[extras.index.unique(), _EXTRA] = ""
+
+        # Junta os extras nível a nível (1º token de cada linha, depois o 2º, ...) em vez de um join por grupo
+        level = kept.groupby(level=0).cumcount().to_numpy()
+        kept_rows = kept.index.to_numpy()
+        kept_values = kept.to_numpy()
+        for depth in range(level.max() + 1 if len(level) else 0):
+            take = level == depth
+            rows = kept_rows[take]
+            if depth == 0:
+                fields[rows, _EXTRA] = kept_values[take]
+            else:
+                fields[rows, _EXTRA] = fields[rows, _EXTRA] + GRUPOS_SEPARATOR + kept_values[take]
+
+    return fields
+
+
+# === Correções por parlamentar ===
+
+class OverrideMatcher:
+    """
+    Compila a tabela de correções numa única regex de alternância (sem diferenciar maiúsculas).
+    Cada nome é procurado como substring do perfil; havendo mais de um nome no mesmo perfil,
+    vale o que aparece primeiro no texto.
+    """
+
+    def __init__(self, table):
+        table = table.dropna(subset=[OVERRIDES_NAME_COLUMN]).drop_duplicates(
+            subset=[OVERRIDES_NAME_COLUMN], keep="last"
+        )
+        self.columns = [col for col in table.columns if col != OVERRIDES_NAME_COLUMN]
+        names = table[OVERRIDES_NAME_COLUMN].astype(str).str.strip()
+        # Nomes mais longos primeiro, para "Júlio César Filho" não ser engolido por "Júlio César"
+        ordered = sorted(names, key=len, reverse=True)
+        self.pattern = re.compile("(" + "|".join(re.escape(name) for name in ordered) + ")", re.IGNORECASE)
+        self.lookup = {name.lower(): pos for pos, name in enumerate(names)}
+        self.values = table[self.columns].to_numpy(dtype=object)
+
+    def match(self, profiles):
+        """Retorna, para cada linha, a posição da correção na tabela (-1 quando nenhuma se aplica)."""
+        codes, uniques = pd.factorize(profiles)
+        found = pd.Series(uniques, dtype=object).str.extract(self.pattern, expand=False)
+        positions = found.str.lower().map(self.lookup).fillna(-1).astype(int).to_numpy()
+        out = np.full(len(profiles), -1)
+        valid = codes >= 0
+        out[valid] = positions[codes[valid]]
+        return out
+
+    def apply(self, df, column):
+        positions = self.match(df[column])
+        matched = positions >= 0
+        for col in self.columns:
+            if col not in df.columns:
+                df[col] = pd.Series(np.nan, index=df.index, dtype=object)
+        if not matched.any():
+            return df
+
+        # Células vazias na tabela mantêm o valor que veio de Grupos
+        current = df.loc[matched, self.columns].to_numpy(dtype=object)
+        overrides = self.values[positions[matched]]
+        df.loc[matched, self.columns] = np.where(pd.isna(overrides), current, overrides)
+        return df
+
+
+def load_overrides(path=OVERRIDES_PATH):
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        # {"Nome": {"Partido": ..., "Estado": ...}, ...}
+        with open(path, encoding="utf-8") as f:
+            table = pd.DataFrame.from_dict(json.load(f), orient="index")
+        return table.rename_axis(OVERRIDES_NAME_COLUMN).reset_index()
+    return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""])
+
+
+@lru_cache(maxsize=8)
+def _compiled_matcher(path, mtime):
+    return OverrideMatcher(load_overrides(path))
+
+
+def get_override_matcher(path=OVERRIDES_PATH):
+    # Recompila apenas quando a tabela é alterada em disco
+    path = Path(path)
+    return _compiled_matcher(path, path.stat().st_mtime_ns)
+
+
+def apply_overrides(df, column='Perfil/Nome da busca', path=OVERRIDES_PATH):
+    return get_override_matcher(path).apply(df, column)
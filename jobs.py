@@ -0,0 +1,148 @@
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import default_hooks
+
+# === Constants ===
+# Quantos relatórios rodam ao mesmo tempo (os demais esperam na fila) e por quanto tempo
+# (segundos) o resultado de um job concluído fica disponível
+JOB_WORKERS_ENV_VAR = "VCLEAN_JOB_WORKERS"
+JOB_TTL_ENV_VAR = "VCLEAN_JOB_TTL"
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_RESULT_TTL = 60 * 60
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """
+    Um relatório submetido à JobQueue. O próprio job é um hook do pipeline (ver pipeline.PipelineRun):
+    a thread do worker atualiza etapa e progresso, e a app só lê esses campos.
+    """
+
+    def __init__(self, report, key=None, stages=()):
+        self.id = uuid.uuid4().hex
+        self.report = report
+        self.key = key
+        self.stages = list(stages)
+        self.status = QUEUED
+        self.stage = None
+        self.stages_done = 0
+        self.result = None
+        self.error = None
+        self.metrics = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    @property
+    def progress(self):
+        """Fração (0–1) das etapas principais concluídas."""
+        if self.status == DONE:
+            return 1.0
+        return self.stages_done / len(self.stages) if self.stages else 0.0
+
+    # === Hooks do pipeline ===
+    def stage_started(self, run, name):
+        if name in self.stages:
+            self.stage = name
+
+    def stage_finished(self, run, metrics):
+        if metrics["stage"] in self.stages:
+            self.stages_done = max(self.stages_done, self.stages.index(metrics["stage"]) + 1)
+
+    def run_finished(self, run):
+        self.metrics = run.metrics_frame()
+
+
+class JobQueue:
+    """
+    Fila local de relatórios executados em segundo plano num pool de threads limitado (max_workers),
+    fora da thread do script do Streamlit: um rerun da página não interrompe nem repete o trabalho.
+    Jobs com a mesma `key` (ex.: hash do upload + parâmetros) são reaproveitados enquanto estão na
+    fila, rodando ou concluídos; resultados concluídos expiram após result_ttl segundos.
+    """
+
+    def __init__(self, max_workers=None, result_ttl=None):
+        self.max_workers = max_workers or int(os.environ.get(JOB_WORKERS_ENV_VAR, DEFAULT_JOB_WORKERS))
+        self.result_ttl = result_ttl if result_ttl is not None else \
+            float(os.environ.get(JOB_TTL_ENV_VAR, DEFAULT_RESULT_TTL))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, report, fn, *args, key=None, stages=(), **kwargs):
+        """
+        Enfileira fn(*args, hooks=..., **kwargs); o retorno vira job.result. Os hooks recebidos (ou
+        os padrão) ganham o próprio job, que acompanha as etapas. Um job com a mesma key que não
+        falhou é devolvido no lugar de um novo.
+        """
+        self.evict_expired()
+        with self._lock:
+            existing = self._jobs.get(self._by_key.get(key)) if key is not None else None
+            if existing is not None and existing.status != FAILED:
+                return existing
+            job = Job(report, key=key, stages=stages)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[key] = job.id
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        job.started_at = time.time()
+        job.status = RUNNING
+        hooks = kwargs.pop("hooks", None)
+        hooks = (default_hooks() if hooks is None else list(hooks)) + [job]
+        try:
+            job.result = fn(*args, hooks=hooks, **kwargs)
+            job.finished_at = time.time()
+            job.status = DONE
+        except Exception:
+            traceback.print_exc()
+            job.error = traceback.format_exc()
+            job.finished_at = time.time()
+            job.status = FAILED
+
+    def get(self, job_id):
+        self.evict_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at)
+
+    def position(self, job):
+        """Posição na fila (1 = o próximo a rodar); 0 se o job já começou."""
+        if job.status != QUEUED:
+            return 0
+        queued = [other for other in self.jobs() if other.status == QUEUED]
+        return next((pos for pos, other in enumerate(queued, start=1) if other is job), 0)
+
+    def evict_expired(self):
+        """Descarta jobs concluídos há mais de result_ttl segundos (e seus resultados)."""
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            expired = [job for job in self._jobs.values()
+                       if job.finished and job.finished_at is not None and job.finished_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+                if self._by_key.get(job.key) == job.id:
+                    del self._by_key[job.key]
+        return len(expired)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
@@ -0,0 +1,95 @@
+import json
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Linhas sem nenhuma tag dos macrotemas
+NO_MACROTHEME = 0
+
+
+class MacrothemeAssignments:
+    """
+    Resultado da atribuição de macrotemas para um bloco de linhas:
+      • membership: matriz bool (linhas x macrotemas), True onde a linha tem alguma tag do macrotema;
+      • labels: rótulo único por linha (coluna 'Macrotema'), o último macrotema que casou, como
+        no relatório original; 0 quando nenhum casou.
+    Com multilabel=True (análise multitemática), rows() e as tabelas resumo usam a pertinência
+    completa, e a mesma linha conta em todos os macrotemas a que pertence.
+    """
+
+    def __init__(self, index, macros, membership, multilabel=False):
+        self.index = index
+        self.macros = list(macros)
+        self.membership = membership
+        self.multilabel = multilabel
+
+    @cached_property
+    def labels(self):
+        labels = np.full(len(self.index), NO_MACROTHEME, dtype=object)
+        matched = self.membership.any(axis=1)
+        if matched.any():
+            last = len(self.macros) - 1 - self.membership[matched, ::-1].argmax(axis=1)
+            labels[matched] = np.asarray(self.macros, dtype=object)[last]
+        return pd.Series(labels, index=self.index, name='Macrotema').infer_objects()
+
+    def rows(self, macro):
+        """Máscara das linhas que entram no macrotema (para os .txt de cada macrotema)."""
+        if self.multilabel:
+            return self.membership[:, self.macros.index(macro)]
+        return (self.labels == macro).to_numpy()
+
+
+def get_macrotheme_names(macrotheme_definitions):
+    # Nome exibido do macrotema: as tags unidas por " + "
+    return {macro: " + ".join(tags) for macro, tags in macrotheme_definitions.items()}
+
+
+def load_macrotheme_definitions(path):
+    """
+    Lê as definições de macrotemas de um JSON ou YAML (.yaml/.yml, requer PyYAML):
+    {"1": ["Saúde", "Educação"], "2": ["Economia"]} ou uma lista de listas, numerada a partir de 1.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as exc:
+                raise ImportError("Definições em YAML requerem o PyYAML (pip install pyyaml).") from exc
+            raw = yaml.safe_load(f)
+        else:
+            raw = json.load(f)
+
+    if isinstance(raw, list):
+        raw = {pos: tags for pos, tags in enumerate(raw, start=1)}
+    if not isinstance(raw, dict):
+        raise ValueError(f"Definições de macrotemas inválidas em {path}: esperado um objeto ou uma lista.")
+    definitions = {}
+    for macro, tags in raw.items():
+        if isinstance(tags, str) or not all(isinstance(tag, str) for tag in tags or []):
+            raise ValueError(f"Macrotema {macro} em {path}: esperada uma lista de tags.")
+        definitions[int(macro) if str(macro).isdigit() else macro] = list(tags or [])
+    return definitions
+
+
+def incidence_matrix(macrotheme_definitions):
+    """Tags usadas (sem repetição, na ordem de aparição) e a matriz tag → macrotema (float32 0/1)."""
+    tags = list(dict.fromkeys(tag for tag_list in macrotheme_definitions.values() for tag in tag_list))
+    position = {tag: pos for pos, tag in enumerate(tags)}
+    incidence = np.zeros((len(tags), len(macrotheme_definitions)), dtype=np.float32)
+    for col, tag_list in enumerate(macrotheme_definitions.values()):
+        incidence[[position[tag] for tag in tag_list], col] = 1
+    return tags, incidence
+
+
+def assign(df, macrotheme_definitions, multilabel=False):
+    """
+    Calcula a pertinência de todas as linhas a todos os macrotemas num único produto de matrizes:
+    (linhas x tags marcadas) @ (tags x macrotemas) > 0.
+    """
+    tags, incidence = incidence_matrix(macrotheme_definitions)
+    marked = (df[tags].to_numpy() > 0).astype(np.float32)
+    membership = (marked @ incidence) > 0
+    return MacrothemeAssignments(df.index, macrotheme_definitions.keys(), membership, multilabel=multilabel)
@@ -1,6 +1,15 @@
 import pandas as pd
-import re
-from pathlib import Path
+
+from analysis import AiExportOptions, AiTxtWriter, NEWS_ANALYSIS_FIELDS, add_analysis, excel_columns, write_lines
+from corpus import build_corpus_text, export_corpus, write_corpus
+from dedup import drop_duplicate_posts
+from excel_writer import write_excel
+from pipeline import DUPLICATES_STAGE, NEWS_STAGES, PipelineRun, with_stage
+from schema import ReadSchema
+from sinks import default_sink, open_text
+from stages import clean_columns_and_values as clean_stage, output_base_name
+from streaming import STREAM_CHUNK_ROWS, EmptyColumnTracker
+from workbook import MAIN_SHEET, insert_id_column, iter_workbook_chunks, load_sheets
 
 # === Colunas que não entram no fluxo de Notícias ===
 UNNECESSARY_COLUMNS = [
@@ -16,70 +25,166 @@ UNNECESSARY_COLUMNS = [
     "Analisada por", "Data analisada", "Avaliação", "Tipo/Conteúdo", "Observação", "Unnamed: 73"
 ]
 
+# Esquema de leitura: as colunas descartadas (inclusive o engajamento) nem são lidas
+READ_SCHEMA = ReadSchema("noticias", drop=UNNECESSARY_COLUMNS)
+READ_SCHEMAS = {MAIN_SHEET: READ_SCHEMA}
+
 def export_for_iramuteq(df: pd.DataFrame, txt_filename: str):
     """Gera arquivo de corpus para IRAMUTEQ a partir de Título + Descrição."""
-    def clean_text(text):
-        return re.sub(r'[\|:\*"\?<>\|\$\-\'%]', '', str(text))
-    lines = []
-    for _, row in df.iterrows():
-        id_    = row.get("ID", "")
-        titulo = row.get("Título", "")
-        descr  = clean_text(row.get("Descrição", ""))
-        lines.append(f"**** *id_{id_} *u_{titulo}\n{descr}\n")
-    with open(txt_filename, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    export_corpus(df, txt_filename, label_column="Título")
     print(f"🧾 IRAMUTEQ salvo em: {txt_filename}")
 
+def clean_columns_and_values(df: pd.DataFrame, drop_empty: bool = True) -> pd.DataFrame:
+    """Remove UNNECESSARY_COLUMNS, troca "-" por "NA" e descarta colunas vazias."""
+    return clean_stage(df, drop_columns=UNNECESSARY_COLUMNS, engagement_columns=(), split_columns=(),
+                       drop_empty=drop_empty)
+
+def add_analysis_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Cria coluna Análise no formato desejado."""
+    return add_analysis(df, NEWS_ANALYSIS_FIELDS)
+
 def add_analysis_column_and_export_txt(df: pd.DataFrame, txt_filename: str):
     """Cria coluna Análise no formato desejado e exporta TXT."""
-    for col in ["ID", "Título", "Descrição", "Link ocorrência"]:
-        if col not in df.columns:
-            df[col] = ""
-    df["Análise"] = (
-        df["ID"].astype(str)
-        + " | Título: " + df["Título"].astype(str)
-        + " | Texto: "  + df["Descrição"].astype(str)
-        + " | Link: "   + df["Link ocorrência"].astype(str)
-    )
-    df["Análise"].to_csv(txt_filename, index=False, header=False)
+    df = add_analysis_column(df)
+    with open(txt_filename, "w", encoding="utf-8", newline="") as f:
+        write_lines(f, df["Análise"])
     print(f"📝 Análise TXT salvo em: {txt_filename}")
     return df
 
-def process_and_export_excel(filepath: str, output_filename: str) -> pd.DataFrame:
+def _log_ai_files(run: PipelineRun, ai_writer: AiTxtWriter):
+    files = ", ".join(str(path) for path in ai_writer.output_files)
+    if len(ai_writer.names) > 1:
+        run.log(f"📝 Análise TXT salvo em {len(ai_writer.names)} partes: {files}")
+    else:
+        run.log(f"📝 Análise TXT salvo em: {files}")
+
+def export_outputs(df: pd.DataFrame, sink, output_filename: str, run: PipelineRun,
+                   analysis_column: bool = True, ai_export: AiExportOptions = None) -> pd.DataFrame:
+    """
+    Etapa "export": {base}_ai.txt (em partes, conforme ai_export), {base}_corpus.txt e o Excel limpo
+    (sem 'Análise' se analysis_column=False).
+    """
+    base = output_base_name(output_filename)
+    ai_export = ai_export or AiExportOptions()
+
+    # 1) Gera arquivo de análise: nome_ai.txt  --- (2025-6-27)
+    with AiTxtWriter(sink, f"{base}_ai.txt", ai_export, newline="") as ai_writer:
+        ai_writer.write(ai_export.lines(df))
+    _log_ai_files(run, ai_writer)
+
+    # 2) Gera arquivo de corpus para IRAMUTEQ: nome_corpus.txt  --- (2025-6-27)
+    corpus_txt = f"{base}_corpus.txt"
+    with open_text(sink, corpus_txt) as f:
+        write_corpus(df, f, label_column="Título")
+    run.log(f"🧾 IRAMUTEQ salvo em: {sink.location(corpus_txt)}")
+
+    # 3) Salva o Excel limpo --- (2025-6-27)
+    with sink.open(output_filename) as f:
+        write_excel(f, df, columns=excel_columns(df, analysis_column))
+    run.log(f"✅ Excel de Notícias salvo em: {sink.location(output_filename)}")
+    return df
+
+def process_and_export_excel(filepath: str, output_filename: str, chunksize: int = None,
+                             sink=None, hooks=None, analysis_column: bool = True,
+                             ai_export: AiExportOptions = None, dedup: str = None) -> pd.DataFrame:
     """
     1) Lê sheet 'Ocorrências' (skiprows=4)
     2) Insere coluna ID
     3) Remove colunas UNNECESSARY_COLUMNS
     4) Exporta .txt de Análise e _iramuteq.txt
     5) Salva Excel limpo
+    Com chunksize, usa o modo streaming (process_and_export_excel_streaming).
+    Os artefatos vão para o sink (por padrão, a pasta do arquivo de entrada; ZipSink grava direto num ZIP).
+    Etapas load → clean → analysis → export medidas pelos hooks (ver pipeline.PipelineRun).
+    analysis_column=False deixa a coluna 'Análise' fora do Excel (o texto continua no _ai.txt);
+    ai_export (analysis.AiExportOptions) grava o _ai.txt em partes e/ou só as K primeiras linhas.
+    dedup ("exact" ou "near") remove notícias repetidas após a limpeza (etapa "duplicates", ver dedup.py).
     """
-    print(f"📂 Processando Notícias: {filepath}")
-    df = pd.read_excel(filepath, sheet_name="Ocorrências", skiprows=4)
-    df.columns = df.columns.str.replace('"', '').str.strip()
-    df.insert(0, "ID", range(1, len(df) + 1))
+    if chunksize:
+        if dedup:
+            raise ValueError("A remoção de duplicadas precisa de todas as linhas: não use com chunksize.")
+        return process_and_export_excel_streaming(filepath, output_filename, chunksize=chunksize, sink=sink,
+                                                  hooks=hooks, analysis_column=analysis_column,
+                                                  ai_export=ai_export)
+
+    sink = default_sink(filepath, sink)
+    stages = with_stage(NEWS_STAGES, DUPLICATES_STAGE, "clean") if dedup else NEWS_STAGES
+    run = PipelineRun("noticias", hooks=hooks, stages=stages)
+
+    run.log(f"📂 Processando Notícias: {filepath}")
+    sheets = run.stage("load", load_sheets, filepath, sheet_names=(MAIN_SHEET,), schemas=READ_SCHEMAS)
+    df = insert_id_column(sheets[MAIN_SHEET])
 
     # limpeza
-    df = df.drop(columns=set(UNNECESSARY_COLUMNS).intersection(df.columns), errors="ignore")
-    df = df.replace("-", "NA").dropna(axis=1, how="all")
+    df = run.stage("clean", clean_columns_and_values, df)
+    if dedup:
+        rows = len(df)
+        df = run.stage(DUPLICATES_STAGE, drop_duplicate_posts, df, mode=dedup)
+        run.log(f"🧹 {rows - len(df)} notícias repetidas removidas ({len(df)} mantidas).")
 
     # gera Análise e IRAMUTEQ
-    # --- Novo código para definir o nome base sem "_cleaned" --- (2025-6-27)
-    stem = Path(output_filename).stem
-    if stem.endswith("_cleaned"):
-        base = stem[:-len("_cleaned")]
-    else:
-        base = stem
-    # --- Fim do novo código  --- (2025-6-27)
+    df = run.stage("analysis", add_analysis_column, df)
+    df = run.stage("export", export_outputs, df, sink, output_filename, run, analysis_column=analysis_column,
+                   ai_export=ai_export)
+    run.finish(rows=len(df), columns=df.shape[1])
+    return df
 
-    # 1) Gera arquivo de análise: nome_ai.txt  --- (2025-6-27)
-    txt_analysis = f"{base}_ai.txt"
-    df = add_analysis_column_and_export_txt(df, txt_analysis)
+def process_and_export_excel_streaming(filepath: str, output_filename: str,
+                                       chunksize: int = STREAM_CHUNK_ROWS, sink=None,
+                                       hooks=None, analysis_column: bool = True,
+                                       ai_export: AiExportOptions = None) -> pd.DataFrame:
+    """
+    Modo streaming para exportações muito grandes: lê 'Ocorrências' em blocos de linhas,
+    limpa cada bloco e grava _ai.txt e _corpus.txt incrementalmente.
+    Só o Excel limpo precisa de todas as linhas juntas.
+    """
+    run = PipelineRun("noticias", hooks=hooks, stages=NEWS_STAGES)
+    run.log(f"📂 Processando Notícias em blocos de {chunksize} linhas: {filepath}")
+    sink = default_sink(filepath, sink)
 
-    # 2) Gera arquivo de corpus para IRAMUTEQ: nome_corpus.txt  --- (2025-6-27)
+    base = output_base_name(output_filename)
     corpus_txt = f"{base}_corpus.txt"
-    export_for_iramuteq(df, corpus_txt)
+    ai_export = ai_export or AiExportOptions()
 
-    # 3) Salva o Excel limpo --- (2025-6-27)
-    df.to_excel(output_filename, index=False)
-    print(f"✅ Excel de Notícias salvo em: {output_filename}")
+    def write_chunk(df: pd.DataFrame) -> pd.DataFrame:
+        if not ai_export.ranked:
+            ai_writer.write(ai_export.lines(df))
+        corpus_file.write(build_corpus_text(df, label_column="Título"))
+        return df
+
+    def write_ranked(df: pd.DataFrame) -> pd.DataFrame:
+        # Com top_k o _ai.txt só é gravado com todas as linhas reunidas
+        ai_writer.write(ai_export.lines(df) if len(df) else [])
+        return df
+
+    chunks = []
+    tracker = EmptyColumnTracker()
+    next_id = 1
+    with AiTxtWriter(sink, f"{base}_ai.txt", ai_export, newline="") as ai_writer, \
+            open_text(sink, corpus_txt) as corpus_file:
+        blocks = iter_workbook_chunks(filepath, chunksize, sheet_names=(MAIN_SHEET,), schemas=READ_SCHEMAS)
+        for sheets in run.iterate("load", blocks):
+            df = insert_id_column(sheets[MAIN_SHEET], start=next_id)
+            next_id += len(df)
+
+            df = run.stage("clean", clean_columns_and_values, df, drop_empty=False)
+            tracker.update(df)
+            df = run.stage("analysis", add_analysis_column, df)
+            chunks.append(run.stage("export", write_chunk, df))
+
+        df = tracker.finalize(pd.concat(chunks, ignore_index=True)) if chunks else pd.DataFrame()
+        if ai_export.ranked:
+            run.stage("export", write_ranked, df)
+
+    _log_ai_files(run, ai_writer)
+    run.log(f"🧾 IRAMUTEQ salvo em: {sink.location(corpus_txt)}")
+
+    def write_cleaned(df: pd.DataFrame) -> pd.DataFrame:
+        with sink.open(output_filename) as f:
+            write_excel(f, df, columns=excel_columns(df, analysis_column))
+        return df
+
+    run.stage("export", write_cleaned, df)
+    run.log(f"✅ Excel de Notícias salvo em: {sink.location(output_filename)}")
+    run.finish(rows=len(df), columns=df.shape[1], chunksize=chunksize)
     return df
@@ -0,0 +1,26 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+# === Constants ===
+# Limite de threads de exportação por execução (a app pode atender várias sessões ao mesmo tempo)
+EXPORT_MAX_WORKERS = 3
+
+
+def run_parallel(tasks, max_workers=EXPORT_MAX_WORKERS):
+    """
+    Executa tarefas independentes ({nome: função sem argumentos}) num pool de threads limitado
+    e retorna {nome: resultado}. Se alguma falhar, as que ainda não começaram são canceladas,
+    as que já estão rodando terminam, e a primeira exceção (na ordem de `tasks`) é relançada.
+    """
+    if max_workers is None or max_workers <= 1 or len(tasks) <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix="export") as pool:
+        futures = {name: pool.submit(task) for name, task in tasks.items()}
+        done, pending = wait(futures.values(), return_when=FIRST_EXCEPTION)
+        for future in pending:
+            future.cancel()
+
+    for name, future in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is not None:
+            raise future.exception()
+    return {name: future.result() for name, future in futures.items()}
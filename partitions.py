@@ -0,0 +1,178 @@
+# === Partições diárias do relatório quinzenal (modo incremental) ===
+
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from grupos import GRUPOS_FIELDS
+from streaming import DERIVED_COLUMNS, PARLAMENTAR_SOURCES
+from tags import TAG_DTYPE
+
+# === Constants ===
+# Chave de deduplicação gravada junto com cada linha
+KEY_COLUMN = "_chave"
+LINK_COLUMN = "Link ocorrência"
+# Sem link, a chave é um hash destas colunas (valores brutos, antes da limpeza)
+FALLBACK_KEY_COLUMNS = ["Data publicação", "Nome publicador", "Descrição"]
+DATE_COLUMN = "Data publicação - Date"
+PARTITION_FORMAT = "dia=%Y-%m-%d"
+UNDATED_PARTITION = "dia=sem-data"
+# Dependem da posição da linha no relatório montado: não são gravadas, são refeitas na montagem
+REBUILT_COLUMNS = ["ID", "Análise"]
+TAGS_MANIFEST = "tags.json"
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("O modo incremental grava Parquet e requer o pyarrow (pip install pyarrow).") from exc
+
+
+def row_keys(df):
+    """Chave de deduplicação por linha: o link da ocorrência; sem link, um hash de data, publicador e texto."""
+    link = df[LINK_COLUMN] if LINK_COLUMN in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    missing = link.isna() | link.astype(str).str.strip().isin(["", "-"])
+    cols = [col for col in FALLBACK_KEY_COLUMNS if col in df.columns]
+    if not missing.any() or not cols:
+        return link.astype(str)
+    hashed = pd.util.hash_pandas_object(df.loc[missing, cols].astype(str), index=False)
+    return link.astype(str).mask(missing, "sem-link:" + hashed.astype(str))
+
+
+def partition_names(dates):
+    """Nome da partição de cada linha a partir de 'Data publicação - Date' (dd/mm/aaaa)."""
+    parsed = pd.to_datetime(dates, format="%d/%m/%Y", errors="coerce")
+    return parsed.dt.strftime(PARTITION_FORMAT).fillna(UNDATED_PARTITION)
+
+
+def _arrow_safe(df):
+    """
+    Colunas object com tipos misturados (ex.: números e "NA" em 'Manifestações') não viram uma
+    coluna Arrow; nelas os valores não nulos são gravados como texto.
+    """
+    import pyarrow as pa
+
+    df = df.copy()
+    for col in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].map(lambda value: value if pd.isna(value) else str(value))
+    return df
+
+
+def finalize_columns(df, tag_columns=()):
+    """
+    As partições guardam as linhas sem descartar colunas vazias (como no modo streaming): uma coluna
+    vazia num upload pode ter valores em outro. Na montagem valem as regras do pipeline completo
+    sobre o conjunto: saem as colunas vazias, os derivados de Grupos/Data publicação quando a origem
+    veio vazia, Casa/Partido/Estado vazias e Parlamentar sem as colunas de origem.
+    """
+    for col in tag_columns:
+        if col in df.columns:
+            df[col] = df[col].fillna(0).astype(TAG_DTYPE)
+
+    empty = set(df.columns[df.isna().all()])
+    groups = [GRUPOS_FIELDS, DERIVED_COLUMNS["Data publicação"]]
+    derived = {col for group in groups for col in group} | {"Parlamentar"}
+    drop = {col for col in empty if col not in derived}
+    for group in groups:
+        present = [col for col in group if col in df.columns]
+        if present and all(col in empty for col in present):
+            drop.update(present)
+    drop.update(col for col in ['Casa', 'Partido', 'Estado'] if col in empty)
+    df = df.drop(columns=[col for col in df.columns if col in drop])
+    if not PARLAMENTAR_SOURCES.issubset(df.columns):
+        df = df.drop(columns=['Parlamentar'], errors='ignore')
+    return df
+
+
+class PartitionStore:
+    """
+    Linhas já limpas e enriquecidas do relatório quinzenal, gravadas em Parquet e particionadas
+    por dia de publicação (root/dia=AAAA-MM-DD/<lote>.parquet), com a chave de deduplicação
+    (row_keys) em cada linha. Cada append grava um arquivo novo por dia, sem reescrever os já
+    existentes; um upload que repete dias já vistos só processa as linhas com chave nova.
+    """
+
+    def __init__(self, root):
+        _require_pyarrow()
+        self.root = Path(root)
+
+    def files(self, partitions=None):
+        dirs = [self.root / name for name in partitions] if partitions is not None else \
+            sorted(self.root.glob("dia=*"))
+        return [path for directory in dirs for path in sorted(directory.glob("*.parquet"))]
+
+    def index(self):
+        """Chave e partição de cada linha gravada (lê só a coluna da chave de cada arquivo)."""
+        frames = [
+            pd.DataFrame({KEY_COLUMN: pd.read_parquet(path, columns=[KEY_COLUMN])[KEY_COLUMN],
+                          "partition": path.parent.name})
+            for path in self.files()
+        ]
+        if not frames:
+            return pd.DataFrame({KEY_COLUMN: pd.Series(dtype=object), "partition": pd.Series(dtype=object)})
+        return pd.concat(frames, ignore_index=True)
+
+    def unseen(self, df, index=None):
+        """Só as linhas cuja chave (coluna KEY_COLUMN) ainda não está gravada."""
+        index = self.index() if index is None else index
+        return df[~df[KEY_COLUMN].isin(index[KEY_COLUMN])].copy()
+
+    def tag_columns(self):
+        path = self.root / TAGS_MANIFEST
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else []
+
+    def append(self, df, tag_columns=()):
+        """Grava as linhas (com KEY_COLUMN) num arquivo novo por dia; devolve as partições tocadas."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        known = self.tag_columns()
+        merged = known + [col for col in tag_columns if col not in known]
+        if merged != known:
+            (self.root / TAGS_MANIFEST).write_text(json.dumps(merged, ensure_ascii=False), encoding="utf-8")
+        if df.empty:
+            return []
+
+        df = _arrow_safe(df.drop(columns=[col for col in REBUILT_COLUMNS if col in df.columns]))
+        names = partition_names(df[DATE_COLUMN]) if DATE_COLUMN in df.columns else \
+            pd.Series(UNDATED_PARTITION, index=df.index)
+        # Nome do lote em ordem cronológica: a leitura mantém a ordem de gravação dentro de cada dia
+        batch = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        for name, part in df.groupby(names, sort=True):
+            directory = self.root / name
+            directory.mkdir(exist_ok=True)
+            # Grava com nome temporário e renomeia: leitores concorrentes nunca veem um arquivo pela metade
+            tmp = directory / f".{batch}.parquet.tmp"
+            part.to_parquet(tmp, index=False)
+            os.replace(tmp, directory / f"{batch}.parquet")
+        return sorted(names.unique())
+
+    def read(self, partitions):
+        """Concatena as partições pedidas; nulos de colunas de texto voltam como NaN (como no read_excel)."""
+        frames = [pd.read_parquet(path) for path in self.files(partitions)]
+        if not frames:
+            return pd.DataFrame(columns=[KEY_COLUMN])
+        df = pd.concat(frames, ignore_index=True)
+        for col in df.columns[df.dtypes == object]:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+        return df
+
+    def assemble(self, keys):
+        """
+        Linhas do relatório para um upload: todos os dias em que as chaves do upload caem. As linhas
+        do upload vêm na ordem em que aparecem nele; as demais dos mesmos dias, em seguida.
+        """
+        index = self.index()
+        partitions = sorted(index.loc[index[KEY_COLUMN].isin(keys), "partition"].unique())
+        df = self.read(partitions)
+        position = pd.Series(np.arange(len(keys)), index=keys.to_numpy()).groupby(level=0).first()
+        order = df[KEY_COLUMN].map(position)
+        df = df.loc[order.sort_values(kind="stable", na_position="last").index].reset_index(drop=True)
+        return finalize_columns(df, self.tag_columns())
@@ -0,0 +1,207 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# === Constants ===
+# Log JSON das execuções (uma linha por execução); vazio desativa. O padrão fica no diretório
+# temporário do sistema, não na pasta do código (que pode ser somente leitura no deploy)
+RUN_LOG_ENV_VAR = "VCLEAN_RUN_LOG"
+DEFAULT_RUN_LOG = Path(tempfile.gettempdir()) / "vclean-logs" / "pipeline_runs.jsonl"
+
+# Etapas padrão de cada relatório (a ordem alimenta a barra de progresso da app)
+POSTS_STAGES = ("load", "tags", "clean", "grupos", "enrich", "analysis", "export")
+NEWS_STAGES = ("load", "clean", "analysis", "export")
+BIWEEKLY_STAGES = ("load", "tags", "clean", "grupos", "enrich", "analysis", "macrotemas", "export")
+BIWEEKLY_INCREMENTAL_STAGES = ("load", "tags", "unseen", "clean", "grupos", "enrich", "store", "assemble",
+                               "analysis", "macrotemas", "export")
+# Etapa opcional de publicações duplicadas (ver dedup.py): logo após "clean" (no incremental, "assemble")
+DUPLICATES_STAGE = "duplicates"
+
+
+def with_stage(stages, name, after):
+    """Etapas com `name` logo após `after` (para etapas opcionais na barra de progresso)."""
+    stages = list(stages)
+    stages.insert(stages.index(after) + 1 if after in stages else len(stages), name)
+    return tuple(stages)
+
+
+# Sessões concorrentes da app (threads do mesmo processo) gravam no mesmo log
+_RUN_LOG_LOCK = threading.Lock()
+
+
+def _rss_bytes():
+    """Memória residente do processo (Linux: /proc/self/statm; senão, o pico do getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except ImportError:
+        return 0
+
+
+def _rows(value):
+    """Linhas de um resultado de etapa: DataFrame, {aba: DataFrame} (aba principal) ou None."""
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict) and value:
+        first = next(iter(value.values()))
+        return len(first) if isinstance(first, pd.DataFrame) else None
+    return None
+
+
+class PipelineRun:
+    """
+    Execução instrumentada de um relatório. Cada etapa nomeada (load, clean, grupos, enrich,
+    analysis, export, ...) roda via stage(), que mede tempo, linhas de entrada/saída e variação
+    de memória e repassa as métricas aos hooks. No modo streaming a mesma etapa roda uma vez
+    por bloco e as métricas são acumuladas (calls conta as execuções).
+
+    Hooks são objetos com qualquer um destes métodos (todos opcionais):
+        stage_started(run, name) · stage_finished(run, metrics) · message(run, text) · run_finished(run)
+    """
+
+    def __init__(self, report, hooks=None, stages=()):
+        self.report = report
+        self.stages = tuple(stages)
+        self.hooks = list(default_hooks() if hooks is None else hooks)
+        self.metrics = {}
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.seconds = None
+        self.extra = {}
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _notify(self, event, *args):
+        for hook in self.hooks:
+            handler = getattr(hook, event, None)
+            if handler is not None:
+                handler(self, *args)
+
+    def stage(self, name, fn, *args, **kwargs):
+        """Roda fn(*args, **kwargs) como a etapa `name`; as linhas de entrada vêm do primeiro argumento."""
+        self._notify("stage_started", name)
+        rss_before = _rss_bytes()
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self._record(name, time.perf_counter() - start, _rows(args[0]) if args else None, _rows(result),
+                     _rss_bytes() - rss_before)
+        return result
+
+    def iterate(self, name, iterable):
+        """Itera medindo cada next() como a etapa `name` (ex.: leitura em blocos no modo streaming)."""
+        iterator = iter(iterable)
+        while True:
+            self._notify("stage_started", name)
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self._record(name, time.perf_counter() - start, None, _rows(item), _rss_bytes() - rss_before)
+            yield item
+
+    def _record(self, name, seconds, rows_in, rows_out, memory_delta):
+        with self._lock:
+            metrics = self.metrics.setdefault(name, {
+                "stage": name, "calls": 0, "seconds": 0.0, "rows_in": None, "rows_out": None,
+                "memory_delta_mb": 0.0,
+            })
+            metrics["calls"] += 1
+            metrics["seconds"] += seconds
+            metrics["memory_delta_mb"] += memory_delta / 2**20
+            if rows_in is not None:
+                metrics["rows_in"] = (metrics["rows_in"] or 0) + rows_in
+            if rows_out is not None:
+                metrics["rows_out"] = (metrics["rows_out"] or 0) + rows_out
+            snapshot = dict(metrics)
+        self._notify("stage_finished", snapshot)
+
+    def log(self, text):
+        """Mensagem de progresso para os hooks (o console a imprime; a app pode exibi-la)."""
+        self._notify("message", text)
+
+    def finish(self, **extra):
+        self.seconds = time.perf_counter() - self._start
+        self.extra.update(extra)
+        self._notify("run_finished")
+        return self
+
+    def to_dict(self):
+        return {
+            "report": self.report,
+            "started_at": self.started_at,
+            "seconds": None if self.seconds is None else round(self.seconds, 4),
+            **self.extra,
+            "stages": [
+                {**metrics, "seconds": round(metrics["seconds"], 4),
+                 "memory_delta_mb": round(metrics["memory_delta_mb"], 2)}
+                for metrics in self.metrics.values()
+            ],
+        }
+
+    def metrics_frame(self):
+        return pd.DataFrame(self.to_dict()["stages"])
+
+
+# === Hooks ===
+
+class ConsoleHook:
+    """Imprime as mensagens e o tempo de cada etapa (comportamento padrão fora da app)."""
+
+    def __init__(self, timings=True):
+        self.timings = timings
+
+    def message(self, run, text):
+        print(text)
+
+    def run_finished(self, run):
+        if not self.timings:
+            return
+        for metrics in run.to_dict()["stages"]:
+            rows = f"{metrics['rows_in'] if metrics['rows_in'] is not None else '-'} → " \
+                   f"{metrics['rows_out'] if metrics['rows_out'] is not None else '-'}"
+            print(f"⏱️ {run.report}/{metrics['stage']}: {metrics['seconds']:.3f}s | linhas {rows} | "
+                  f"memória {metrics['memory_delta_mb']:+.1f} MB")
+
+
+class JsonRunLog:
+    """
+    Acrescenta o resumo de cada execução (to_dict) como uma linha JSON em `path`. O log é
+    auxiliar: se não puder ser gravado, a execução só emite um aviso (os artefatos já existem).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def run_finished(self, run):
+        line = json.dumps(run.to_dict(), ensure_ascii=False) + "\n"
+        try:
+            with _RUN_LOG_LOCK:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            run.log(f"⚠️ Não foi possível gravar o log de execução em {self.path}: {e}")
+
+
+def run_log_path():
+    path = os.environ.get(RUN_LOG_ENV_VAR)
+    if path is None:
+        return DEFAULT_RUN_LOG
+    return Path(path) if path.strip() else None
+
+
+def default_hooks():
+    path = run_log_path()
+    return [ConsoleHook()] + ([JsonRunLog(path)] if path else [])
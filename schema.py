@@ -0,0 +1,35 @@
+import pandas as pd
+
+from workbook import clean_column_name
+
+# === Tipos aceitos em ReadSchema.dtypes ===
+NUMERIC = "numeric"  # pd.to_numeric(errors="coerce"): "-" e textos viram NaN
+TEXT = "text"        # mantém o valor lido (object)
+
+
+class ReadSchema:
+    """
+    Esquema declarativo das colunas da aba principal para um tipo de relatório, aplicado na leitura:
+      • drop: colunas que o relatório descarta; não são lidas (não viram DataFrame);
+      • derived: {coluna criada: colunas de origem}; as origens são lidas mesmo que estejam em
+        drop (ex.: os contadores de engajamento que formam 'Manifestações reais');
+      • dtypes: {coluna: NUMERIC | TEXT}, convertidos logo após a leitura.
+    As demais colunas da exportação são mantidas como vieram.
+    """
+
+    def __init__(self, name, drop=(), derived=None, dtypes=None):
+        self.name = name
+        self.derived = dict(derived or {})
+        self.dtypes = dict(dtypes or {})
+        sources = {col for cols in self.derived.values() for col in cols}
+        self.drop = frozenset(drop) - sources
+
+    def usecols(self, column):
+        """Filtro de colunas para a leitura (usecols do read_excel ou o leitor em blocos)."""
+        return clean_column_name(column) not in self.drop
+
+    def coerce(self, df):
+        for col, dtype in self.dtypes.items():
+            if dtype == NUMERIC and col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df
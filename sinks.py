@@ -0,0 +1,145 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# Acima disso o buffer de um artefato em espera vai para disco
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+
+class DirectorySink:
+    """Destino padrão: cada artefato vira um arquivo dentro de `directory`."""
+
+    def __init__(self, directory="."):
+        self.directory = Path(directory)
+
+    def location(self, name):
+        return self.directory / name
+
+    @contextmanager
+    def open(self, name):
+        with open(self.location(name), "wb") as f:
+            yield f
+
+
+class ZipSink:
+    """
+    Grava cada artefato direto como uma entrada de um zipfile.ZipFile aberto em modo "w",
+    sem passar pelo disco. O zip só aceita uma entrada aberta por vez: artefatos abertos
+    enquanto outro está sendo escrito (ex.: _ai e _corpus no modo streaming, ou exportações
+    em threads paralelas) ficam num SpooledTemporaryFile e são copiados para o zip assim
+    que ele fica livre. `entry` (opcional) dá o ZipInfo de cada nome, para escolher a compressão
+    por artefato (ver archive.ArchiveOptions.entry); sem ele vale a compressão do ZipFile.
+    """
+
+    def __init__(self, zf, entry=None):
+        self.zf = zf
+        self.entry = entry
+        self._busy = False
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def location(self, name):
+        return name
+
+    def _entry(self, name):
+        if self.entry is not None:
+            return self.entry(name)
+        # zf.open(name, "w") data a entrada em 1980: o ZipInfo leva a hora atual, como o writestr
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type, info._compresslevel = self.zf.compression, self.zf.compresslevel
+        return info
+
+    def _claim(self):
+        with self._lock:
+            if self._busy:
+                return False
+            self._busy = True
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._busy = False
+
+    @contextmanager
+    def open(self, name):
+        if self._claim():
+            try:
+                with self.zf.open(self._entry(name), "w", force_zip64=True) as entry:
+                    yield entry
+            finally:
+                self._release()
+            self._flush_pending()
+            return
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        try:
+            yield spool
+        except BaseException:
+            spool.close()
+            raise
+        with self._lock:
+            self._pending.append((name, spool))
+        self._flush_pending()
+
+    def _flush_pending(self):
+        while True:
+            with self._lock:
+                if self._busy or not self._pending:
+                    return
+                self._busy = True
+                name, spool = self._pending.pop(0)
+            try:
+                with spool:
+                    spool.seek(0)
+                    with self.zf.open(self._entry(name), "w", force_zip64=True) as entry:
+                        shutil.copyfileobj(spool, entry)
+            finally:
+                self._release()
+
+    def close(self):
+        self._flush_pending()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def as_sink(target=None):
+    """Aceita um sink pronto ou um diretório (str/Path); None = diretório atual."""
+    if hasattr(target, "open") and hasattr(target, "location"):
+        return target
+    return DirectorySink(target if target is not None else ".")
+
+
+def default_sink(filepath, sink=None):
+    """
+    Sink de uma execução: o informado ou, por padrão, a pasta do arquivo de entrada.
+    Entradas em memória (BytesIO de um upload) exigem um sink explícito (ZipSink ou
+    workspace.Workspace): gravar no diretório atual do processo faria execuções concorrentes
+    com o mesmo nome de arquivo sobrescreverem os artefatos umas das outras.
+    """
+    if sink is not None:
+        return as_sink(sink)
+    if isinstance(filepath, (str, os.PathLike)):
+        return DirectorySink(Path(filepath).parent)
+    raise ValueError("Entrada em memória sem sink: informe um ZipSink ou um workspace.Workspace.")
+
+
+@contextmanager
+def open_text(sink, name, newline=None):
+    """Abre um artefato do sink como texto UTF-8."""
+    with sink.open(name) as binary:
+        text = io.TextIOWrapper(binary, encoding="utf-8", newline=newline, write_through=True)
+        try:
+            yield text
+        finally:
+            text.flush()
+            text.detach()
@@ -0,0 +1,135 @@
+# === Etapas compartilhadas pelos relatórios (Publicações, Notícias e Quinzenal) ===
+
+import pandas as pd
+from pathlib import Path
+
+from analysis import POSTS_ANALYSIS_FIELDS, add_analysis
+from grupos import GRUPOS_FIELDS, apply_overrides, split_grupos
+from schema import NUMERIC, ReadSchema
+from workbook import MAIN_SHEET
+
+# === Constants ===
+# Colunas descartadas por Publicações e pelo Quinzenal (Notícias tem a própria lista)
+UNNECESSARY_COLUMNS = [
+    "Descrição monitoramento", "Link serviço", "Descrição Pai", "Link ocorrência Pai", "Thumbnail",
+    "Thumbnail pai", "Data coleta", "Linguagem", "Foto publicador", "PageRank", "Estrelas",
+    "Qualificação", "Qualificada por", "Data da qualificação", "Qualificação automática", "Para",
+    "Latitude", "Longitude", "Id ocorrência no serviço", "Id ocorrência pai no serviço",
+    "Link id ocorrência pai", "Arquivada", "Desarquivada", "Data Resposta",
+    "Manifestações Detalhadas", "Termos", "Links", "Perfis", "Hashtags",
+    "comments", "shares", "likes", "dislikes", "love", "wow", "haha", "sad", "angry",
+    "thankful", "pride", "retweets", "favorites", "rating", "vendas", "resenhas", "votes", "views", "quotes",
+    "videoViews", "URL da busca", "Id publicador", "Qualificação aprovada por", "Analisada por",
+    "Data analisada", "Avaliação", "Tipo/Conteúdo", "Observação", "Unnamed: 73"
+]
+
+ENGAGEMENT_COLS = [
+    "comments", "shares", "likes", "dislikes", "love", "wow", "haha", "sad", "angry",
+    "thankful", "pride", "retweets", "favorites", "rating", "vendas",
+    "resenhas", "votes", "views", "quotes"
+]
+
+PARLAMENTAR_TITLES = {"CÂMARA": "Deputado(a)", "SENADO": "Senador(a)"}
+
+# Esquema de leitura de Publicações e do Quinzenal: as colunas descartadas nem são lidas; só os
+# contadores de engajamento que somam 'Manifestações reais' entram, já como números
+READ_SCHEMA = ReadSchema(
+    "publicacoes",
+    drop=UNNECESSARY_COLUMNS,
+    derived={
+        "Manifestações reais": ENGAGEMENT_COLS,
+        **{col: ["Grupos"] for col in GRUPOS_FIELDS},
+        **{col: ["Data publicação"] for col in ["Dia", "Mês", "Ano", "Hora"]},
+    },
+    dtypes={col: NUMERIC for col in ENGAGEMENT_COLS},
+)
+READ_SCHEMAS = {MAIN_SHEET: READ_SCHEMA}
+
+# Colunas de texto reduzidas ao primeiro trecho antes de "-" ou ","
+SPLIT_COLUMNS = ['Perfil/Nome da busca', 'Serviço']
+
+
+def clean_columns_and_values(df, drop_columns=UNNECESSARY_COLUMNS, engagement_columns=ENGAGEMENT_COLS,
+                             split_columns=SPLIT_COLUMNS, drop_empty=True):
+    """
+    Etapa "clean": soma 'Manifestações reais' (antes de descartar os contadores de engajamento),
+    remove drop_columns, troca "-" por "NA", descarta colunas vazias e limpa split_columns.
+    """
+    # Sum "Manifestações reais" before dropping engagement columns
+    engagement_present = [col for col in engagement_columns if col in df.columns]
+    if engagement_present:
+        df["Manifestações reais"] = df[engagement_present].apply(pd.to_numeric, errors='coerce').sum(axis=1)
+        if "Manifestações" in df.columns:
+            idx = df.columns.get_loc("Manifestações") + 1
+            cols = df.columns.tolist()
+            cols.insert(idx, cols.pop(cols.index("Manifestações reais")))
+            df = df[cols]
+
+    df = df.drop(columns=set(drop_columns).intersection(df.columns), errors="ignore")
+    df = df.replace("-", "NA")
+    if drop_empty:
+        df = df.dropna(axis=1, how="all")
+
+    for col in split_columns:
+        if col in df.columns:
+            df[col] = df[col].str.split(r"[-,]").str[0].str.strip()
+
+    return df
+
+def process_grupos_column(df, drop_empty=True):
+    if "Grupos" in df.columns:
+        df['Grupos'] = df['Grupos'].str.upper()
+
+        df[GRUPOS_FIELDS] = split_grupos(df['Grupos'])
+        df = df.drop(columns=['Grupos'])
+
+    if 'Perfil/Nome da busca' in df.columns:
+        df = apply_overrides(df, 'Perfil/Nome da busca')
+
+    # Drop columns if all values are null
+    for col in ['Casa', 'Partido', 'Estado']:
+        if drop_empty and col in df.columns and df[col].isnull().all():
+            df = df.drop(columns=[col])
+
+    return df
+
+def enrich_parlamentar_and_date(df):
+    if {'Casa', 'Perfil/Nome da busca', 'Partido', 'Estado'}.issubset(df.columns):
+        title = df['Casa'].map(PARLAMENTAR_TITLES).fillna("")
+        df['Parlamentar'] = (
+            title + " " + df['Perfil/Nome da busca'].astype(str) +
+            " (" + df['Partido'].astype(str) + "/" + df['Estado'].astype(str) + ")"
+        )
+
+    if "Data publicação" in df.columns:
+        df["Data publicação - Date"] = df["Data publicação"].str[:8].str.strip()
+        df["Data publicação - Hour"] = df["Data publicação"].str[9:].str.strip()
+        df = df.drop(columns=["Data publicação"])
+
+    if "Data publicação - Date" in df.columns:
+        # Uma única conversão para datetime64 (por data distinta); Dia/Mês/Ano saem direto do .dt
+        codes, uniques = pd.factorize(df["Data publicação - Date"])
+        parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format="%d/%m/%y", errors='coerce')
+        # Valores ausentes (código -1) apontam para o NaT acrescentado no fim
+        parsed = pd.concat([parsed, pd.Series([pd.NaT], dtype=parsed.dtype)], ignore_index=True)
+        published = pd.Series(parsed.to_numpy()[codes], index=df.index)
+        df["Data publicação - Date"] = parsed.dt.strftime("%d/%m/%Y").to_numpy(dtype=object)[codes]
+        df["Dia"] = published.dt.day
+        df["Mês"] = published.dt.month
+        df["Ano"] = published.dt.year
+
+    if "Data publicação - Hour" in df.columns:
+        df["Hora"] = df["Data publicação - Hour"].str[:2]
+
+    return df
+
+def add_analysis_column(df):
+    """Etapa "analysis" de Publicações e do Quinzenal (Notícias tem formato próprio)."""
+    return add_analysis(df, POSTS_ANALYSIS_FIELDS)
+
+def output_base_name(output_filename):
+    # Nome base sem "_cleaned" (2025-6-27)
+    stem = Path(output_filename).stem
+    if stem.endswith("_cleaned"):
+        return stem[:-len("_cleaned")]
+    return stem
@@ -0,0 +1,48 @@
+# === Apoio ao modo streaming (exportações grandes lidas em blocos) ===
+
+# Linhas por bloco quando o modo streaming é pedido sem tamanho explícito
+STREAM_CHUNK_ROWS = 20_000
+
+# Colunas criadas a partir de uma coluna de origem; somem junto com ela quando a origem vem vazia
+DERIVED_COLUMNS = {
+    "Grupos": ["Casa", "Extras"],
+    "Data publicação": ["Data publicação - Date", "Data publicação - Hour", "Dia", "Mês", "Ano", "Hora"],
+}
+PARLAMENTAR_SOURCES = {'Casa', 'Perfil/Nome da busca', 'Partido', 'Estado'}
+
+
+class EmptyColumnTracker:
+    """
+    No modo streaming cada bloco pula o dropna(axis=1, how="all"): uma coluna vazia num bloco
+    pode ter valores no seguinte. O tracker anota, bloco a bloco, quais colunas já tiveram algum
+    valor e, no final, remove do resultado as que ficaram vazias no arquivo inteiro.
+    Nos TXT já gravados, essas colunas aparecem como "nan" em vez de "".
+    """
+
+    def __init__(self):
+        self.columns = []
+        self.filled = set()
+
+    def update(self, df):
+        if not self.columns:
+            self.columns = df.columns.tolist()
+        self.filled.update(df.columns[df.notna().any()])
+
+    @property
+    def empty(self):
+        return [col for col in self.columns if col not in self.filled]
+
+    def finalize(self, df):
+        drop = set(self.empty)
+        for source, derived in DERIVED_COLUMNS.items():
+            if source in drop:
+                drop.update(derived)
+        df = df.drop(columns=[col for col in df.columns if col in drop])
+
+        # Mesmas regras que process_grupos_column/enrich_parlamentar_and_date aplicam sem streaming
+        for col in ['Casa', 'Partido', 'Estado']:
+            if col in df.columns and df[col].isnull().all():
+                df = df.drop(columns=[col])
+        if not PARLAMENTAR_SOURCES.issubset(df.columns):
+            df = df.drop(columns=['Parlamentar'], errors='ignore')
+        return df
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from macrothemes import NO_MACROTHEME, get_macrotheme_names
+
+# === Constants ===
+DATE_KEYS = ['Ano', 'Mês', 'Dia']
+NO_MACROTHEME_NAME = 'Sem Macrotema'
+ENGAGEMENT_COLUMN = 'Manifestações reais'
+
+# Colunas de apoio da tabela agregada (as tags entram pela posição, 0..n-1)
+_POSTS = "_publicacoes"
+_ENGAGEMENT = "_engajamento"
+_FIRST_ROW = "_primeira_linha"
+
+
+class BiweeklySummaries:
+    """
+    Tabelas resumo do relatório quinzenal (pvt_summary, macro_freq, microtheme_freq e % de
+    microtemas por macrotema) a partir de uma única passada de groupby sobre as linhas:
+    chave (Ano, Mês, Dia, macrotema) com contagem, engajamento e a soma do bloco uint8 das tags.
+    Cada tabela é montada depois sobre esse agregado, que tem poucas linhas.
+
+    tag_columns são as colunas da aba Tags, conhecidas desde a leitura (ver merge_tags).
+    No modo multitemático a chave é o padrão de pertinência da linha; ele só é expandido em
+    macrotemas no agregado, e a mesma publicação conta em todos os macrotemas a que pertence.
+    """
+
+    def __init__(self, df, assignments, macrotheme_definitions, tag_columns):
+        self.total_posts = df.shape[0]
+        self.tag_columns = [col for col in tag_columns if col in df.columns]
+        self.macrotheme_names = get_macrotheme_names(macrotheme_definitions)
+        self._macro_order = {macro: pos for pos, macro in enumerate(assignments.macros)}
+
+        if assignments.multilabel:
+            patterns, key = np.unique(assignments.membership, axis=0, return_inverse=True)
+            members = [
+                [macro for macro, member in zip(assignments.macros, pattern) if member] or [NO_MACROTHEME]
+                for pattern in patterns
+            ]
+            key = key.reshape(-1)
+        else:
+            key, members = assignments.labels.to_numpy(), None
+
+        values = pd.DataFrame(df[self.tag_columns].to_numpy(), index=df.index)
+        values[_POSTS] = 1
+        values[_ENGAGEMENT] = df[ENGAGEMENT_COLUMN]
+        values[_FIRST_ROW] = np.arange(len(df))
+        keys = [df[col] for col in DATE_KEYS] + [pd.Series(key, index=df.index, name='Macrotema')]
+
+        grouped = values.groupby(keys, dropna=False)
+        groups = grouped.sum()
+        groups[_FIRST_ROW] = grouped[_FIRST_ROW].min()
+        groups = groups.reset_index()
+        # Totais por tag antes de expandir os padrões (cada linha da planilha conta uma vez)
+        self._tag_totals = groups[list(range(len(self.tag_columns)))].sum()
+
+        if members is not None:
+            groups['Macrotema'] = groups['Macrotema'].map(dict(enumerate(members)))
+            groups = groups.explode('Macrotema', ignore_index=True)
+        groups['Macrotema Nome'] = groups['Macrotema'].map(self.macrotheme_names).fillna(NO_MACROTHEME_NAME)
+        self.groups = groups
+
+    def pivot_summary(self):
+        dated = self.groups.dropna(subset=DATE_KEYS)
+        summary = dated.groupby(DATE_KEYS + ['Macrotema Nome']).agg(
+            Total_Publicações=(_POSTS, 'sum'),
+            Total_Engajamento=(_ENGAGEMENT, 'sum')
+        ).reset_index()
+        return summary.sort_values(['Mês', 'Dia'])
+
+    def macro_freq(self):
+        # Mesma ordem do value_counts: por contagem, empates na ordem da primeira aparição
+        first_seen = self.groups[_FIRST_ROW] * (len(self._macro_order) + 1) + \
+            self.groups['Macrotema'].map(self._macro_order).fillna(len(self._macro_order))
+        per_name = self.groups.assign(_first=first_seen).groupby('Macrotema Nome').agg(
+            count=(_POSTS, 'sum'), first=('_first', 'min')
+        ).sort_values('first')
+        macro_counts = per_name['count'].sort_values(ascending=False) / self.total_posts * 100
+        macro_freq = macro_counts.round(2).reset_index()
+        macro_freq.columns = ['Macrotema', 'Frequência Relativa (%)']
+        return macro_freq
+
+    def microtheme_freq(self):
+        counts = pd.Series(self._tag_totals.to_numpy(), index=self.tag_columns)
+        microtheme_freq = (counts / self.total_posts).round(4).reset_index()
+        microtheme_freq.columns = ['Microtema', 'Frequência Relativa']
+        return microtheme_freq
+
+    def microtheme_percentage(self):
+        per_macro = self.groups.groupby('Macrotema')[list(range(len(self.tag_columns))) + [_POSTS]].sum()
+        percentages = per_macro.drop(columns=[_POSTS]).div(per_macro[_POSTS], axis=0) * 100
+        percentages.columns = self.tag_columns
+        return percentages.round(2)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+# === Constants ===
+# Tags marcadas viram 1 e as demais 0, num bloco uint8 (1 byte por célula em vez dos 8 do int64)
+TAG_DTYPE = np.uint8
+TAG_MARK = "SIM"
+
+
+def tag_matrix(df_tags, n_rows=None):
+    """
+    Converte a aba Tags numa matriz uint8 ("SIM" → 1, qualquer outro valor → 0) sem chamar uma
+    função por célula: os valores da aba inteira são fatorizados e só os distintos passam por
+    strip/upper. Com n_rows, a matriz é cortada ou completada com zeros até esse número de linhas.
+    """
+    values = df_tags.to_numpy(dtype=object)
+    codes, uniques = pd.factorize(values.ravel())
+    marked = np.array([str(value).strip().upper() == TAG_MARK for value in uniques], dtype=TAG_DTYPE)
+    # Valores ausentes (código -1) apontam para o 0 acrescentado no fim
+    marked = np.append(marked, TAG_DTYPE(0))
+    matrix = marked[codes].reshape(values.shape)
+
+    if n_rows is not None and n_rows != len(matrix):
+        padded = np.zeros((n_rows, matrix.shape[1]), dtype=TAG_DTYPE)
+        rows_to_fill = min(n_rows, len(matrix))
+        padded[:rows_to_fill] = matrix[:rows_to_fill]
+        matrix = padded
+    return matrix
+
+
+def merge_tags(df_main, df_tags):
+    """
+    Junta a aba Tags à aba principal pela posição da linha ("SIM" → 1, qualquer outro valor → 0).
+    Linhas da principal sem linha correspondente em Tags ficam com 0 em todas as tags.
+    """
+    df_main = df_main.reset_index(drop=True)
+    tags = pd.DataFrame(tag_matrix(df_tags, n_rows=len(df_main)), columns=df_tags.columns)
+    return pd.concat([df_main, tags], axis=1)
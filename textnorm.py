@@ -0,0 +1,120 @@
+# === Normalização de texto compilada, aplicada a colunas inteiras (corpus IRAMUTEQ e duplicadas) ===
+
+import re
+import string
+import unicodedata
+
+import pandas as pd
+
+# === Constants ===
+# As linhas de uma coluna são unidas por este separador e normalizadas como um único texto
+SEPARATOR = "\x00"
+# As regras de caracteres rodam sobre o texto em UTF-8 (regex de bytes são ~2x mais rápidas que as
+# de str aqui). Links: até o próximo espaço ou separador
+URL_PATTERN = rb"(?:https?://|www\.)[^\s\x00]+"
+# Emojis e pictogramas: U+1F000–1FAFF, U+2600–27BF, U+2B00–2BFF, seletores de variação
+# (U+FE00–FE0F), ZWJ (U+200D) e tags de bandeira (U+E0000–E007F)
+EMOJI_UTF8 = (rb"\xf0\x9f[\x80-\xab][\x80-\xbf]|\xe2[\x98-\x9e][\x80-\xbf]|\xe2[\xac-\xaf][\x80-\xbf]"
+              rb"|\xef\xb8[\x80-\x8f]|\xe2\x80\x8d|\xf3\xa0[\x80\x81][\x80-\xbf]")
+EMOJI_LEAD_BYTES = (b"\xf0\x9f", b"\xe2", b"\xef\xb8", b"\xf3\xa0")
+# Marcas combinantes (U+0300–036F), apagadas depois da decomposição NFKD para tirar os acentos
+COMBINING_MARKS_UTF8 = rb"\xcc[\x80-\xbf]|\xcd[\x80-\xaf]"
+COMBINING_LEAD_BYTES = (b"\xcc", b"\xcd")
+# Quebras de linha e tabulações viram espaço (no corpus, uma quebra dentro da Descrição
+# separaria o texto da linha de cabeçalho '**** *id_...'); fora do ASCII: U+0085, U+2028, U+2029
+ASCII_LINE_BREAKS = "\r\n\t\v\f"
+UNICODE_LINE_BREAKS = "\x85\u2028\u2029"
+
+
+class TextNormalizer:
+    """
+    Normalização configurável, compilada uma vez por configuração e aplicada à coluna inteira:
+    as linhas são unidas num único texto e cada regra roda uma vez sobre ele, em UTF-8 (regex de
+    bytes já compiladas e tabela de bytes.translate para os caracteres ASCII), em vez de um re.sub
+    por linha.
+      • remove_chars: caracteres apagados (ex.: a marcação do IRAMUTEQ, '*' incluído);
+      • urls: links viram espaço; emojis: emojis e pictogramas são apagados;
+      • line_breaks: quebras de linha e tabulações viram espaço;
+      • lower / strip_accents: minúsculas e sem acentos (NFKD sem as marcas combinantes);
+      • punctuation: tudo que não é letra, dígito ou espaço vira espaço;
+      • collapse_spaces: espaços repetidos viram um e as pontas são aparadas.
+    As regras rodam nesta ordem: acentos, links, emojis e remove_chars, quebras, pontuação,
+    minúsculas, espaços.
+    """
+
+    def __init__(self, remove_chars="", urls=False, emojis=False, line_breaks=False, lower=False,
+                 strip_accents=False, punctuation=False, collapse_spaces=False):
+        if SEPARATOR in remove_chars:
+            raise ValueError("remove_chars não pode conter o separador interno (\\x00)")
+        self.strip_accents = strip_accents
+        self.lower = lower
+
+        ascii_remove = "".join(dict.fromkeys(char for char in remove_chars if char.isascii()))
+        self._url_re = re.compile(URL_PATTERN) if urls else None
+
+        # Fora do ASCII: uma regex de faixas apagadas, que só roda se algum byte inicial delas
+        # aparece no texto, e bytes.replace para sequências fixas (UTF-8 não tem falsos casamentos)
+        patterns = ([EMOJI_UTF8] if emojis else []) + ([COMBINING_MARKS_UTF8] if strip_accents else [])
+        self._delete_re = re.compile(b"|".join(patterns)) if patterns else None
+        self._delete_leads = (EMOJI_LEAD_BYTES if emojis else ()) + (COMBINING_LEAD_BYTES if strip_accents else ())
+        self._replacements = [(char.encode("utf-8"), b"") for char in dict.fromkeys(remove_chars)
+                              if not char.isascii()]
+        if line_breaks:
+            self._replacements += [(char.encode("utf-8"), b" ") for char in UNICODE_LINE_BREAKS]
+        # Pontuação fora do ASCII (e espaços como o NBSP) vira espaço
+        self._punct_re = re.compile(r"[^\x00-\x7f\w]+") if punctuation else None
+
+        # ASCII: bytes.translate (bytes ASCII nunca aparecem dentro de caracteres multibyte, então
+        # trocar ou apagar esses bytes não corrompe o resto do texto)
+        spaced = (ASCII_LINE_BREAKS if line_breaks else "") + \
+            ("".join(char for char in string.punctuation if char not in ascii_remove) if punctuation else "")
+        self._byte_table = bytes.maketrans(spaced.encode(), b" " * len(spaced)) if spaced else None
+        self._byte_delete = ascii_remove.encode()
+        self.collapse_spaces = collapse_spaces
+
+    def _apply(self, text):
+        ascii_only = text.isascii()  # O(1) em str: textos só ASCII pulam as regras não ASCII
+        if self.strip_accents and not ascii_only:
+            text = unicodedata.normalize("NFKD", text)
+        data = text.encode("utf-8", "surrogatepass")
+        if self._url_re is not None and (b"://" in data or b"www." in data):
+            data = self._url_re.sub(b" ", data)
+        if not ascii_only:
+            if self._delete_re is not None and any(lead in data for lead in self._delete_leads):
+                data = self._delete_re.sub(b"", data)
+            for old, new in self._replacements:
+                data = data.replace(old, new)
+        if self._byte_table is not None or self._byte_delete:
+            data = data.translate(self._byte_table, self._byte_delete)
+        text = data.decode("utf-8", "surrogatepass")
+        if self._punct_re is not None and not ascii_only:
+            text = self._punct_re.sub(" ", text)
+        if self.lower:
+            text = text.lower()
+        if self.collapse_spaces:
+            # str.replace em laço: cada volta ao menos divide pela metade as sequências de espaços
+            while "  " in text:
+                text = text.replace("  ", " ")
+            text = text.replace(" " + SEPARATOR, SEPARATOR).replace(SEPARATOR + " ", SEPARATOR).strip(" ")
+        return text
+
+    def __call__(self, text):
+        """Normaliza um único texto."""
+        return self._apply(str(text))
+
+    def normalize(self, texts):
+        """
+        Normaliza uma coluna (Series, array ou lista) de uma vez e devolve uma Series de texto com o
+        mesmo índice. Nulos viram "" (para manter o "nan" do astype(str), converta antes).
+        """
+        series = texts if isinstance(texts, pd.Series) else pd.Series(texts, dtype=object)
+        values = series.where(series.notna(), "").astype(str).tolist()
+        if not values:
+            return pd.Series([], index=series.index, dtype=object)
+        joined = SEPARATOR.join(values)
+        if joined.count(SEPARATOR) != len(values) - 1:
+            # Algum texto contém o separador: normaliza linha a linha
+            out = [self._apply(value) for value in values]
+        else:
+            out = self._apply(joined).split(SEPARATOR)
+        return pd.Series(out, index=series.index, dtype=object)
@@ -0,0 +1,56 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from workbook import MAIN_SHEET, TAGS_SHEET, load_sheets
+
+
+def content_key(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class UploadCache:
+    """
+    Cache LRU em memória das abas já lidas de um upload, indexado pelo SHA-256 do conteúdo.
+    Evita reler o xlsx a cada rerun do Streamlit e na chamada seguinte do pipeline.
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_sheets(self, data, sheet_names=(MAIN_SHEET, TAGS_SHEET), schemas=None, copy=True):
+        """
+        Retorna {aba: DataFrame} para os bytes enviados, lendo o workbook só no primeiro acesso.
+        Os DataFrames devolvidos são cópias: o pipeline pode alterá-los sem sujar o cache.
+        copy=False devolve os próprios DataFrames do cache (só leitura, ex.: o cabeçalho das tags
+        a cada rerun), sem o custo de copiar a aba principal.
+        schemas ({aba: ReadSchema}) é repassado ao load_sheets e faz parte da chave.
+        """
+        schema_names = tuple(sorted((sheet, schema.name) for sheet, schema in (schemas or {}).items()))
+        key = (content_key(data), tuple(sheet_names), schema_names)
+        with self._lock:
+            sheets = self._entries.get(key)
+            if sheets is not None:
+                self._entries.move_to_end(key)
+
+        if sheets is None:
+            sheets = load_sheets(BytesIO(data), sheet_names=sheet_names, schemas=schemas)
+            with self._lock:
+                self._entries[key] = sheets
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        if not copy:
+            return dict(sheets)
+        return {name: df.copy() for name, df in sheets.items()}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,132 @@
+import importlib.util
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# === Constants ===
+# As exportações da ferramenta de monitoramento trazem 4 linhas de cabeçalho antes dos nomes das colunas
+HEADER_ROWS = 4
+MAIN_SHEET = "Ocorrências"
+TAGS_SHEET = "Tags"
+
+
+def excel_engine():
+    """Usa o leitor calamine (Rust) quando instalado; caso contrário, openpyxl."""
+    if importlib.util.find_spec("python_calamine") is not None:
+        return "calamine"
+    return "openpyxl"
+
+
+def clean_header(df):
+    df.columns = df.columns.str.replace('"', '').str.strip()
+    return df
+
+
+def clean_column_name(name):
+    # Mesma limpeza do clean_header, para um nome isolado (ex.: no filtro de colunas da leitura)
+    return str(name).replace('"', '').strip()
+
+
+def insert_id_column(df, start=1):
+    df.insert(0, 'ID', range(start, start + len(df)))
+    return df
+
+
+def load_sheets(filepath, sheet_names=(MAIN_SHEET, TAGS_SHEET), skiprows=HEADER_ROWS, schemas=None):
+    """
+    Abre o workbook uma única vez e lê todas as abas pedidas nessa mesma passada.
+    Retorna {aba: DataFrame} com os cabeçalhos já limpos; abas inexistentes ficam de fora.
+    schemas ({aba: ReadSchema}) restringe as colunas lidas e aplica os tipos declarados.
+    """
+    schemas = schemas or {}
+    sheets = {}
+    with pd.ExcelFile(filepath, engine=excel_engine()) as xls:
+        for name in sheet_names:
+            if name not in xls.sheet_names:
+                continue
+            schema = schemas.get(name)
+            df = clean_header(xls.parse(name, skiprows=skiprows, usecols=schema.usecols if schema else None))
+            sheets[name] = schema.coerce(df) if schema else df
+    return sheets
+
+
+def read_sheet_columns(filepath, sheet_name, skiprows=HEADER_ROWS):
+    """Lê apenas a linha de cabeçalho de uma aba (ex.: nomes das tags para os multiselects)."""
+    with pd.ExcelFile(filepath, engine=excel_engine()) as xls:
+        if sheet_name not in xls.sheet_names:
+            return []
+        header = clean_header(xls.parse(sheet_name, skiprows=skiprows, nrows=0))
+    return header.columns.tolist()
+
+
+def _header_names(header):
+    # Mesmo padrão do pandas para cabeçalhos vazios e repetidos
+    names, seen = [], {}
+    for pos, value in enumerate(header or ()):
+        name = f"Unnamed: {pos}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return pd.Index(names)
+
+
+def _data_rows(rows, width):
+    """Normaliza a largura das linhas e descarta linhas vazias no fim da aba, como o read_excel."""
+    pending = []
+    for row in rows:
+        if len(row) != width:
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+        if all(value is None for value in row):
+            pending.append(row)
+            continue
+        if pending:
+            yield from pending
+            pending = []
+        yield row
+
+
+def iter_workbook_chunks(filepath, chunksize, sheet_names=(MAIN_SHEET, TAGS_SHEET), skiprows=HEADER_ROWS,
+                         schemas=None):
+    """
+    Lê as abas em blocos de `chunksize` linhas com o openpyxl em modo read-only (streaming),
+    sem carregar a planilha inteira. Gera um {aba: DataFrame} por bloco, com as abas alinhadas
+    pela posição da linha; a aba principal (a primeira) determina quando a leitura termina.
+    Uma aba secundária que acaba antes aparece vazia, só com o cabeçalho, nos blocos seguintes.
+    Com schemas ({aba: ReadSchema}), só as colunas do esquema entram nos DataFrames.
+    """
+    schemas = schemas or {}
+    wb = load_workbook(filepath, read_only=True, data_only=True, keep_links=False)
+    try:
+        readers = {}
+        for name in sheet_names:
+            if name not in wb.sheetnames:
+                continue
+            rows = wb[name].iter_rows(min_row=skiprows + 1, values_only=True)
+            header = _header_names(next(rows, None))
+            rows = _data_rows(rows, len(header))
+            schema = schemas.get(name)
+            if schema:
+                positions = [pos for pos, column in enumerate(header) if schema.usecols(column)]
+                header = header[positions]
+                rows = ([row[pos] for pos in positions] for row in rows)
+            columns = clean_header(pd.DataFrame(columns=header)).columns
+            readers[name] = (columns, rows, schema)
+
+        main = sheet_names[0]
+        while main in readers:
+            chunk = {}
+            for name, (columns, rows, schema) in readers.items():
+                df = pd.DataFrame.from_records(list(islice(rows, chunksize)), columns=columns)
+                # Células vazias como NaN (igual ao read_excel); colunas vazias seguem object para o .str
+                df = df.where(df.notna(), np.nan)
+                chunk[name] = schema.coerce(df) if schema else df
+            if chunk[main].empty:
+                break
+            yield chunk
+    finally:
+        wb.close()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from sinks import DirectorySink
+
+# === Constants ===
+# Raiz dos workspaces (padrão: diretório temporário do sistema)
+WORKSPACE_ROOT_ENV_VAR = "VCLEAN_WORKSPACE_ROOT"
+WORKSPACE_PREFIX = "vclean-run-"
+# Workspaces mais velhos que isso são de execuções interrompidas (processo morto) e são removidos
+STALE_AFTER_SECONDS = 6 * 60 * 60
+
+
+def workspace_root():
+    root = os.environ.get(WORKSPACE_ROOT_ENV_VAR)
+    return Path(root) if root else Path(tempfile.gettempdir())
+
+
+class Workspace:
+    """
+    Diretório de trabalho exclusivo de uma execução (nome único via mkdtemp), para quem precisa
+    gravar os artefatos em disco em vez de num ZipSink. Execuções concorrentes, mesmo com o mesmo
+    nome de arquivo, nunca compartilham pasta, e o diretório é sempre removido na saída do `with`
+    (inclusive em caso de erro). Sobras de processos interrompidos são varridas na criação.
+
+        with Workspace() as ws:
+            process_and_export_excel(BytesIO(data), "x_cleaned.xlsx", sink=ws.sink)
+            for path in ws.files(): ...
+    """
+
+    def __init__(self, root=None, prefix=WORKSPACE_PREFIX, keep=False):
+        self.root = Path(root) if root is not None else workspace_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+        sweep_stale_workspaces(self.root, prefix=prefix)
+        self.path = Path(tempfile.mkdtemp(prefix=prefix, dir=self.root))
+        self.sink = DirectorySink(self.path)
+        self.keep = keep
+
+    def files(self):
+        return sorted(path for path in self.path.rglob("*") if path.is_file())
+
+    def cleanup(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self.keep:
+            self.cleanup()
+
+
+def sweep_stale_workspaces(root=None, prefix=WORKSPACE_PREFIX, max_age=STALE_AFTER_SECONDS):
+    """Remove workspaces abandonados (mais velhos que max_age segundos) e devolve quantos removeu."""
+    root = Path(root) if root is not None else workspace_root()
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in root.glob(f"{prefix}*"):
+        try:
+            if path.is_dir() and path.stat().st_mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+        except OSError:
+            # Outro processo pode ter removido a pasta ao mesmo tempo
+            continue
+    return removed